@@ -1,21 +1,39 @@
-from flask import Blueprint, jsonify
-from models import Transaction
+from flask import Blueprint, jsonify, request
+from models import db
+from utils.fraud_rollups import SOURCES, ensure_rollups, rebuild_rollups, summarize
 
-analytics_bp = Blueprint('analytics', __name__)
+analytics_bp = Blueprint('fraud_analytics', __name__)
 
-@analytics_bp.route("/api/analytics")
+# ✅ Served from the FraudRollup table (kept up to date on insert), so the
+# cost depends on the number of step buckets, not on the number of transactions.
+@analytics_bp.route("/api/fraud/analytics")
 def get_analytics():
-    txns = Transaction.query.all()
-    fraud = sum(1 for t in txns if t.prediction == "Fraud")
-    legit = len(txns) - fraud
+    source = request.args.get("source", "single")
+    sources = SOURCES if source == "all" else (source,)
+    if any(s not in SOURCES for s in sources):
+        return jsonify({"error": "source must be one of: single, batch, all"}), 400
 
-    types = {}
-    for txn in txns:
-        types[txn.type] = types.get(txn.type, 0) + 1
+    try:
+        ensure_rollups(db.session)
+        return jsonify(summarize(
+            db.session,
+            sources=sources,
+            from_step=request.args.get("from_step", type=int),
+            to_step=request.args.get("to_step", type=int),
+        ))
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Fraud analytics error: {e}")
+        return jsonify({"error": "Failed to load analytics", "details": str(e)}), 500
 
-    return jsonify({
-        "total": len(txns),
-        "fraud": fraud,
-        "safe": legit,
-        "types": types
-    })
+@analytics_bp.route("/api/fraud/analytics/rebuild", methods=["POST"])
+def rebuild_analytics():
+    """Recompute every rollup with GROUP BY over the base tables."""
+    try:
+        rebuild_rollups(db.session)
+        db.session.commit()
+        return jsonify({"status": "success", "message": "Fraud rollups rebuilt"})
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Rollup rebuild error: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
@@ -7,6 +7,7 @@ from flask_cors import CORS
 from flask_migrate import Migrate
 from config import Config
 from models import db
+from utils.transaction_graph import get_transaction_graph
 
 # ==========================================================
 # 🔹 Import Blueprints
@@ -18,6 +19,14 @@ from routes.recommendation_routes import recommendation_bp
 from routes.portfolio_routes import portfolio_bp
 from routes.ai_analysis import ai_analysis_bp
 from routes.notifications import notifications_bp
+from routes.predict import predict_bp
+from routes.ingestion_routes import ingestion_bp
+from routes.model_routes import model_bp
+from routes.fraud_routes import fraud_bp
+from routes.transactions import transactions_bp
+from routes.backtest_routes import backtest_bp
+from routes.screener_routes import screener_bp
+from analytics import analytics_bp as fraud_analytics_bp
 
 
 # ==========================================================
@@ -42,6 +51,12 @@ migrate = Migrate(app, db)
 # Auto-create tables (dev only)
 with app.app_context():
     db.create_all()
+    # create_all skips indexes on tables that already exist
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    # Load the transaction graph now rather than inside the first /api/predict request
+    get_transaction_graph()
 
 
 # ==========================================================
@@ -111,6 +126,14 @@ app.register_blueprint(recommendation_bp)
 app.register_blueprint(portfolio_bp)
 app.register_blueprint(ai_analysis_bp)
 app.register_blueprint(notifications_bp)
+app.register_blueprint(predict_bp)
+app.register_blueprint(ingestion_bp)
+app.register_blueprint(model_bp)
+app.register_blueprint(fraud_bp)
+app.register_blueprint(transactions_bp)
+app.register_blueprint(backtest_bp)
+app.register_blueprint(screener_bp)
+app.register_blueprint(fraud_analytics_bp)
 
 
 # ==========================================================
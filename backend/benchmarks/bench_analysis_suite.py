@@ -0,0 +1,290 @@
+"""
+Scaling benchmark suite for the analysis code paths.
+
+Generates synthetic OHLCV data and times each stage over a grid of sizes:
+  - build_frame:    collect_aggs, the DataFrame building behind
+                    fetch_stock_data (paginated Agg objects -> typed columns;
+                    includes creating the Agg objects, as the client does)
+  - compute_rsi:    trade_analysis.compute_rsi on one close series
+  - analyze_stock:  trade_analysis.analyze_stock on one ticker's bars
+  - analyze_panel:  trade_analysis.analyze_panel on a (tickers x bars) panel
+  - indicators_all: indicator_engine.compute_indicators with every group
+
+Single-series stages run from 1e3 up to --max-bars bars (1e7 with
+--profile full); panel stages from 1 up to --max-tickers tickers (5,000
+with --profile full). Each case records the best / median wall time of
+--repeat runs and, from one extra (warm-up) run under tracemalloc, its peak
+memory.
+Results are written as JSON; with --baseline, cases slower (or bigger)
+than the stored run by more than the tolerance are flagged and the exit
+code is 1.
+
+Usage (from backend/):
+    python benchmarks/bench_analysis_suite.py [--profile quick|full]
+        [--stages analyze_stock,analyze_panel] [--repeat 5]
+        [--output benchmarks/results/analysis_suite.json]
+        [--baseline benchmarks/baselines/analysis_suite.json]
+        [--save-baseline] [--tolerance 0.30] [--mem-tolerance 0.10]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+from polygon.rest.models import Agg
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from utils.bar_encoding import collect_aggs  # noqa: E402
+from utils.indicator_engine import compute_indicators, resolve_indicators  # noqa: E402
+from utils.trade_analysis import analyze_panel, analyze_stock, compute_rsi  # noqa: E402
+
+PROFILES = {
+    "quick": {"max_bars": 10**5, "max_tickers": 1_000},
+    "full": {"max_bars": 10**7, "max_tickers": 5_000},
+}
+PANEL_BARS = 252  # one trading year per ticker
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmarks", "baselines", "analysis_suite.json")
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmarks", "results", "analysis_suite.json")
+SLOW_RUN_S = 5.0  # a case this slow is not repeated
+
+
+# ---------------------------------------
+# 🧪 Synthetic data
+# ---------------------------------------
+
+def synthetic_ohlcv(n_tickers, n_bars, seed=0):
+    """Dict of (n_tickers, n_bars) arrays: random-walk closes with consistent open / high / low / volume / vwap."""
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 0.5, (n_tickers, n_bars)), axis=1)
+    close = np.abs(close) + 1  # keep prices positive on long walks
+    open_ = close * (1 + rng.normal(0, 0.002, close.shape))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, close.shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, close.shape)))
+    volume = rng.integers(1_000, 100_000, close.shape).astype(np.float64)
+    return {
+        "open": open_, "high": high, "low": low, "close": close, "volume": volume,
+        "vwap": (high + low + close) / 3,
+        "timestamp": 1704067200000 + 60_000 * np.arange(n_bars, dtype=np.int64),
+        "transactions": (volume // 10).astype(np.int64),
+    }
+
+
+def series_frame(data):
+    """One ticker's bars as the DataFrame fetch_stock_data returns."""
+    return pd.DataFrame({name: values[0] if values.ndim == 2 else values for name, values in data.items()})
+
+
+def iter_aggs(frame):
+    """Agg objects one at a time, like the paginated Polygon client."""
+    columns = [frame[name].tolist() for name in ("open", "high", "low", "close", "volume", "vwap", "timestamp", "transactions")]
+    for o, h, lo, c, v, vw, ts, n in zip(*columns):
+        yield Agg(open=o, high=h, low=lo, close=c, volume=v, vwap=vw, timestamp=ts, transactions=n)
+
+
+# ---------------------------------------
+# ⏱️ Stages
+# ---------------------------------------
+# Each stage: (kind, setup(n_tickers, n_bars) -> inputs, run(inputs)).
+# setup is not timed; "series" stages always use one ticker.
+
+def _series_setup(n_tickers, n_bars):
+    return series_frame(synthetic_ohlcv(1, n_bars))
+
+
+def _panel_setup(n_tickers, n_bars):
+    data = synthetic_ohlcv(n_tickers, n_bars)
+    data.pop("timestamp")
+    data.pop("transactions")
+    return data
+
+
+STAGES = {
+    "build_frame": ("series", _series_setup, lambda df: collect_aggs(iter_aggs(df))),
+    "compute_rsi": ("series", lambda t, b: _series_setup(t, b)["close"], compute_rsi),
+    "analyze_stock": ("series", _series_setup, lambda df: analyze_stock("BENCH", df)),
+    "analyze_panel": (
+        "panel", _panel_setup,
+        lambda data: analyze_panel([f"T{i:04d}" for i in range(len(data["close"]))], data["close"]),
+    ),
+    "indicators_all": (
+        "panel", _panel_setup,
+        lambda data: compute_indicators(data["close"], resolve_indicators("all"),
+                                        **{f: data[f] for f in ("high", "low", "volume", "vwap")}),
+    ),
+}
+
+
+def size_grid(limit):
+    """1, 10, 100, ... up to `limit` (1e3 upwards for bar counts)."""
+    sizes, size = [], 1
+    while size <= limit:
+        sizes.append(size)
+        size *= 10
+    if sizes and sizes[-1] != limit:
+        sizes.append(limit)
+    return sizes
+
+
+def cases(stages, max_bars, max_tickers):
+    for stage in stages:
+        kind = STAGES[stage][0]
+        if kind == "series":
+            for n_bars in size_grid(max_bars):
+                if n_bars >= 1_000:
+                    yield stage, 1, n_bars
+        else:
+            for n_tickers in size_grid(max_tickers):
+                yield stage, n_tickers, PANEL_BARS
+
+
+def measure(stage, n_tickers, n_bars, repeat):
+    _, setup, run = STAGES[stage]
+    inputs = setup(n_tickers, n_bars)
+
+    # Peak memory on a separate (also warm-up) run: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    run(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(inputs)
+        times.append(time.perf_counter() - started)
+        if times[-1] > SLOW_RUN_S:
+            break
+
+    best = min(times)
+    return {
+        "stage": stage,
+        "tickers": n_tickers,
+        "bars": n_bars,
+        "runs": len(times),
+        "best_s": round(best, 6),
+        "median_s": round(statistics.median(times), 6),
+        "ns_per_bar": round(best * 1e9 / (n_tickers * n_bars), 2),
+        "peak_bytes": peak,
+    }
+
+
+# ---------------------------------------
+# 📉 Baseline comparison
+# ---------------------------------------
+
+def compare(results, baseline, tolerance, mem_tolerance, min_delta_s):
+    """Cases slower (best time) or bigger (peak memory) than the baseline beyond the tolerances."""
+    previous = {(r["stage"], r["tickers"], r["bars"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["stage"], result["tickers"], result["bars"]))
+        if before is None:
+            continue
+        slower = result["best_s"] - before["best_s"]
+        if result["best_s"] > before["best_s"] * (1 + tolerance) and slower > min_delta_s:
+            regressions.append({**_case(result), "metric": "best_s",
+                                "baseline": before["best_s"], "current": result["best_s"]})
+        if result["peak_bytes"] > before["peak_bytes"] * (1 + mem_tolerance):
+            regressions.append({**_case(result), "metric": "peak_bytes",
+                                "baseline": before["peak_bytes"], "current": result["peak_bytes"]})
+    return regressions
+
+
+def _case(result):
+    return {"stage": result["stage"], "tickers": result["tickers"], "bars": result["bars"]}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profile", choices=PROFILES, default="quick")
+    parser.add_argument("--max-bars", type=int, help="override the profile's largest series")
+    parser.add_argument("--max-tickers", type=int, help="override the profile's largest panel")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of: " + ", ".join(STAGES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.30, help="allowed slowdown (0.30 = 30%%)")
+    parser.add_argument("--mem-tolerance", type=float, default=0.10, help="allowed peak memory growth")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore slowdowns below this")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    max_bars = args.max_bars or PROFILES[args.profile]["max_bars"]
+    max_tickers = args.max_tickers or PROFILES[args.profile]["max_tickers"]
+
+    results = []
+    print(f"{'stage':<15} {'tickers':>7} {'bars':>10} {'best ms':>10} {'median ms':>10} {'ns/bar':>8} {'peak MiB':>9}")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for stage, n_tickers, n_bars in cases(stages, max_bars, max_tickers):
+            result = measure(stage, n_tickers, n_bars, args.repeat)
+            results.append(result)
+            print(f"{stage:<15} {n_tickers:>7} {n_bars:>10} {result['best_s'] * 1000:>10.2f} "
+                  f"{result['median_s'] * 1000:>10.2f} {result['ns_per_bar']:>8.1f} {result['peak_bytes'] / 2**20:>9.2f}")
+
+    payload = {"environment": environment(), "profile": args.profile, "repeat": args.repeat, "results": results}
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.mem_tolerance, args.min_delta_ms / 1000)
+        payload["baseline"] = {"path": args.baseline, "environment": baseline.get("environment"),
+                               "regressions": regressions}
+        if baseline.get("environment", {}).get("machine") != payload["environment"]["machine"]:
+            print("⚠️ Baseline was recorded on a different machine; timings may not be comparable.")
+
+    write_json(args.output, payload)
+    print(f"results: {args.output}")
+    if args.save_baseline:
+        write_json(args.baseline, payload)
+        print(f"baseline saved: {args.baseline}")
+
+    for r in regressions:
+        unit = 1000 if r["metric"] == "best_s" else 1 / 2**20
+        label = "ms" if r["metric"] == "best_s" else "MiB"
+        print(f"❌ regression {r['stage']} ({r['tickers']} x {r['bars']}): {r['metric']} "
+              f"{r['baseline'] * unit:.2f} -> {r['current'] * unit:.2f} {label}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
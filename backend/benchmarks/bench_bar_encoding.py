@@ -0,0 +1,101 @@
+"""
+Compare bar construction and /api/polygon_data response encodings.
+
+Builds synthetic Polygon Agg objects (minute bars), then times and
+measures peak Python memory (tracemalloc) for:
+  - legacy:   DataFrame from one dict per bar + to_dict(orient="records") + JSON
+  - columnar: typed columns (collect_aggs) + streamed JSON, one array per column
+  - ndjson:   typed columns + streamed newline-delimited JSON
+  - arrow:    typed columns + Arrow IPC stream (skipped without pyarrow)
+
+Usage (from backend/):
+    python benchmarks/bench_bar_encoding.py [--bars 500000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from polygon.rest.models import Agg
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from utils.bar_encoding import collect_aggs, iter_columnar_json, iter_ndjson, to_arrow_ipc  # noqa: E402
+
+
+def synthetic_aggs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.05, n))
+    start = 1704205800000  # 2024-01-02 09:30 ET
+    return [
+        Agg(open=float(c - 0.01), high=float(c + 0.05), low=float(c - 0.05), close=float(c),
+            volume=float(v), vwap=float(c), timestamp=start + 60000 * i, transactions=int(v // 10))
+        for i, (c, v) in enumerate(zip(close, rng.integers(100, 10000, n)))
+    ]
+
+
+def legacy(aggs):
+    df = pd.DataFrame([a.__dict__ for a in aggs])
+    return json.dumps(df.to_dict(orient="records"))
+
+
+def columnar(aggs):
+    return sum(len(part) for part in iter_columnar_json(collect_aggs(aggs)))
+
+
+def ndjson(aggs):
+    return sum(len(chunk) for chunk in iter_ndjson(collect_aggs(aggs)))
+
+
+def arrow(aggs):
+    return to_arrow_ipc(collect_aggs(aggs))
+
+
+def measure(fn, aggs, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(aggs)
+        times.append(time.perf_counter() - start)
+    size = out if isinstance(out, int) else len(out)
+
+    tracemalloc.start()
+    fn(aggs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bars", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    aggs = synthetic_aggs(args.bars)
+    print(f"{args.bars:,} minute bars\n")
+
+    cases = [("legacy", legacy), ("columnar", columnar), ("ndjson", ndjson)]
+    try:
+        import pyarrow  # noqa: F401
+        cases.append(("arrow", arrow))
+    except ImportError:
+        print("(pyarrow not installed: skipping arrow)\n")
+
+    print(f"{'path':<10} | {'time ms':>9} | {'peak MiB':>9} | {'payload MiB':>11} | {'vs legacy':>15}")
+    print("-" * 66)
+    baseline = None
+    for name, fn in cases:
+        seconds, peak, size = measure(fn, aggs, args.repeat)
+        baseline = baseline or (seconds, peak)
+        print(f"{name:<10} | {seconds * 1000:>9.1f} | {peak / 2**20:>9.1f} | {size / 2**20:>11.1f} | "
+              f"{baseline[0] / seconds:>5.1f}x / {baseline[1] / peak:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
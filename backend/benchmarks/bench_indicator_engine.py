@@ -0,0 +1,111 @@
+"""
+Score a universe of tickers with the vectorized indicator engine.
+
+Compares the per-ticker pandas implementation of analyze_stock (as it was
+before utils/indicator_engine.py: several rolling passes per ticker) with
+one analyze_panel call over a (tickers x bars) panel, and checks that both
+give the same analysis for every ticker (tickers get ragged histories to
+exercise missing bars).
+
+Usage (from backend/):
+    python benchmarks/bench_indicator_engine.py [--tickers 500] [--bars 252]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from utils.trade_analysis import analyze_panel, compute_confidence, compute_rsi, interpret_full  # noqa: E402
+
+
+def legacy_analyze_stock(ticker, df):
+    """analyze_stock before the panel engine (reference implementation)."""
+    if df.empty:
+        return {"signal": "No Data", "summary": "No data available."}
+    df = df.sort_values("timestamp").reset_index(drop=True)
+    df["MA_5"] = df["close"].rolling(window=5, min_periods=1).mean()
+    df["MA_10"] = df["close"].rolling(window=10, min_periods=1).mean()
+    df["RSI"] = compute_rsi(df["close"])
+    df["Volatility"] = df["close"].rolling(window=5, min_periods=1).std().fillna(0)
+    latest = df.iloc[-1]
+    prev = df.iloc[-2] if len(df) > 1 else latest
+    if latest["MA_5"] > latest["MA_10"] and prev["MA_5"] <= prev["MA_10"]:
+        signal = "BUY"
+    elif latest["MA_5"] < latest["MA_10"] and prev["MA_5"] >= prev["MA_10"]:
+        signal = "SELL"
+    else:
+        signal = "HOLD"
+    confidence = compute_confidence(latest["MA_5"], latest["MA_10"])
+    text = interpret_full(ticker, signal, latest["RSI"], latest["Volatility"], confidence, latest["close"])
+    return {
+        "ticker": ticker,
+        "company_name": "Apple Inc." if ticker == "AAPL" else "Unknown Company",
+        "sector": "Technology" if ticker == "AAPL" else "General",
+        "analysis": {
+            "latest_price": round(float(latest["close"]), 2),
+            "ma_5": round(float(latest["MA_5"]), 3),
+            "ma_10": round(float(latest["MA_10"]), 3),
+            "rsi": round(float(latest["RSI"]), 2),
+            "volatility": round(float(latest["Volatility"]), 3),
+            "confidence": confidence,
+            "signal": signal,
+            "summary": text["summary"],
+            "advice": text["advice"],
+        },
+    }
+
+
+def synthetic_panel(n_tickers, n_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, (n_tickers, n_bars)), axis=1).clip(-45, None)
+    starts = rng.integers(0, n_bars, n_tickers) * (rng.random(n_tickers) < 0.2)  # late listings
+    close[np.arange(n_bars)[None, :] < starts[:, None]] = np.nan
+    close[rng.random((n_tickers, n_bars)) < 0.01] = np.nan  # missing bars
+    if n_bars > 16:
+        close[0, -15:] = close[0, -16] = 50.0  # flat tail: no losses in the RSI window
+    timestamps = 1704067200000 + 86400000 * np.arange(n_bars)
+    return [f"T{i:03d}" for i in range(n_tickers)], close, timestamps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=252)
+    args = parser.parse_args()
+
+    tickers, close, timestamps = synthetic_panel(args.tickers, args.bars)
+    frames = {
+        t: pd.DataFrame({"timestamp": timestamps, "close": row}).dropna()
+        for t, row in zip(tickers, close)
+    }
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        expected = {t: legacy_analyze_stock(t, frames[t]) for t in tickers}
+        legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = analyze_panel(tickers, close)
+    panel_s = time.perf_counter() - start
+
+    mismatches = [t for t in tickers if expected[t] != actual[t]]
+    print(f"{args.tickers} tickers x {args.bars} bars")
+    print(f"per-ticker pandas : {legacy_s * 1000:8.1f} ms")
+    print(f"panel engine      : {panel_s * 1000:8.1f} ms  ({legacy_s / panel_s:.0f}x)")
+    print(f"parity            : {len(tickers) - len(mismatches)}/{len(tickers)} identical")
+    if mismatches:
+        t = mismatches[0]
+        print(f"first mismatch {t}:\n  expected {expected[t]}\n  actual   {actual[t]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
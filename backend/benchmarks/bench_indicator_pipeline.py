@@ -0,0 +1,122 @@
+"""
+Extended indicators (EMA, MACD, Bollinger, ATR, OBV, VWAP deviation) with
+the one-pass IndicatorPipeline.
+
+Compares a per-ticker pandas reference (each indicator computed on its own:
+ewm / rolling / cumsum per ticker) with one compute_indicators call over a
+(tickers x bars) panel, checks that every value matches, and times a subset
+request against the full set.
+
+Usage (from backend/):
+    python benchmarks/bench_indicator_pipeline.py [--tickers 500] [--bars 252]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from utils.indicator_engine import (  # noqa: E402
+    ATR_PERIOD, BOLLINGER_K, BOLLINGER_WINDOW, EMA_FAST, EMA_SLOW, EXTENDED_INDICATORS,
+    MACD_SIGNAL, VWAP_WINDOW, compute_indicators, resolve_indicators,
+)
+
+TOLERANCE = 1e-8
+
+
+def reference_indicators(df):
+    """Every extended indicator of one ticker, one pandas pass each."""
+    close, high, low, volume = df["close"], df["high"], df["low"], df["volume"]
+    ema_fast = close.ewm(span=EMA_FAST, adjust=False).mean()
+    ema_slow = close.ewm(span=EMA_SLOW, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    macd_signal = macd.ewm(span=MACD_SIGNAL, adjust=False).mean()
+    middle = close.rolling(BOLLINGER_WINDOW, min_periods=1).mean()
+    width = BOLLINGER_K * close.rolling(BOLLINGER_WINDOW, min_periods=1).std(ddof=0).fillna(0)
+    percent_b = ((close - (middle - width)) / (2 * width)).where(width > 0, 0.5)
+    prev_close = close.shift()
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    obv = (np.sign(close.diff()).fillna(0) * volume).cumsum()
+    vwap = (df["vwap"] * volume).rolling(VWAP_WINDOW, min_periods=1).sum() / volume.rolling(VWAP_WINDOW, min_periods=1).sum()
+    return {
+        "ema_12": ema_fast, "ema_26": ema_slow,
+        "macd": macd, "macd_signal": macd_signal, "macd_hist": macd - macd_signal,
+        "bb_upper": middle + width, "bb_middle": middle, "bb_lower": middle - width, "bb_percent_b": percent_b,
+        "atr": true_range.ewm(alpha=1 / ATR_PERIOD, adjust=False).mean(),
+        "obv": obv,
+        "vwap_dev": (close / vwap - 1) * 100,
+    }
+
+
+def synthetic_ohlcv(n_tickers, n_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, (n_tickers, n_bars)), axis=1).clip(-45, None)
+    spread = np.abs(rng.normal(0, 0.8, (2, n_tickers, n_bars)))
+    high, low = close + spread[0], close - spread[1]
+    volume = rng.integers(1_000, 1_000_000, (n_tickers, n_bars)).astype(np.float64)
+    vwap = (high + low + close) / 3 + rng.normal(0, 0.05, (n_tickers, n_bars))
+    missing = rng.random((n_tickers, n_bars)) < 0.01
+    starts = rng.integers(0, n_bars, n_tickers) * (rng.random(n_tickers) < 0.2)  # late listings
+    missing |= np.arange(n_bars)[None, :] < starts[:, None]
+    if n_bars > BOLLINGER_WINDOW:
+        close[0, -BOLLINGER_WINDOW:] = 50.0  # flat window: zero Bollinger width
+    panel = {"close": close, "high": high, "low": low, "volume": volume, "vwap": vwap}
+    for values in panel.values():
+        values[missing] = np.nan
+    return panel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=252)
+    args = parser.parse_args()
+
+    panel = synthetic_ohlcv(args.tickers, args.bars)
+    frames = [
+        pd.DataFrame({field: values[i] for field, values in panel.items()}).dropna(subset=["close"]).reset_index(drop=True)
+        for i in range(args.tickers)
+    ]
+
+    start = time.perf_counter()
+    expected = [reference_indicators(df) for df in frames]
+    reference_s = time.perf_counter() - start
+
+    include = resolve_indicators("all")
+    start = time.perf_counter()
+    actual = compute_indicators(panel["close"], include, **{f: v for f, v in panel.items() if f != "close"})
+    pipeline_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_indicators(panel["close"], resolve_indicators("macd"))
+    subset_s = time.perf_counter() - start
+
+    worst = {}
+    for i, ref in enumerate(expected):
+        bars = len(frames[i])
+        for name, series in ref.items():
+            got = actual[name][i, args.bars - bars:] if bars else np.empty(0)
+            scale = np.maximum(np.abs(series.to_numpy()), 1.0)
+            error = np.nanmax(np.abs(got - series.to_numpy()) / scale, initial=0.0)
+            if np.isnan(got).sum() != series.isna().sum():
+                error = np.inf
+            worst[name] = max(worst.get(name, 0.0), error)
+
+    print(f"{args.tickers} tickers x {args.bars} bars, groups: {', '.join(EXTENDED_INDICATORS)}")
+    print(f"per-ticker pandas     : {reference_s * 1000:8.1f} ms")
+    print(f"pipeline (all groups) : {pipeline_s * 1000:8.1f} ms  ({reference_s / pipeline_s:.0f}x)")
+    print(f"pipeline (ma,rsi,vol,macd): {subset_s * 1000:8.1f} ms")
+    print("max relative error:")
+    for name, error in worst.items():
+        print(f"  {name:<13} {error:.2e}")
+    if max(worst.values()) > TOLERANCE:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
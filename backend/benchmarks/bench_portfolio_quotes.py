@@ -0,0 +1,113 @@
+"""
+Quote retrieval for /api/portfolio/analyze: per-row vs. unique symbols.
+
+Uploads a synthetic portfolio (--rows lines over --symbols distinct
+symbols) against the replay provider with seeded quote latency, and
+compares the old per-row loop (one serial lookup per line) with the
+route, which looks up each unique symbol once, concurrently. A few
+symbols can be made to hang (--slow) to show that their per-symbol
+timeout does not hold up the rest. A second upload of the same file is
+then served from the shared quote cache (utils/quotes.py).
+
+Usage (from backend/):
+    python benchmarks/bench_portfolio_quotes.py [--rows 300] [--symbols 40]
+        [--latency-ms 100] [--workers 16] [--slow 2] [--timeout-s 1]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+class SlowSymbols:
+    """Wraps a provider so some symbols take far longer than the timeout."""
+
+    def __init__(self, provider, slow, delay_s):
+        self.provider, self.slow, self.delay = provider, set(slow), delay_s
+
+    def latest_price(self, symbol, timeout=None):
+        if symbol in self.slow:
+            time.sleep(self.delay)  # ignores `timeout`, like a stuck connection
+        return self.provider.latest_price(symbol, timeout=timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--slow", type=int, default=2, help="symbols that hang past the timeout")
+    parser.add_argument("--timeout-s", type=float, default=1.0)
+    parser.add_argument("--legacy", action="store_true", help="also time the per-row loop (slow)")
+    args = parser.parse_args()
+
+    # Config is read at import time, so select the provider before importing the app modules
+    scratch = tempfile.mkdtemp(prefix="portfolio-quotes-")
+    os.environ["MARKET_DATA_PROVIDER"] = "replay"
+    os.environ["MARKET_REPLAY_DIR"] = scratch
+    os.environ["MARKET_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["MARKET_DATA_CACHE_DIR"] = os.path.join(scratch, "cache")
+    os.environ["QUOTE_MAX_WORKERS"] = str(args.workers)
+    os.environ["QUOTE_TIMEOUT_S"] = str(args.timeout_s)
+    os.environ.pop("OPENAI_API_KEY", None)
+
+    from flask import Flask
+    from routes.portfolio_routes import portfolio_bp
+    from utils.market_providers import get_provider, set_provider
+    from utils.quotes import quote_cache
+
+    symbols = [f"S{i:03d}" for i in range(args.symbols)]
+    rows = [(symbols[i % len(symbols)], 10 + i % 90, 1 + i % 5) for i in range(args.rows)]
+    csv = "Symbol,BuyPrice,Quantity\n" + "\n".join(f"{s},{p},{q}" for s, p, q in rows)
+    slow = symbols[:args.slow]
+    provider = SlowSymbols(get_provider(), slow, delay_s=args.timeout_s * 5)
+    set_provider(provider)
+
+    app = Flask(__name__)
+    app.register_blueprint(portfolio_bp)
+    client = app.test_client()
+
+    expected_serial = (args.rows * args.latency_ms / 1000
+                       + sum(1 for s, _, _ in rows if s in slow) * provider.delay)
+    print(f"{args.rows} rows, {args.symbols} unique symbols, {args.latency_ms:g} ms per quote, "
+          f"{args.workers} workers, {len(slow)} hanging symbols (timeout {args.timeout_s:g}s)")
+    if args.legacy:
+        started = time.perf_counter()
+        for symbol, _, _ in rows:
+            try:
+                provider.latest_price(symbol)
+            except Exception:
+                pass
+        print(f"per-row serial loop : {time.perf_counter() - started:8.2f} s")
+    else:
+        print(f"per-row serial loop : ~{expected_serial:7.2f} s (estimated; --legacy to measure)")
+
+    def upload():
+        started = time.perf_counter()
+        response = client.post("/api/portfolio/analyze",
+                               data={"file": (io.BytesIO(csv.encode()), "portfolio.csv")},
+                               content_type="multipart/form-data")
+        return response.get_json(), time.perf_counter() - started
+
+    body, elapsed = upload()
+    unavailable = sorted({r["Symbol"] for r in body["portfolio"] if r["CurrentPrice"] == "N/A"})
+    waves = -(-args.symbols // args.workers)
+
+    print(f"route (unique, concurrent): {elapsed:8.2f} s  "
+          f"(~{waves} waves x {args.latency_ms:g} ms + timeouts)")
+    print(f"rows returned       : {len(body['portfolio'])} ({body['summary']['unique_symbols']} unique symbols)")
+    print(f"unavailable symbols : {', '.join(unavailable) or '-'}")
+    print(f"quote calls made    : {get_provider().provider.stats()['calls']}")
+
+    _, cached = upload()
+    print(f"repeat upload       : {cached:8.2f} s  (quote cache: {quote_cache.stats()['hit_ratio']} hit ratio)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Time GET /api/transactions against a large synthetic BatchTransactionLog.
+
+Fills a throw-away SQLite database with PaySim-style rows, then measures
+first-page, deep-page (keyset cursor) and filtered queries through the
+Flask test client, before and after the lookup indexes are created, and
+compares keyset paging with LIMIT/OFFSET at the same depth. The indexed
+run follows the migration: create the indexes, then ANALYZE.
+
+Usage (from backend/):
+    python benchmarks/bench_transactions_api.py [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from flask import Flask
+from sqlalchemy import insert, text
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from models import db, BatchTransactionLog  # noqa: E402
+from routes.transactions import transactions_bp  # noqa: E402
+
+TYPES = np.array(["CASH_IN", "CASH_OUT", "DEBIT", "PAYMENT", "TRANSFER"])
+
+
+def make_app(db_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    db.init_app(app)
+    app.register_blueprint(transactions_bp)
+    return app
+
+
+def fill(rows, chunk=100_000, seed=0):
+    """Bulk insert `rows` synthetic rows (about 1% Fraud, 20 upload files)."""
+    rng = np.random.default_rng(seed)
+    start_time = datetime(2026, 1, 1)
+    for offset in range(0, rows, chunk):
+        n = min(chunk, rows - offset)
+        ids = np.arange(offset, offset + n)
+        amount = rng.lognormal(10, 2, n).round(2)
+        fraud = rng.random(n) < 0.01
+        records = [
+            {
+                "file_name": f"upload_{i * 20 // rows}.csv",
+                "step": int(i // 5000),
+                "type": str(t),
+                "amount": float(a),
+                "nameOrig": f"C{i % 200_000}",
+                "oldbalanceOrg": float(a),
+                "newbalanceOrig": 0.0,
+                "nameDest": f"M{(i * 7) % 150_000}",
+                "oldbalanceDest": 0.0,
+                "newbalanceDest": float(a),
+                "prediction": "Fraud" if f else "Legit",
+                "confidence": 0.9,
+                "risk_score": 90.0,
+                "timestamp": start_time + timedelta(seconds=int(i)),
+            }
+            for i, t, a, f in zip(ids, rng.choice(TYPES, n), amount, fraud)
+        ]
+        db.session.execute(insert(BatchTransactionLog), records)
+        db.session.commit()
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        client = app.test_client()
+
+        with app.app_context():
+            BatchTransactionLog.__table__.create(db.engine)
+            for index in list(BatchTransactionLog.__table__.indexes):
+                index.drop(db.engine)
+
+            started = time.perf_counter()
+            fill(args.rows)
+            print(f"Inserted {args.rows:,} rows in {time.perf_counter() - started:.1f} s\n")
+
+            # Cursor that points 90% of the way down the newest-first listing
+            deep_cursor = args.rows // 10
+            deep_offset = args.rows - deep_cursor
+
+        def get(query):
+            def call():
+                response = client.get(f"/api/transactions?source=batch&limit=50&{query}")
+                assert response.status_code == 200, response.get_json()
+                return response
+            return call
+
+        cases = [
+            ("first page", ""),
+            ("deep page (cursor)", f"cursor={deep_cursor}"),
+            ("prediction=Fraud", "prediction=Fraud"),
+            ("prediction=Fraud, deep", f"prediction=Fraud&cursor={deep_cursor}"),
+            ("nameOrig lookup", "nameOrig=C12345"),
+            ("file_name + type", "file_name=upload_3.csv&type=TRANSFER"),
+            ("timestamp window", "since=2026-01-03T00:00:00&until=2026-01-03T01:00:00"),
+        ]
+
+        results = {}
+        for label in ("no indexes", "indexed"):
+            if label == "indexed":
+                with app.app_context():
+                    started = time.perf_counter()
+                    for index in BatchTransactionLog.__table__.indexes:
+                        index.create(db.engine)
+                    with db.engine.begin() as conn:
+                        conn.execute(text("ANALYZE"))
+                    print(f"Created {len(BatchTransactionLog.__table__.indexes)} indexes + ANALYZE "
+                          f"in {time.perf_counter() - started:.1f} s\n")
+            for name, query in cases:
+                results.setdefault(name, {})[label] = best_of(get(query), args.repeat)
+
+        print(f"{'query (limit 50)':<26} | {'no indexes ms':>13} | {'indexed ms':>10}")
+        print("-" * 56)
+        for name, timings in results.items():
+            print(f"{name:<26} | {timings['no indexes']:>13.2f} | {timings['indexed']:>10.2f}")
+
+        with app.app_context():
+            def offset_page():
+                db.session.execute(text(
+                    "SELECT * FROM batch_transaction_log ORDER BY id DESC LIMIT 50 OFFSET :o"
+                ), {"o": deep_offset}).fetchall()
+
+            print(f"\nSame deep page with LIMIT/OFFSET {deep_offset:,}: "
+                  f"{best_of(offset_page, args.repeat):.2f} ms (SQL only)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare the pickled XGBoost model with the compiled NumPy tree evaluator.
+
+Checks bit-identical parity on synthetic PaySim-style rows (including
+values sitting exactly on split thresholds and missing values), then times
+load and predict_proba for both paths at several batch sizes.
+
+Usage (from backend/):
+    python benchmarks/bench_tree_evaluator.py [--rows 200000] [--repeat 5]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from utils.fraud_scoring import FEATURES  # noqa: E402
+from utils.tree_compiler import CompiledForest, check_parity, compile_xgb  # noqa: E402
+
+MODEL_PATH = os.path.join(BASE_DIR, "models", "model.pkl")
+
+
+def synthetic_rows(forest, n, seed=0):
+    """PaySim-like rows plus rows that hit split thresholds exactly and NaNs."""
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.integers(1, 744, n),                 # step
+        rng.integers(0, 5, n),                   # type
+        rng.lognormal(10, 2, n),                 # amount
+        rng.lognormal(9, 3, n),                  # oldbalanceOrg
+        rng.lognormal(8, 3, n) * (rng.random(n) < 0.6),
+        rng.lognormal(10, 3, n) * (rng.random(n) < 0.5),
+        rng.lognormal(10, 3, n) * (rng.random(n) < 0.5),
+    ]).astype(np.float32)
+
+    # Put a quarter of the cells exactly on a threshold of the same feature
+    inner = np.where(forest.left != np.arange(forest.n_nodes))[0]
+    hits = rng.choice(inner, size=n // 4)
+    rows = rng.integers(0, n, size=len(hits))
+    X[rows, forest.feature[hits]] = forest.threshold[hits]
+
+    X[rng.random(X.shape) < 0.01] = np.nan
+    return pd.DataFrame(X, columns=FEATURES)
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import joblib
+
+    start = time.perf_counter()
+    model = joblib.load(MODEL_PATH)
+    xgb_load = time.perf_counter() - start
+
+    forest = compile_xgb(model)
+    with tempfile.TemporaryDirectory() as tmp:
+        forest.save(tmp)
+        start = time.perf_counter()
+        forest = CompiledForest.load(tmp)
+        compiled_load = time.perf_counter() - start
+
+        data = synthetic_rows(forest, args.rows)
+
+        parity = check_parity(model, forest, data)
+        print(f"Parity over {parity['rows']} rows: {parity}")
+        if not parity["bit_identical"]:
+            sys.exit("❌ Compiled evaluator is not bit-identical to the pickled model")
+
+        print(f"\nArtifact size: pickle {os.path.getsize(MODEL_PATH) / 1024:.1f} KiB, "
+              f"node tables {forest.nbytes / 1024:.1f} KiB "
+              f"(in-memory booster {len(pickle.dumps(model)) / 1024:.1f} KiB)")
+        print(f"Load time:     joblib {xgb_load * 1000:.1f} ms, compiled {compiled_load * 1000:.2f} ms\n")
+
+        print(f"{'batch':>8} | {'xgboost ms':>11} | {'compiled ms':>11} | {'speedup':>7} | {'compiled rows/s':>15}")
+        print("-" * 66)
+        for batch in (1, 16, 64, 1024, 16384, args.rows):
+            chunk = data.iloc[:batch]
+            xgb_t = best_of(lambda: model.predict_proba(chunk), args.repeat)
+            cmp_t = best_of(lambda: forest.predict_proba(chunk), args.repeat)
+            print(f"{batch:>8} | {xgb_t * 1000:>11.3f} | {cmp_t * 1000:>11.3f} | "
+                  f"{xgb_t / cmp_t:>6.1f}x | {batch / cmp_t:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
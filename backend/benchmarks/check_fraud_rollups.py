@@ -0,0 +1,85 @@
+"""
+Check that /api/fraud/analytics counts the whole transaction history.
+
+Fills a throw-away SQLite database with Transaction / BatchTransactionLog
+rows and no rollups (as after adding the rollup table to a populated
+database), then lets a predict-style write add its rollups *before* the
+first analytics read. The analytics totals must still equal a GROUP BY
+over the base tables; a second read must not backfill again.
+
+Usage (from backend/):
+    python benchmarks/check_fraud_rollups.py [--rows 5000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+from flask import Flask
+from sqlalchemy import func, insert
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from analytics import analytics_bp  # noqa: E402
+from models import db, BatchTransactionLog, FraudRollup, Transaction  # noqa: E402
+from utils.fraud_rollups import record_rollups  # noqa: E402
+
+TYPES = ["CASH_IN", "CASH_OUT", "DEBIT", "PAYMENT", "TRANSFER"]
+
+
+def synthetic_rows(n, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        {"step": int(s), "type": TYPES[t], "amount": float(a), "prediction": "Fraud" if f else "Legit"}
+        for s, t, a, f in zip(rng.integers(1, 744, n), rng.integers(0, 5, n),
+                              rng.exponential(5_000, n).round(2), rng.random(n) < 0.02)
+    ]
+
+
+def expected(model):
+    total = db.session.query(func.count(model.id)).scalar()
+    fraud = db.session.query(func.count(model.id)).filter(model.prediction == "Fraud").scalar()
+    return total, fraud
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tempfile.mkdtemp(prefix='rollups-')}/check.db"
+    db.init_app(app)
+    app.register_blueprint(analytics_bp)
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Transaction), synthetic_rows(args.rows, 0))
+        db.session.execute(insert(BatchTransactionLog), synthetic_rows(args.rows, 1))
+        db.session.commit()
+
+        # A write lands before anything has read (and backfilled) the rollups
+        new = synthetic_rows(1, 2)
+        db.session.add(Transaction(**new[0]))
+        record_rollups(db.session, "single", new)
+        db.session.commit()
+        print(f"rollup rows before first read: {db.session.query(FraudRollup).count()}")
+
+        failures = 0
+        for attempt in ("first read", "second read"):
+            for source, model in (("single", Transaction), ("batch", BatchTransactionLog)):
+                body = client.get(f"/api/fraud/analytics?source={source}").get_json()
+                total, fraud = expected(model)
+                ok = (body["total"], body["fraud"]) == (total, fraud)
+                failures += not ok
+                print(f"{attempt:<11} {source:<6}: analytics {body['total']:>6} / {body['fraud']:>4} fraud, "
+                      f"base tables {total:>6} / {fraud:>4}  {'ok' if ok else 'MISMATCH'}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Offline load test of the market-data endpoints against the replay provider.
+
+Serves /api/polygon_data, /api/recommendation and /api/portfolio/analyze
+from synthetic (or recorded, see --replay-dir) bars and quotes, with
+seeded latency and error injection, so runs are repeatable and need no
+network or API keys. Reports throughput, latency percentiles and status
+codes per endpoint.
+
+Usage (from backend/):
+    python benchmarks/load_market_replay.py [--requests 300] [--concurrency 16]
+        [--latency-ms 50] [--jitter-ms 20] [--error-rate 0.02] [--seed 0]
+        [--replay-dir DIR] [--no-cache]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+TICKERS = ["AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "NVDA", "JPM", "V", "NFLX"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay-dir", default=None, help="recorded bars/quotes (default: synthetic only)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the on-disk bar cache")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    scratch = tempfile.mkdtemp(prefix="replay-load-")
+
+    # Config is read at import time, so select the provider before importing the app modules
+    os.environ["MARKET_DATA_PROVIDER"] = "replay"
+    os.environ["MARKET_REPLAY_DIR"] = args.replay_dir or scratch
+    os.environ["MARKET_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["MARKET_REPLAY_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["MARKET_REPLAY_ERROR_RATE"] = str(args.error_rate)
+    os.environ["MARKET_REPLAY_SEED"] = str(args.seed)
+    os.environ["MARKET_DATA_CACHE_DIR"] = os.path.join(scratch, "cache")
+    os.environ["MARKET_DATA_CACHE_ENABLED"] = "false" if args.no_cache else "true"
+    os.environ.pop("OPENAI_API_KEY", None)
+
+    from flask import Flask
+    from routes.polygon_routes import polygon_bp
+    from routes.portfolio_routes import portfolio_bp
+    from routes.recommendation_routes import recommendation_bp
+    from utils.market_providers import get_provider
+
+    app = Flask(__name__)
+    for bp in (polygon_bp, recommendation_bp, portfolio_bp):
+        app.register_blueprint(bp)
+
+    rng = random.Random(args.seed)
+    picks = [rng.choice(TICKERS) for _ in range(args.requests)]  # same request mix on every run
+    portfolio_csv = "Symbol,BuyPrice,Quantity\n" + "".join(f"{t},100,{i + 1}\n" for i, t in enumerate(TICKERS))
+
+    def bars_request(client, i):
+        return client.get("/api/polygon_data", query_string={
+            "ticker": picks[i], "from": "2024-01-02", "to": "2024-03-28", "timespan": "hour",
+        })
+
+    def recommendation_request(client, i):
+        return client.get("/api/recommendation", query_string={
+            "ticker": picks[i], "from": "2024-01-02", "to": "2024-06-28",
+        })
+
+    def portfolio_request(client, _):
+        data = {"file": (io.BytesIO(portfolio_csv.encode()), "portfolio.csv")}
+        return client.post("/api/portfolio/analyze", data=data, content_type="multipart/form-data")
+
+    cases = [
+        ("/api/polygon_data", bars_request),
+        ("/api/recommendation", recommendation_request),
+        ("/api/portfolio/analyze", portfolio_request),
+    ]
+
+    print(f"replay provider: latency {args.latency_ms}+{args.jitter_ms} ms, error rate {args.error_rate}, "
+          f"seed {args.seed}, cache {'off' if args.no_cache else 'on'}")
+    print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}\n")
+    print(f"{'endpoint':<24} | {'req/s':>7} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7} | status codes")
+    print("-" * 80)
+
+    for name, send in cases:
+        def one(i):
+            client = app.test_client()
+            start = time.perf_counter()
+            response = send(client, i)
+            return time.perf_counter() - start, response.status_code
+
+        wall = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(one, range(args.requests)))
+        wall = time.perf_counter() - wall
+
+        latencies = sorted(seconds * 1000 for seconds, _ in results)
+        codes = Counter(code for _, code in results)
+        pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))]  # noqa: E731
+        print(f"{name:<24} | {len(results) / wall:>7.1f} | {pct(0.50):>7.1f} | {pct(0.95):>7.1f} | "
+              f"{pct(0.99):>7.1f} | {dict(sorted(codes.items()))}")
+
+    print(f"\nprovider calls: {get_provider().stats()}")
+
+
+if __name__ == "__main__":
+    main()
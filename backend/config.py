@@ -5,3 +5,104 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 class Config:
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(BASE_DIR, 'database.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Fraud scoring: rows per predict_proba call / bulk insert on /api/predict/batch
+    PREDICT_BATCH_CHUNK_SIZE = int(os.getenv("PREDICT_BATCH_CHUNK_SIZE", 50000))
+
+    # Streaming ingestion: uploads are spooled here and read back in bounded chunks
+    INGEST_UPLOAD_DIR = os.getenv("INGEST_UPLOAD_DIR", os.path.join(BASE_DIR, "uploads"))
+    INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", 20000))
+
+    # /api/predict micro-batching: wait window (ms) and max rows per model call
+    PREDICT_MICROBATCH_ENABLED = os.getenv("PREDICT_MICROBATCH_ENABLED", "true").lower() == "true"
+    PREDICT_BATCH_WINDOW_MS = float(os.getenv("PREDICT_BATCH_WINDOW_MS", 2))
+    PREDICT_MAX_BATCH_SIZE = int(os.getenv("PREDICT_MAX_BATCH_SIZE", 64))
+    PREDICT_TIMEOUT_S = float(os.getenv("PREDICT_TIMEOUT_S", 10))
+
+    # Evaluator for /api/predict: "compiled" (NumPy node tables) or "xgboost"
+    FRAUD_ONLINE_BACKEND = os.getenv("FRAUD_ONLINE_BACKEND", "compiled")
+
+    # Fraud model registry: versioned model folders (see utils/model_registry.py)
+    FRAUD_MODEL_DIR = os.getenv("FRAUD_MODEL_DIR", os.path.join(BASE_DIR, "models"))
+    FRAUD_MODEL_VERSION = os.getenv("FRAUD_MODEL_VERSION")  # None = top-level manifest
+    FRAUD_MODEL_MMAP_MIN_BYTES = int(os.getenv("FRAUD_MODEL_MMAP_MIN_BYTES", 64 * 1024 * 1024))
+
+    # /api/predict write-behind buffer for Transaction rows
+    TXN_BUFFER_ENABLED = os.getenv("TXN_BUFFER_ENABLED", "true").lower() == "true"
+    TXN_BUFFER_MAX_BATCH = int(os.getenv("TXN_BUFFER_MAX_BATCH", 500))
+    TXN_BUFFER_FLUSH_MS = float(os.getenv("TXN_BUFFER_FLUSH_MS", 200))
+    TXN_BUFFER_CAPACITY = int(os.getenv("TXN_BUFFER_CAPACITY", 10000))
+    TXN_BUFFER_PUT_TIMEOUT_S = float(os.getenv("TXN_BUFFER_PUT_TIMEOUT_S", 0.5))
+
+    # Per-account velocity feature store (utils/feature_store.py)
+    FEATURE_STORE_WINDOW_STEPS = int(os.getenv("FEATURE_STORE_WINDOW_STEPS", 24))
+    FEATURE_STORE_MAX_ACCOUNTS = int(os.getenv("FEATURE_STORE_MAX_ACCOUNTS", 1_000_000))
+    FEATURE_STORE_IDLE_STEPS = int(os.getenv("FEATURE_STORE_IDLE_STEPS", 24 * 7))
+    FEATURE_STORE_SNAPSHOT_PATH = os.getenv(
+        "FEATURE_STORE_SNAPSHOT_PATH", os.path.join(BASE_DIR, "data", "feature_store.npz")
+    )
+    FEATURE_STORE_SNAPSHOT_S = float(os.getenv("FEATURE_STORE_SNAPSHOT_S", 300))
+
+    # Transaction graph index (utils/transaction_graph.py)
+    GRAPH_COMPACT_EVERY = int(os.getenv("GRAPH_COMPACT_EVERY", 200000))
+    GRAPH_BOOTSTRAP_FROM_DB = os.getenv("GRAPH_BOOTSTRAP_FROM_DB", "true").lower() == "true"
+
+    # Fraud analytics rollups (utils/fraud_rollups.py): steps per bucket (PaySim step = 1 hour)
+    ROLLUP_STEP_BUCKET = int(os.getenv("ROLLUP_STEP_BUCKET", 24))
+
+    # Market data: on-disk OHLCV bar cache (utils/bar_store.py)
+    MARKET_DATA_CACHE_ENABLED = os.getenv("MARKET_DATA_CACHE_ENABLED", "true").lower() == "true"
+    MARKET_DATA_CACHE_DIR = os.getenv("MARKET_DATA_CACHE_DIR", os.path.join(BASE_DIR, "data", "bars"))
+    # Concurrent multi-ticker fetches (utils/market_panel.py); also sizes the HTTP connection pool
+    MARKET_DATA_MAX_WORKERS = int(os.getenv("MARKET_DATA_MAX_WORKERS", 50))
+    MARKET_DATA_MAX_TICKERS = int(os.getenv("MARKET_DATA_MAX_TICKERS", 100))
+    MARKET_DATA_PANEL_TIMEOUT_S = float(os.getenv("MARKET_DATA_PANEL_TIMEOUT_S", 30))
+    # Latest-price lookups (utils/quotes.py): concurrent fetches of the unique symbols of a request
+    QUOTE_MAX_WORKERS = int(os.getenv("QUOTE_MAX_WORKERS", 16))
+    QUOTE_TIMEOUT_S = float(os.getenv("QUOTE_TIMEOUT_S", 10))
+    QUOTE_BATCH_TIMEOUT_S = float(os.getenv("QUOTE_BATCH_TIMEOUT_S", 60))
+    # Shared quote cache: TTL during trading hours, then served stale (refreshed in the background)
+    # for QUOTE_CACHE_STALE_S more; outside trading hours the last close is served without upstream calls
+    QUOTE_CACHE_ENABLED = os.getenv("QUOTE_CACHE_ENABLED", "true").lower() == "true"
+    QUOTE_CACHE_MAX_ENTRIES = int(os.getenv("QUOTE_CACHE_MAX_ENTRIES", 5000))
+    QUOTE_CACHE_TTL_S = float(os.getenv("QUOTE_CACHE_TTL_S", 15))
+    QUOTE_CACHE_STALE_S = float(os.getenv("QUOTE_CACHE_STALE_S", 120))
+
+    # Polygon request scheduler (utils/upstream_scheduler.py). Defaults match the
+    # free plan (5 calls/min); raise POLYGON_CALLS_PER_MIN on paid plans.
+    POLYGON_CALLS_PER_MIN = float(os.getenv("POLYGON_CALLS_PER_MIN", 5))
+    POLYGON_BURST = int(os.getenv("POLYGON_BURST", 5))
+    POLYGON_MAX_WAIT_S = float(os.getenv("POLYGON_MAX_WAIT_S", 30))
+
+    # Derive hour / day / week bars from cached minute bars (utils/resample.py)
+    MARKET_DATA_RESAMPLE_ENABLED = os.getenv("MARKET_DATA_RESAMPLE_ENABLED", "true").lower() == "true"
+
+    # Market data provider (utils/market_providers.py): "polygon" (live) or "replay"
+    # (local / synthetic bars and quotes with injected latency and errors, for offline load tests)
+    MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER", "polygon").lower()
+    MARKET_REPLAY_DIR = os.getenv("MARKET_REPLAY_DIR", os.path.join(BASE_DIR, "data", "replay"))
+    MARKET_REPLAY_SYNTHETIC = os.getenv("MARKET_REPLAY_SYNTHETIC", "true").lower() == "true"
+    MARKET_REPLAY_LATENCY_MS = float(os.getenv("MARKET_REPLAY_LATENCY_MS", 0))
+    MARKET_REPLAY_JITTER_MS = float(os.getenv("MARKET_REPLAY_JITTER_MS", 0))
+    MARKET_REPLAY_ERROR_RATE = float(os.getenv("MARKET_REPLAY_ERROR_RATE", 0))
+    MARKET_REPLAY_SEED = int(os.getenv("MARKET_REPLAY_SEED", 0))
+
+    # Backtesting (utils/backtester.py): process pool size and grid limit for parameter sweeps
+    BACKTEST_MAX_WORKERS = int(os.getenv("BACKTEST_MAX_WORKERS", os.cpu_count() or 1))
+    BACKTEST_MAX_COMBOS = int(os.getenv("BACKTEST_MAX_COMBOS", 500))
+    # Sweeps under this many combos x tickers x bars (~0.1 s serially) skip the pool
+    BACKTEST_PARALLEL_MIN_CELLS = int(os.getenv("BACKTEST_PARALLEL_MIN_CELLS", 1_000_000))
+
+    # Universe screener (utils/screener.py): indicator snapshot on completed daily bars,
+    # refreshed incrementally in the background (0 disables the refresh thread)
+    SCREENER_UNIVERSE = os.getenv("SCREENER_UNIVERSE", "")
+    SCREENER_UNIVERSE_FILE = os.getenv("SCREENER_UNIVERSE_FILE", "")
+    SCREENER_STATE_PATH = os.getenv("SCREENER_STATE_PATH", os.path.join(BASE_DIR, "data", "screener_state.json"))
+    SCREENER_LOOKBACK_DAYS = int(os.getenv("SCREENER_LOOKBACK_DAYS", 60))
+    SCREENER_REFRESH_S = float(os.getenv("SCREENER_REFRESH_S", 900))
+    SCREENER_MAX_WORKERS = int(os.getenv("SCREENER_MAX_WORKERS", 8))
+
+    # Memoized analyze_stock results (utils/analysis_cache.py)
+    ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 2048))
+    ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", 16 * 2**20))
+    ANALYSIS_CACHE_TTL_S = float(os.getenv("ANALYSIS_CACHE_TTL_S", 300))
@@ -0,0 +1,26 @@
+"""Record which model version scored an ingestion job
+
+Revision ID: 5b8e2d41c7a9
+Revises: a3c1e7f2b904
+Create Date: 2026-10-17 11:03:18.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2d41c7a9'
+down_revision = 'a3c1e7f2b904'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ingestion_job') as batch_op:
+        batch_op.add_column(sa.Column('model_version', sa.String(length=50), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ingestion_job') as batch_op:
+        batch_op.drop_column('model_version')
@@ -0,0 +1,39 @@
+"""Add IngestionJob for streamed batch uploads
+
+Revision ID: a3c1e7f2b904
+Revises: 7dd9af6cfed9
+Create Date: 2026-10-17 09:12:41.512330
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c1e7f2b904'
+down_revision = '7dd9af6cfed9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ingestion_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('file_name', sa.String(length=255), nullable=True),
+    sa.Column('file_path', sa.String(length=500), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('chunk_size', sa.Integer(), nullable=True),
+    sa.Column('rows_read', sa.Integer(), nullable=True),
+    sa.Column('rows_inserted', sa.Integer(), nullable=True),
+    sa.Column('rows_rejected', sa.Integer(), nullable=True),
+    sa.Column('fraud_count', sa.Integer(), nullable=True),
+    sa.Column('chunks_committed', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('ingestion_job')
@@ -0,0 +1,57 @@
+"""Add FraudRollup aggregate table
+
+Revision ID: c9f4a6d3e812
+Revises: 5b8e2d41c7a9
+Create Date: 2026-10-17 13:27:55.390412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f4a6d3e812'
+down_revision = '5b8e2d41c7a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('fraud_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=10), nullable=False),
+    sa.Column('step_bucket', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('prediction', sa.String(length=10), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('amount_sum', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'step_bucket', 'type', 'prediction', name='uq_fraud_rollup_key')
+    )
+    # Backfill from the base tables (one GROUP BY per source) in 24-step buckets and
+    # write the marker row (count = bucket width) that utils/fraud_rollups.ensure_rollups
+    # looks for; an app configured with another ROLLUP_STEP_BUCKET rebuilds on first read
+    bucket_steps = 24
+
+    rollup = sa.table('fraud_rollup',
+        sa.column('source', sa.String), sa.column('step_bucket', sa.Integer),
+        sa.column('type', sa.String), sa.column('prediction', sa.String),
+        sa.column('count', sa.Integer), sa.column('amount_sum', sa.Float))
+    for source, table_name in (('single', 'transaction'), ('batch', 'batch_transaction_log')):
+        base = sa.table(table_name, sa.column('step', sa.Integer), sa.column('type', sa.String),
+                        sa.column('prediction', sa.String), sa.column('amount', sa.Float))
+        bucket = sa.func.coalesce(base.c.step, 0) // bucket_steps
+        txn_type = sa.func.coalesce(base.c.type, '')
+        prediction = sa.func.coalesce(base.c.prediction, '')
+        select = sa.select(
+            sa.literal(source), bucket, txn_type, prediction,
+            sa.func.count(), sa.func.coalesce(sa.func.sum(base.c.amount), 0.0),
+        ).group_by(bucket, txn_type, prediction)
+        op.execute(rollup.insert().from_select(
+            ['source', 'step_bucket', 'type', 'prediction', 'count', 'amount_sum'], select))
+    op.bulk_insert(rollup, [{'source': 'backfill', 'step_bucket': -1, 'type': '', 'prediction': '',
+                             'count': bucket_steps, 'amount_sum': 0.0}])
+
+
+def downgrade():
+    op.drop_table('fraud_rollup')
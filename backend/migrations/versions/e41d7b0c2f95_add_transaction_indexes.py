@@ -0,0 +1,51 @@
+"""Add lookup indexes to transaction tables
+
+Revision ID: e41d7b0c2f95
+Revises: c9f4a6d3e812
+Create Date: 2026-10-17 15:02:11.804127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41d7b0c2f95'
+down_revision = 'c9f4a6d3e812'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transaction', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_transaction_prediction'), ['prediction'], unique=False)
+        batch_op.create_index(batch_op.f('ix_transaction_type'), ['type'], unique=False)
+        batch_op.create_index(batch_op.f('ix_transaction_nameOrig'), ['nameOrig'], unique=False)
+        batch_op.create_index(batch_op.f('ix_transaction_nameDest'), ['nameDest'], unique=False)
+
+    with op.batch_alter_table('batch_transaction_log', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_batch_transaction_log_prediction'), ['prediction'], unique=False)
+        batch_op.create_index(batch_op.f('ix_batch_transaction_log_type'), ['type'], unique=False)
+        batch_op.create_index(batch_op.f('ix_batch_transaction_log_nameOrig'), ['nameOrig'], unique=False)
+        batch_op.create_index(batch_op.f('ix_batch_transaction_log_nameDest'), ['nameDest'], unique=False)
+        batch_op.create_index(batch_op.f('ix_batch_transaction_log_timestamp'), ['timestamp'], unique=False)
+        batch_op.create_index(batch_op.f('ix_batch_transaction_log_file_name'), ['file_name'], unique=False)
+
+    # Refresh planner statistics so multi-filter queries pick the most selective index
+    op.execute('ANALYZE')
+
+
+def downgrade():
+    with op.batch_alter_table('batch_transaction_log', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_batch_transaction_log_file_name'))
+        batch_op.drop_index(batch_op.f('ix_batch_transaction_log_timestamp'))
+        batch_op.drop_index(batch_op.f('ix_batch_transaction_log_nameDest'))
+        batch_op.drop_index(batch_op.f('ix_batch_transaction_log_nameOrig'))
+        batch_op.drop_index(batch_op.f('ix_batch_transaction_log_type'))
+        batch_op.drop_index(batch_op.f('ix_batch_transaction_log_prediction'))
+
+    with op.batch_alter_table('transaction', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_transaction_nameDest'))
+        batch_op.drop_index(batch_op.f('ix_transaction_nameOrig'))
+        batch_op.drop_index(batch_op.f('ix_transaction_type'))
+        batch_op.drop_index(batch_op.f('ix_transaction_prediction'))
@@ -7,15 +7,15 @@ db = SQLAlchemy()
 class Transaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     step = db.Column(db.Integer)
-    type = db.Column(db.String(20))
+    type = db.Column(db.String(20), index=True)
     amount = db.Column(db.Float)
-    nameOrig = db.Column(db.String(100))
+    nameOrig = db.Column(db.String(100), index=True)
     oldbalanceOrg = db.Column(db.Float)
     newbalanceOrig = db.Column(db.Float)
-    nameDest = db.Column(db.String(100))
+    nameDest = db.Column(db.String(100), index=True)
     oldbalanceDest = db.Column(db.Float)
     newbalanceDest = db.Column(db.Float)
-    prediction = db.Column(db.String(10))  # Fraud / Legit
+    prediction = db.Column(db.String(10), index=True)  # Fraud / Legit
     confidence = db.Column(db.Float)
     risk_score = db.Column(db.Float)
 
@@ -23,20 +23,34 @@ class Transaction(db.Model):
 # ✅ For batch-uploaded CSV/XLSX logs
 class BatchTransactionLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    file_name = db.Column(db.String(255))  # Uploaded file name
+    file_name = db.Column(db.String(255), index=True)  # Uploaded file name
     step = db.Column(db.Integer)
-    type = db.Column(db.String(20))
+    type = db.Column(db.String(20), index=True)
     amount = db.Column(db.Float)
-    nameOrig = db.Column(db.String(100))
+    nameOrig = db.Column(db.String(100), index=True)
     oldbalanceOrg = db.Column(db.Float)
     newbalanceOrig = db.Column(db.Float)
-    nameDest = db.Column(db.String(100))
+    nameDest = db.Column(db.String(100), index=True)
     oldbalanceDest = db.Column(db.Float)
     newbalanceDest = db.Column(db.Float)
-    prediction = db.Column(db.String(10))  # Fraud / Legit
+    prediction = db.Column(db.String(10), index=True)  # Fraud / Legit
     confidence = db.Column(db.Float)
     risk_score = db.Column(db.Float)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+# ✅ Pre-aggregated fraud counts, maintained on insert (see utils/fraud_rollups.py)
+class FraudRollup(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint("source", "step_bucket", "type", "prediction", name="uq_fraud_rollup_key"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(10), nullable=False)  # "single" (Transaction) / "batch" (BatchTransactionLog)
+    step_bucket = db.Column(db.Integer, nullable=False)  # step // ROLLUP_STEP_BUCKET
+    type = db.Column(db.String(20), nullable=False)
+    prediction = db.Column(db.String(10), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    amount_sum = db.Column(db.Float, nullable=False, default=0.0)
 
 # ✅ New user model for authentication (login/register)
 class User(db.Model):
@@ -44,4 +58,38 @@ class User(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
-    registered_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    registered_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# ✅ Progress of a streamed CSV/XLSX ingestion into BatchTransactionLog
+class IngestionJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    file_name = db.Column(db.String(255))  # Original upload name
+    file_path = db.Column(db.String(500))  # Spooled copy on disk
+    status = db.Column(db.String(20), default="queued")  # queued / running / completed / failed
+    chunk_size = db.Column(db.Integer)
+    rows_read = db.Column(db.Integer, default=0)  # Source rows consumed (resume offset)
+    rows_inserted = db.Column(db.Integer, default=0)
+    rows_rejected = db.Column(db.Integer, default=0)
+    fraud_count = db.Column(db.Integer, default=0)
+    chunks_committed = db.Column(db.Integer, default=0)
+    model_version = db.Column(db.String(50))  # Registry version that scored the file
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "file_name": self.file_name,
+            "status": self.status,
+            "chunk_size": self.chunk_size,
+            "rows_read": self.rows_read,
+            "rows_inserted": self.rows_inserted,
+            "rows_rejected": self.rows_rejected,
+            "fraud_count": self.fraud_count,
+            "chunks_committed": self.chunks_committed,
+            "model_version": self.model_version,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -4,6 +4,7 @@ import pandas as pd
 from flask import Blueprint, request, jsonify
 from dotenv import load_dotenv
 from openai import OpenAI
+from utils.quotes import fetch_quotes
 
 # Load environment variables
 load_dotenv()
@@ -34,12 +35,23 @@ def analyze_portfolio():
         else:
             return jsonify({"error": "Unsupported file format"}), 400
 
-        required_cols = ["Symbol", "Shares", "PurchasePrice", "CurrentPrice"]
+        required_cols = ["Symbol", "Shares", "PurchasePrice"]
         if not all(col in df.columns for col in required_cols):
             return jsonify({
                 "error": f"File must include columns: {', '.join(required_cols)}"
             }), 400
 
+        # Fill missing CurrentPrice values from the shared quote cache
+        if "CurrentPrice" not in df.columns:
+            df["CurrentPrice"] = float("nan")
+        missing = df["CurrentPrice"].isna()
+        quote_errors = {}
+        if missing.any():
+            df["Symbol"] = df["Symbol"].astype(str).str.strip().str.upper()
+            prices, quote_errors = fetch_quotes(df.loc[missing, "Symbol"])
+            df.loc[missing, "CurrentPrice"] = df.loc[missing, "Symbol"].map(prices)
+            df = df.astype({"CurrentPrice": "float64"})
+
         df["ROI (%)"] = ((df["CurrentPrice"] - df["PurchasePrice"]) / df["PurchasePrice"]) * 100
         df["ROI (%)"] = df["ROI (%)"].round(2)
 
@@ -72,7 +84,8 @@ def analyze_portfolio():
         return jsonify({
             "status": "success",
             "analysis": ai_text,
-            "roi_table": df.to_dict(orient="records"),
+            "roi_table": df.astype(object).where(df.notna(), None).to_dict(orient="records"),
+            "quote_errors": quote_errors,
         }), 200
 
     except Exception as e:
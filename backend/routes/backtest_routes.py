@@ -0,0 +1,132 @@
+# routes/backtest_routes.py
+from flask import Blueprint, jsonify, request
+from config import Config
+from utils.backtester import DEFAULT_GRID, METRICS, PERIODS_PER_YEAR, BacktestPanel, expand_grid, summarize, sweep
+from utils.market_panel import fetch_panel, normalize_tickers
+
+backtest_bp = Blueprint("backtest_bp", __name__, url_prefix="/api/backtest")
+
+
+# ==========================================================
+# ⚙️ Shared request parsing
+# ==========================================================
+def _parse_request():
+    """Merge query args and JSON body; returns (args, tickers, error_response)."""
+    params = (request.get_json(silent=True) or {}) if request.method == "POST" else {}
+    args = {**request.args.to_dict(), **params}
+
+    tickers = normalize_tickers(args.get("tickers"))
+    if not tickers:
+        return args, None, (jsonify({"error": "Provide at least one ticker in `tickers`."}), 400)
+    if len(tickers) > Config.MARKET_DATA_MAX_TICKERS:
+        return args, None, (jsonify({"error": f"At most {Config.MARKET_DATA_MAX_TICKERS} tickers per request."}), 400)
+    if args.get("timespan", "day") not in PERIODS_PER_YEAR:
+        return args, None, (jsonify({"error": "timespan must be minute, hour, day or week"}), 400)
+    return args, tickers, None
+
+
+def _load_closes(args, tickers):
+    timespan = args.get("timespan", "day")
+    result = fetch_panel(tickers, args.get("from", "2023-01-01"), args.get("to", "2024-12-31"), timespan, fields=("close",))
+    return result, PERIODS_PER_YEAR[timespan]
+
+
+def _optional_int(value):
+    return int(value) if value not in (None, "", "none", "null") else None
+
+
+# ==========================================================
+# 📉 Route: GET/POST /api/backtest
+# ==========================================================
+@backtest_bp.route("", methods=["GET", "POST"])
+def run_backtest():
+    """
+    Replay the analyze_stock MA-crossover rule over cached history.
+    Params: tickers, from, to, timespan (day), short (5), long (10),
+    rsi_period (14; empty/null = no RSI filter), rsi_overbought (70), cost_bps (0).
+    """
+    args, tickers, error = _parse_request()
+    if error:
+        return error
+
+    try:
+        short, long = int(args.get("short", 5)), int(args.get("long", 10))
+        rsi_period = _optional_int(args.get("rsi_period", 14))
+        if not 0 < short < long:
+            return jsonify({"error": "Require 0 < short < long."}), 400
+
+        result, periods_per_year = _load_closes(args, tickers)
+        metrics = BacktestPanel(result["panel"]["close"]).run(
+            short, long, rsi_period,
+            rsi_overbought=float(args.get("rsi_overbought", 70)),
+            cost_bps=float(args.get("cost_bps", 0)),
+            periods_per_year=periods_per_year,
+        )
+        summary, per_ticker = summarize(metrics, result["tickers"])
+
+        return jsonify({
+            "status": "success",
+            "params": {"short": short, "long": long, "rsi_period": rsi_period},
+            "summary": summary,
+            "tickers": per_ticker,
+            "errors": result["errors"],
+        }), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error in /api/backtest: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+# ==========================================================
+# 🧪 Route: POST /api/backtest/sweep
+# ==========================================================
+@backtest_bp.route("/sweep", methods=["GET", "POST"])
+def run_sweep():
+    """
+    Backtest a parameter grid across tickers on a process pool.
+    Params: tickers, from, to, timespan, grid ({short: [...], long: [...],
+    rsi_period: [...]} — missing keys use the default grid), rank_by
+    (sharpe), top (20), cost_bps, rsi_overbought.
+    """
+    args, tickers, error = _parse_request()
+    if error:
+        return error
+
+    try:
+        combos = expand_grid(args.get("grid") if isinstance(args.get("grid"), dict) else None)
+        if not combos:
+            return jsonify({"error": "The grid has no combination with short < long."}), 400
+        if len(combos) > Config.BACKTEST_MAX_COMBOS:
+            return jsonify({"error": f"At most {Config.BACKTEST_MAX_COMBOS} parameter combinations per sweep."}), 400
+        rank_by = args.get("rank_by", "sharpe")
+        if rank_by not in METRICS + ("median_total_return",):
+            return jsonify({"error": f"Unknown rank_by metric: {rank_by}"}), 400
+
+        result, periods_per_year = _load_closes(args, tickers)
+        results = sweep(
+            result["panel"]["close"], combos,
+            cost_bps=float(args.get("cost_bps", 0)),
+            periods_per_year=periods_per_year,
+            rsi_overbought=float(args.get("rsi_overbought", 70)),
+            max_workers=Config.BACKTEST_MAX_WORKERS,
+            min_parallel_cells=Config.BACKTEST_PARALLEL_MIN_CELLS,
+        )
+        results.sort(key=lambda r: (r[rank_by] is not None, r[rank_by] or 0), reverse=True)
+
+        return jsonify({
+            "status": "success",
+            "tickers": result["tickers"],
+            "combinations": len(combos),
+            "rank_by": rank_by,
+            "results": results[:int(args.get("top", 20))],
+            "default_grid": DEFAULT_GRID,
+            "errors": result["errors"],
+        }), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error in /api/backtest/sweep: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
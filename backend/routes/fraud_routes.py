@@ -0,0 +1,66 @@
+# routes/fraud_routes.py
+from flask import Blueprint, jsonify, request
+from utils.feature_store import get_feature_store
+from utils.transaction_graph import get_transaction_graph, OUT, IN
+
+fraud_bp = Blueprint("fraud_bp", __name__, url_prefix="/api/fraud")
+
+
+# ==========================================================
+# 🧮 Route: GET /api/fraud/features/<account>
+# ==========================================================
+@fraud_bp.route("/features/<account>", methods=["GET"])
+def account_features(account):
+    """Rolling velocity features for one account, served from memory."""
+    step = request.args.get("step", type=int)
+    features = get_feature_store().features(account, step)
+    if features is None:
+        return jsonify({"status": "error", "message": f"No activity recorded for {account}."}), 404
+    return jsonify({"status": "success", "account": account, "features": features}), 200
+
+
+# ==========================================================
+# 📊 Route: GET /api/fraud/features
+# ==========================================================
+@fraud_bp.route("/features", methods=["GET"])
+def feature_store_stats():
+    return jsonify({"status": "success", "data": get_feature_store().stats()}), 200
+
+
+# ==========================================================
+# 🕸️ Route: GET /api/fraud/graph/<account>
+# ==========================================================
+@fraud_bp.route("/graph/<account>", methods=["GET"])
+def account_graph(account):
+    """
+    Fan-out / fan-in around an account and short cycles through it.
+    Query params: hops (default 2, max 4), direction (out|in|both),
+    max_cycle_len (default 4, max 6), limit (sample size per hop / cycles).
+    """
+    hops = min(max(request.args.get("hops", 2, type=int), 1), 4)
+    max_cycle_len = min(max(request.args.get("max_cycle_len", 4, type=int), 2), 6)
+    limit = min(max(request.args.get("limit", 25, type=int), 1), 200)
+    direction = request.args.get("direction", "both").lower()
+    if direction not in (OUT, IN, "both"):
+        return jsonify({"status": "error", "message": "direction must be out, in or both."}), 400
+
+    graph = get_transaction_graph()
+    data = {"account": account}
+    if direction in (OUT, "both"):
+        data["fan_out"] = graph.k_hop(account, hops, OUT, limit)
+    if direction in (IN, "both"):
+        data["fan_in"] = graph.k_hop(account, hops, IN, limit)
+
+    if data.get("fan_out", data.get("fan_in")) is None:
+        return jsonify({"status": "error", "message": f"No transfers recorded for {account}."}), 404
+
+    data["cycles"] = graph.find_cycles(account, max_cycle_len, limit)
+    return jsonify({"status": "success", "data": data}), 200
+
+
+# ==========================================================
+# 📊 Route: GET /api/fraud/graph
+# ==========================================================
+@fraud_bp.route("/graph", methods=["GET"])
+def graph_stats():
+    return jsonify({"status": "success", "data": get_transaction_graph().stats()}), 200
@@ -0,0 +1,102 @@
+# routes/ingestion_routes.py
+import os
+import threading
+import uuid
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.utils import secure_filename
+from config import Config
+from models import db, IngestionJob
+from utils.model_registry import model_registry
+from utils.ingestion import run_ingestion
+
+ingestion_bp = Blueprint("ingestion_bp", __name__, url_prefix="/api/ingest")
+
+# Job ids with a worker thread alive in this process
+_active_jobs = set()
+_active_lock = threading.Lock()
+
+
+def _start_worker(job_id):
+    """Run the ingestion pipeline for a job on a background thread."""
+    app = current_app._get_current_object()
+
+    with _active_lock:
+        if job_id in _active_jobs:
+            return False
+        _active_jobs.add(job_id)
+
+    def work():
+        try:
+            run_ingestion(app, job_id, model_registry)
+        finally:
+            with _active_lock:
+                _active_jobs.discard(job_id)
+
+    threading.Thread(target=work, name=f"ingest-{job_id}", daemon=True).start()
+    return True
+
+
+# ==========================================================
+# 📥 Route: POST /api/ingest
+# ==========================================================
+@ingestion_bp.route("", methods=["POST"])
+def start_ingestion():
+    """
+    Spool a CSV/XLSX upload to disk and stream it into BatchTransactionLog
+    in the background. Poll GET /api/ingest/<id> for per-chunk progress.
+    """
+    if "file" not in request.files:
+        return jsonify({"error": "No file uploaded."}), 400
+
+    file = request.files["file"]
+    filename = file.filename or ""
+    if not filename.lower().endswith((".csv", ".xlsx")):
+        return jsonify({"error": "Unsupported file type. Use CSV or XLSX."}), 400
+
+    chunk_size = max(1, request.args.get("chunk_size", Config.INGEST_CHUNK_SIZE, type=int))
+
+    os.makedirs(Config.INGEST_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(Config.INGEST_UPLOAD_DIR, f"{uuid.uuid4().hex}_{secure_filename(filename)}")
+    file.save(path)  # copied in small blocks, never fully in memory
+
+    job = IngestionJob(file_name=filename, file_path=path, status="queued", chunk_size=chunk_size)
+    db.session.add(job)
+    db.session.commit()
+
+    _start_worker(job.id)
+    return jsonify({"status": "accepted", "job": job.to_dict()}), 202
+
+
+# ==========================================================
+# 📊 Route: GET /api/ingest/<job_id>
+# ==========================================================
+@ingestion_bp.route("/<int:job_id>", methods=["GET"])
+def ingestion_status(job_id):
+    job = db.session.get(IngestionJob, job_id)
+    if job is None:
+        return jsonify({"error": "Ingestion job not found."}), 404
+
+    data = job.to_dict()
+    with _active_lock:
+        data["active"] = job_id in _active_jobs
+    return jsonify({"status": "success", "job": data}), 200
+
+
+# ==========================================================
+# 🔁 Route: POST /api/ingest/<job_id>/resume
+# ==========================================================
+@ingestion_bp.route("/<int:job_id>/resume", methods=["POST"])
+def resume_ingestion(job_id):
+    """Restart a failed or interrupted job from its last committed chunk."""
+    job = db.session.get(IngestionJob, job_id)
+    if job is None:
+        return jsonify({"error": "Ingestion job not found."}), 404
+    if job.status == "completed":
+        return jsonify({"error": "Ingestion job already completed."}), 409
+    if not os.path.exists(job.file_path):
+        return jsonify({"error": "Spooled upload no longer exists; upload the file again."}), 410
+
+    if not _start_worker(job.id):
+        return jsonify({"error": "Ingestion job is already running."}), 409
+
+    return jsonify({"status": "accepted", "job": job.to_dict()}), 202
@@ -0,0 +1,51 @@
+# routes/model_routes.py
+from flask import Blueprint, jsonify, request
+from utils.model_registry import model_registry
+
+model_bp = Blueprint("model_bp", __name__, url_prefix="/api/model")
+
+
+# ==========================================================
+# 🧠 Route: GET /api/model
+# ==========================================================
+@model_bp.route("", methods=["GET"])
+def model_status():
+    """Active / previous fraud model versions and what is available on disk."""
+    try:
+        return jsonify({"status": "success", "data": model_registry.status()}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+# ==========================================================
+# 🔁 Route: POST /api/model/reload
+# ==========================================================
+@model_bp.route("/reload", methods=["POST"])
+def reload_model():
+    """
+    Load a model version in the background and swap it in once warm.
+    Body (optional): {"version": "v1.1.0"}; defaults to the top-level manifest.
+    """
+    data = request.get_json(silent=True) or {}
+    version = data.get("version")
+
+    if version and version not in model_registry.discover():
+        return jsonify({"status": "error", "message": f"Unknown model version: {version}"}), 404
+
+    model_registry.activate_async(version)
+    return jsonify({
+        "status": "accepted",
+        "message": f"Loading model {version or model_registry.default_version()} in the background.",
+    }), 202
+
+
+# ==========================================================
+# ⏪ Route: POST /api/model/rollback
+# ==========================================================
+@model_bp.route("/rollback", methods=["POST"])
+def rollback_model():
+    try:
+        active = model_registry.rollback()
+        return jsonify({"status": "success", "active": active.to_dict()}), 200
+    except LookupError as e:
+        return jsonify({"status": "error", "message": str(e)}), 409
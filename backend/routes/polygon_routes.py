@@ -1,18 +1,114 @@
 # routes/polygon_routes.py
-from flask import Blueprint, jsonify, request
-from utils.polygon_client import fetch_stock_data
+import time
+import numpy as np
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from config import Config
+from utils.polygon_client import fetch_stock_data, scheduler, bar_store
+from utils.market_providers import get_provider
+from utils.bar_encoding import iter_columnar_json, iter_ndjson, to_arrow_ipc
+from utils.resample import SESSIONS
+from utils.market_panel import PANEL_FIELDS, fetch_panel, normalize_tickers
 
 polygon_bp = Blueprint("polygon_bp", __name__)
 
 @polygon_bp.route("/api/polygon_data", methods=["GET"])
 def get_polygon_data():
+    """
+    Bars for one ticker. `format` selects the encoding:
+    records (default, list of bar objects), columnar (one list per column),
+    ndjson (streamed, one bar per line) or arrow (Arrow IPC stream; needs pyarrow).
+    Hour / day / week bars are derived from cached minute bars when possible;
+    `session` (regular|extended) picks the trading hours they aggregate.
+    """
     ticker = request.args.get("ticker", "AAPL")
     start_date = request.args.get("from", "2024-01-01")
     end_date = request.args.get("to", "2024-01-10")
     timespan = request.args.get("timespan", "day")
+    session = request.args.get("session")
+    fmt = request.args.get("format", "records").lower()
+    if fmt not in ("records", "columnar", "ndjson", "arrow"):
+        return jsonify({"error": "format must be records, columnar, ndjson or arrow"}), 400
+    if session is not None and session not in SESSIONS:
+        return jsonify({"error": "session must be regular or extended"}), 400
 
     try:
-        df = fetch_stock_data(ticker, start_date, end_date, timespan)
-        return jsonify(df.to_dict(orient="records"))
+        df = fetch_stock_data(ticker, start_date, end_date, timespan, session)
+
+        if fmt == "columnar":
+            return Response(
+                stream_with_context(iter_columnar_json(df, ticker=ticker, timespan=timespan)),
+                mimetype="application/json",
+            )
+        if fmt == "ndjson":
+            return Response(stream_with_context(iter_ndjson(df)), mimetype="application/x-ndjson")
+        if fmt == "arrow":
+            try:
+                payload = to_arrow_ipc(df)
+            except ImportError:
+                return jsonify({"error": "Arrow output requires the optional pyarrow package."}), 501
+            return Response(payload, mimetype="application/vnd.apache.arrow.stream")
+
+        return Response(df.to_json(orient="records", double_precision=15), mimetype="application/json")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@polygon_bp.route("/api/polygon_data/panel", methods=["GET", "POST"])
+def get_polygon_panel():
+    """
+    Bars for a watchlist in one call, fetched concurrently and aligned on
+    a shared timestamp axis: panel[field][i][j] is tickers[i] at timestamps[j]
+    (null where that ticker has no bar). Failed tickers are listed in
+    `errors` without failing the request.
+    Params: tickers (comma-separated, or a JSON list when POSTed), from,
+    to, timespan, fields (default open,high,low,close,volume).
+    """
+    params = (request.get_json(silent=True) or {}) if request.method == "POST" else {}
+    args = {**request.args.to_dict(), **params}
+
+    tickers = normalize_tickers(args.get("tickers"))
+    if not tickers:
+        return jsonify({"error": "Provide at least one ticker in `tickers`."}), 400
+    if len(tickers) > Config.MARKET_DATA_MAX_TICKERS:
+        return jsonify({"error": f"At most {Config.MARKET_DATA_MAX_TICKERS} tickers per request."}), 400
+
+    fields = args.get("fields", "open,high,low,close,volume")
+    fields = [f.strip() for f in (fields.split(",") if isinstance(fields, str) else fields)]
+    unknown = [f for f in fields if f not in PANEL_FIELDS]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    try:
+        started = time.perf_counter()
+        result = fetch_panel(
+            tickers,
+            args.get("from", "2024-01-01"),
+            args.get("to", "2024-01-10"),
+            args.get("timespan", "day"),
+            fields,
+        )
+        return jsonify({
+            "status": "success",
+            "tickers": result["tickers"],
+            "timestamps": result["timestamps"].tolist(),
+            "panel": {
+                field: np.where(np.isnan(values), None, values).tolist()
+                for field, values in result["panel"].items()
+            },
+            "errors": result["errors"],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            "slowest_fetch_ms": round(max(result["timings_ms"].values(), default=0.0), 2),
+        })
     except Exception as e:
+        print(f"❌ Error in /api/polygon_data/panel: {e}")
         return jsonify({"error": str(e)}), 500
+
+@polygon_bp.route("/api/polygon_data/stats", methods=["GET"])
+def get_polygon_stats():
+    """Upstream scheduler (rate limit, lanes, single-flight), provider and bar cache counters."""
+    provider = get_provider()
+    return jsonify({
+        "status": "success",
+        "provider": {"name": provider.name, **(provider.stats() if hasattr(provider, "stats") else {})},
+        "scheduler": scheduler.stats(),
+        "cache": bar_store.stats(),
+    })
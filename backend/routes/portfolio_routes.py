@@ -1,8 +1,8 @@
 from flask import Blueprint, request, jsonify
 import pandas as pd
-import yfinance as yf
 import os
 from openai import OpenAI
+from utils.quotes import fetch_quotes, quote_cache
 
 # ==========================================================
 # 🔹 Blueprint Setup
@@ -56,6 +56,15 @@ def get_portfolio():
     }), 200
 
 
+# ==========================================================
+# 🩺 Route: GET /api/portfolio/quotes/stats
+# ==========================================================
+@portfolio_bp.route("/quotes/stats", methods=["GET"])
+def quote_cache_stats():
+    """Hit / stale / miss counters, upstream calls and size of the shared quote cache."""
+    return jsonify({"status": "success", "cache": quote_cache.stats()}), 200
+
+
 # ==========================================================
 # 📈 Route: POST /api/portfolio/analyze
 # ==========================================================
@@ -89,22 +98,25 @@ def analyze_portfolio():
 
         results, ai_prompts = [], []
 
+        # ======================================================
+        # 💹 Fetch Prices (each unique symbol once: shared cache, then concurrently)
+        # ======================================================
+        symbols = df["Symbol"].astype(str).str.strip().str.upper().tolist()
+        prices, errors = fetch_quotes(symbols)
+
         # ======================================================
         # 🔄 Process Each Stock
         # ======================================================
-        for _, row in df.iterrows():
-            symbol = str(row["Symbol"]).strip().upper()
-            buy_price = float(row["BuyPrice"])
-            quantity = int(row.get("Quantity", 1))
+        buy_prices = df["BuyPrice"].tolist()
+        quantities = df["Quantity"].tolist() if "Quantity" in df else [1] * len(df)
+        for symbol, buy_price, quantity in zip(symbols, buy_prices, quantities):
+            buy_price = float(buy_price)
+            quantity = int(quantity)
 
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="1d")
-
-                if hist.empty:
-                    raise ValueError("No live market data found for this symbol.")
-
-                current_price = round(hist["Close"].iloc[-1], 2)
+                if symbol not in prices:
+                    raise LookupError(errors.get(symbol, "No price returned."))
+                current_price = round(prices[symbol], 2)
                 change_pct = round(((current_price - buy_price) / buy_price) * 100, 2)
 
                 # Basic fallback recommendation
@@ -181,6 +193,7 @@ def analyze_portfolio():
             "status": "success",
             "summary": {
                 "total_symbols": len(results),
+                "unique_symbols": len(prices) + len(errors),
                 "total_value": round(total_value, 2),
                 "ai_summary": ai_summary
             },
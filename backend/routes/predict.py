@@ -1,77 +1,240 @@
-from flask import Blueprint, request, jsonify
-from models import db, Transaction
-import joblib
+from flask import Blueprint, current_app, request, jsonify
+from models import db, Transaction, BatchTransactionLog
+from config import Config
+from utils.fraud_scoring import (
+    encode_rows, score_features, score_frame, to_log_records, bulk_insert_logs
+)
+from utils.micro_batcher import MicroBatcher
+from utils.model_registry import model_registry
+from utils.write_behind import WriteBehindBuffer, BufferFullError
+from utils.feature_store import get_feature_store
+from utils.transaction_graph import get_transaction_graph
+from utils.fraud_rollups import record_rollups
 import pandas as pd
-import numpy as np
-import os
-
-# ✅ Load the trained model once
-model_path = os.path.join(os.getcwd(), "models", "model.pkl")
-model = joblib.load(model_path)
-
-# ✅ Map transaction types to numeric codes
-type_map = {
-    "TRANSFER": 0,
-    "CASH_OUT": 1,
-    "PAYMENT": 2,
-    "DEBIT": 3,
-    "CASH_IN": 4
-}
+import time
+
+# ✅ Models are loaded lazily by the registry on first use. Online scoring uses
+# the array-backed `online_model`; bulk paths keep the multi-threaded booster.
 
 predict_bp = Blueprint('predict', __name__)
 
+def _score_rows(rows):
+    """Score a list of typed transaction dicts with one predict_proba call."""
+    loaded = model_registry.get()
+    features = encode_rows(rows)
+    is_fraud, confidence, risk_score = score_features(loaded.online_model, features)
+    return [
+        (bool(f), float(c), float(r), loaded.version)
+        for f, c, r in zip(is_fraud, confidence, risk_score)
+    ]
+
+
+# ✅ Coalesce concurrent /api/predict calls into one model invocation
+batcher = MicroBatcher(
+    _score_rows,
+    max_wait_ms=Config.PREDICT_BATCH_WINDOW_MS,
+    max_batch_size=Config.PREDICT_MAX_BATCH_SIZE,
+    name="predict-batcher",
+)
+
+# ✅ Persist scored transactions in bulk, off the request path
+transaction_buffer = WriteBehindBuffer(
+    Transaction,
+    max_batch=Config.TXN_BUFFER_MAX_BATCH,
+    flush_interval_ms=Config.TXN_BUFFER_FLUSH_MS,
+    capacity=Config.TXN_BUFFER_CAPACITY,
+    put_timeout_s=Config.TXN_BUFFER_PUT_TIMEOUT_S,
+    on_flush=lambda session, batch: record_rollups(session, "single", batch),
+    name="transaction-writer",
+)
+
 @predict_bp.route("/api/predict", methods=["POST"])
 def single_prediction():
     data = request.get_json()
 
     txn_type_str = data.get("type", "TRANSFER").upper()
-    txn_type_code = type_map.get(txn_type_str, 0)
 
     try:
-        # ✅ Use pandas DataFrame to ensure compatibility
-        input_df = pd.DataFrame([{
+        row = {
             "step": float(data.get("step", 0)),
-            "type": txn_type_code,
+            "type": txn_type_str,
             "amount": float(data.get("amount", 0)),
             "oldbalanceOrg": float(data.get("oldbalanceOrg", 0)),
             "newbalanceOrig": float(data.get("newbalanceOrig", 0)),
             "oldbalanceDest": float(data.get("oldbalanceDest", 0)),
             "newbalanceDest": float(data.get("newbalanceDest", 0)),
-        }])
+        }
+
+        # Velocity features from the in-memory store (history before this txn)
+        feature_store = get_feature_store()
+        name_orig, name_dest = data.get("nameOrig", ""), data.get("nameDest", "")
+        account_features = {
+            "orig": feature_store.features(name_orig, row["step"]) if name_orig else None,
+            "dest": feature_store.features(name_dest, row["step"]) if name_dest else None,
+        }
 
-        prediction = model.predict(input_df)[0]
-        confidence = float(model.predict_proba(input_df)[0].max())
-        risk_score = round(confidence * 100, 2)
+        if Config.PREDICT_MICROBATCH_ENABLED:
+            is_fraud, confidence, risk_score, version = batcher.submit(row).result(
+                timeout=Config.PREDICT_TIMEOUT_S
+            )
+        else:
+            is_fraud, confidence, risk_score, version = _score_rows([row])[0]
 
         result = {
-            "is_fraud": bool(prediction),
+            "is_fraud": is_fraud,
+            "confidence": confidence,
+            "risk_score": risk_score,
+            "model_version": version,
+            "account_features": account_features
+        }
+
+        txn = {
+            "step": int(data.get("step", 0)),
+            "type": txn_type_str,
+            "amount": float(data.get("amount", 0)),
+            "nameOrig": data.get("nameOrig", ""),
+            "oldbalanceOrg": float(data.get("oldbalanceOrg", 0)),
+            "newbalanceOrig": float(data.get("newbalanceOrig", 0)),
+            "nameDest": data.get("nameDest", ""),
+            "oldbalanceDest": float(data.get("oldbalanceDest", 0)),
+            "newbalanceDest": float(data.get("newbalanceDest", 0)),
+            "prediction": "Fraud" if result["is_fraud"] else "Legit",
             "confidence": confidence,
             "risk_score": risk_score
         }
 
-        txn = Transaction(
-            step=int(data.get("step", 0)),
-            type=txn_type_str,
-            amount=float(data.get("amount", 0)),
-            nameOrig=data.get("nameOrig", ""),
-            oldbalanceOrg=float(data.get("oldbalanceOrg", 0)),
-            newbalanceOrig=float(data.get("newbalanceOrig", 0)),
-            nameDest=data.get("nameDest", ""),
-            oldbalanceDest=float(data.get("oldbalanceDest", 0)),
-            newbalanceDest=float(data.get("newbalanceDest", 0)),
-            prediction="Fraud" if result["is_fraud"] else "Legit",
-            confidence=confidence,
-            risk_score=risk_score
-        )
-
-        db.session.add(txn)
-        db.session.commit()
+        feature_store.update(name_orig, name_dest, txn["step"], txn["amount"], txn_type_str)
+        get_transaction_graph().add_edge(name_orig, name_dest, txn["amount"], txn["step"])
+
+        if Config.TXN_BUFFER_ENABLED:
+            transaction_buffer.start(current_app._get_current_object())
+            transaction_buffer.put(txn)
+        else:
+            db.session.add(Transaction(**txn))
+            record_rollups(db.session, "single", [txn])
+            db.session.commit()
 
         return jsonify(result)
 
+    except BufferFullError as e:
+        return jsonify({"error": "Server busy", "details": str(e)}), 503, {"Retry-After": "1"}
+
     except Exception as e:
         print(f"❌ Prediction Error: {e}")
         return jsonify({"error": "Prediction failed", "details": str(e)}), 500
 
 
+@predict_bp.route("/api/predict/stats", methods=["GET"])
+def prediction_stats():
+    """Micro-batching and write-behind counters for /api/predict."""
+    return jsonify({
+        "status": "success",
+        "microbatch_enabled": Config.PREDICT_MICROBATCH_ENABLED,
+        "microbatch": batcher.stats(),
+        "write_behind_enabled": Config.TXN_BUFFER_ENABLED,
+        "write_behind": transaction_buffer.stats(),
+    })
+
+
+def _iter_batch_input(chunk_size):
+    """
+    Yield (file_name, DataFrame chunk) pairs from the request body.
+    Accepts a JSON array (or {"transactions": [...]}) or a CSV/XLSX upload.
+    """
+    if "file" in request.files:
+        file = request.files["file"]
+        filename = file.filename.lower()
+        if filename.endswith(".csv"):
+            for chunk in pd.read_csv(file, chunksize=chunk_size):
+                yield file.filename, chunk
+        elif filename.endswith(".xlsx"):
+            df = pd.read_excel(file)
+            for start in range(0, len(df), chunk_size):
+                yield file.filename, df.iloc[start:start + chunk_size]
+        else:
+            raise ValueError("Unsupported file type. Use CSV or XLSX.")
+        return
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("transactions")
+    if not isinstance(data, list):
+        raise ValueError("Body must be a JSON array of transactions or a CSV/XLSX file upload.")
+
+    for start in range(0, len(data), chunk_size):
+        yield "api:batch", pd.DataFrame.from_records(data[start:start + chunk_size])
+
+
+@predict_bp.route("/api/predict/batch", methods=["POST"])
+def batch_prediction():
+    """
+    Score many transactions at once: one predict_proba call and one bulk
+    insert into BatchTransactionLog per chunk. Per-row results are returned
+    for JSON input; file uploads return the summary only.
+    """
+    chunk_size = request.args.get("chunk_size", Config.PREDICT_BATCH_CHUNK_SIZE, type=int)
+    chunk_size = max(1, chunk_size)
+    include_results = "file" not in request.files
+
+    started = time.perf_counter()
+    total_rows, fraud_rows, chunks = 0, 0, 0
+    results = []
+
+    try:
+        # Pin one version for the whole request, even if a reload swaps mid-way
+        loaded = model_registry.get()
+        # Bootstrap the graph before the first chunk is committed, or it would load that chunk twice
+        graph = get_transaction_graph()
+
+        for file_name, chunk in _iter_batch_input(chunk_size):
+            if chunk.empty:
+                continue
+
+            scored = score_frame(loaded.model, chunk)
+            records = to_log_records(scored, file_name)
+            bulk_insert_logs(db.session, BatchTransactionLog, records)
+            record_rollups(db.session, "batch", records)
+            db.session.commit()
+            get_feature_store().update_frame(scored)
+            graph.add_frame(scored)
+
+            chunks += 1
+            total_rows += len(scored)
+            fraud_rows += int(scored["is_fraud"].sum())
+
+            if include_results:
+                results.extend(
+                    scored[["is_fraud", "confidence", "risk_score"]].to_dict(orient="records")
+                )
+
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Batch Prediction Error: {e}")
+        return jsonify({
+            "error": "Batch prediction failed",
+            "details": str(e),
+            "rows_committed": total_rows,
+        }), 500
+
+    elapsed = time.perf_counter() - started
+    response = {
+        "status": "success",
+        "model_version": loaded.version,
+        "rows": total_rows,
+        "fraud": fraud_rows,
+        "legit": total_rows - fraud_rows,
+        "chunks": chunks,
+        "chunk_size": chunk_size,
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "rows_per_second": round(total_rows / elapsed, 1) if elapsed > 0 else None,
+    }
+    if include_results:
+        response["results"] = results
+
+    return jsonify(response)
+
+
 print("✅ predict.py loaded")
@@ -1,19 +1,42 @@
 from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, request
+from config import Config
 from utils.polygon_client import fetch_stock_data
-from utils.trade_analysis import analyze_stock  # ✅ fixed import name
+from utils.market_panel import fetch_panel, normalize_tickers
+from utils.indicator_engine import DEFAULT_INDICATORS, resolve_indicators
+from utils.trade_analysis import OHLCV_FIELDS, analyze_stock, analyze_panel  # ✅ fixed import name
+from utils.analysis_cache import analysis_cache, analysis_key
+from utils.quotes import fetch_quotes, quote_cache
 
 recommendation_bp = Blueprint("recommendation_bp", __name__)
 
+
+def _indicator_params(args):
+    """(extended indicator groups, confirm) from request args; raises ValueError on bad values."""
+    confirm = (args.get("confirm") or "").strip().lower() or None
+    if confirm not in (None, "macd"):
+        raise ValueError("confirm must be macd")
+    extended = tuple(n for n in resolve_indicators(args.get("indicators"), confirm) if n not in DEFAULT_INDICATORS)
+    return extended, confirm
+
+
+def _wants_live(args):
+    return str(args.get("live", "")).lower() in ("1", "true", "yes")
+
+
 @recommendation_bp.route("/api/recommendation", methods=["GET"])
 def recommend_stock():
     """
     Fetches stock data for the requested ticker and performs analysis
     using the `analyze_stock()` function.
+    Optional: indicators (extended groups, e.g. "macd,bollinger,atr" or
+    "all"), confirm=macd (BUY / SELL only when MACD agrees) and live=true
+    (adds the latest price from the shared quote cache).
     """
     try:
         # === Parameters ===
         ticker = request.args.get("ticker", "AAPL").upper()
+        indicators, confirm = _indicator_params(request.args)
         start_date = request.args.get("from", "2024-01-01")
         end_date = request.args.get("to", datetime.today().strftime("%Y-%m-%d"))
 
@@ -29,21 +52,94 @@ def recommend_stock():
                 "message": f"No data returned for ticker {ticker}. Check your API key or symbol."
             }), 404
 
-        # === Analyze Trend (✅ FIXED FUNCTION CALL) ===
-        result = analyze_stock(df)
+        # === Analyze Trend (memoized until a newer / revised bar arrives) ===
+        result, hit = analysis_cache.get_or_compute(
+            analysis_key(ticker, "day", df, (indicators, confirm) if indicators else ()),
+            lambda: analyze_stock(ticker, df, indicators, confirm),
+            tag=ticker,
+            version=int(df["timestamp"].max()),
+        )
 
         # === Return Response ===
-        return jsonify({
+        payload = {
             "status": "success",
             "ticker": ticker,
             "from": start_date,
             "to": end_date,
             "analysis": result
-        }), 200
+        }
+        if _wants_live(request.args):
+            prices, errors = fetch_quotes([ticker])
+            payload["live_price"] = prices.get(ticker)
+            if errors:
+                payload["live_price_error"] = errors[ticker]
+        response = jsonify(payload)
+        response.headers["X-Cache"] = "HIT" if hit else "MISS"
+        return response, 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error in /api/recommendation: {e}")
         return jsonify({
             "status": "error",
             "message": str(e)
         }), 500
+
+
+@recommendation_bp.route("/api/recommendation/stats", methods=["GET"])
+def recommendation_cache_stats():
+    """Hit / miss counters and size of the analysis result and quote caches."""
+    return jsonify({"status": "success", "cache": analysis_cache.stats(), "quotes": quote_cache.stats()}), 200
+
+
+@recommendation_bp.route("/api/recommendation/panel", methods=["GET", "POST"])
+def recommend_panel():
+    """
+    Analysis for a whole watchlist: bars are fetched concurrently and all
+    tickers are scored in one vectorized pass (see `analyze_panel`).
+    Params: tickers (comma-separated, or a JSON list when POSTed), from, to,
+    and indicators / confirm / live as for /api/recommendation.
+    """
+    params = (request.get_json(silent=True) or {}) if request.method == "POST" else {}
+    args = {**request.args.to_dict(), **params}
+
+    tickers = normalize_tickers(args.get("tickers"))
+    if not tickers:
+        return jsonify({"error": "Provide at least one ticker in `tickers`."}), 400
+    if len(tickers) > Config.MARKET_DATA_MAX_TICKERS:
+        return jsonify({"error": f"At most {Config.MARKET_DATA_MAX_TICKERS} tickers per request."}), 400
+
+    try:
+        start_date = args.get("from", "2024-01-01")
+        end_date = args.get("to", datetime.today().strftime("%Y-%m-%d"))
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=15)
+
+        indicators, confirm = _indicator_params(args)
+        fields = ("close",) + (OHLCV_FIELDS if indicators else ())
+        result = fetch_panel(tickers, start_dt.strftime("%Y-%m-%d"), end_date, "day", fields=fields)
+        panel = result["panel"]
+        analyses = analyze_panel(
+            result["tickers"], panel["close"], indicators, confirm,
+            **{field: panel[field] for field in OHLCV_FIELDS if field in panel},
+        )
+
+        payload = {
+            "status": "success",
+            "from": start_date,
+            "to": end_date,
+            "results": analyses,
+            "errors": result["errors"],
+        }
+        if _wants_live(args):
+            payload["live_prices"], payload["live_price_errors"] = fetch_quotes(result["tickers"])
+        return jsonify(payload), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error in /api/recommendation/panel: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
@@ -0,0 +1,75 @@
+# routes/screener_routes.py
+import threading
+import time
+from flask import Blueprint, jsonify, request
+from utils.screener import NUMERIC_FIELDS, TEXT_FIELDS, get_screener, parse_filter
+
+screener_bp = Blueprint("screener_bp", __name__, url_prefix="/api/screener")
+
+
+# ==========================================================
+# 🔍 Route: GET /api/screener
+# ==========================================================
+@screener_bp.route("", methods=["GET"])
+def screen_universe():
+    """
+    Tickers of the screener universe matching `filter`, from the latest
+    precomputed indicator snapshot (as of the last completed daily bar).
+    Params: filter (e.g. "signal == BUY and rsi < 30 and volatility > 3"),
+    sort (any field), order (asc|desc, default desc), limit (default 100).
+    """
+    sort = request.args.get("sort")
+    if sort is not None and sort not in NUMERIC_FIELDS + TEXT_FIELDS:
+        return jsonify({"error": f"Unknown sort field: {sort}"}), 400
+    order = request.args.get("order", "desc").lower()
+    if order not in ("asc", "desc"):
+        return jsonify({"error": "order must be asc or desc"}), 400
+
+    try:
+        clauses = parse_filter(request.args.get("filter", ""))
+        limit = max(0, int(request.args.get("limit", 100)))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    started = time.perf_counter()
+    snapshot = get_screener().snapshot
+    total, rows = snapshot.query(clauses, sort=sort, descending=order == "desc", limit=limit)
+
+    return jsonify({
+        "status": "success",
+        "as_of": snapshot.as_of,
+        "universe_size": len(snapshot),
+        "matches": total,
+        "results": rows,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3),
+    }), 200
+
+
+# ==========================================================
+# 🩺 Route: GET /api/screener/status
+# ==========================================================
+@screener_bp.route("/status", methods=["GET"])
+def screener_status():
+    """Snapshot age and size, last refresh outcome, and whether a refresh is running."""
+    screener = get_screener()
+    return jsonify({
+        "status": "success",
+        "universe": len(screener.universe),
+        "snapshot_size": len(screener.snapshot),
+        "as_of": screener.snapshot.as_of,
+        "refreshing": screener.refreshing(),
+        "last_refresh": screener.last_refresh,
+    }), 200
+
+
+# ==========================================================
+# 🔄 Route: POST /api/screener/refresh
+# ==========================================================
+@screener_bp.route("/refresh", methods=["POST"])
+def refresh_screener():
+    """Start an incremental refresh in the background (no-op if one is running)."""
+    screener = get_screener()
+    if screener.refreshing():
+        return jsonify({"status": "success", "message": "Refresh already running."}), 202
+    threading.Thread(target=screener.refresh, name="screener-refresh-now", daemon=True).start()
+    return jsonify({"status": "success", "message": "Refresh started."}), 202
@@ -0,0 +1,101 @@
+# routes/transactions.py
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request
+from models import db, Transaction, BatchTransactionLog
+
+transactions_bp = Blueprint("transactions_bp", __name__, url_prefix="/api/transactions")
+
+SOURCES = {"single": Transaction, "batch": BatchTransactionLog}
+EXACT_FILTERS = ("prediction", "type", "nameOrig", "nameDest")  # indexed columns
+MAX_LIMIT = 500
+
+
+def _serialize(row, columns):
+    data = {}
+    for column in columns:
+        value = getattr(row, column.name)
+        data[column.name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def _parse_time(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO-8601 timestamp.")
+
+
+# ==========================================================
+# 📜 Route: GET /api/transactions
+# ==========================================================
+@transactions_bp.route("", methods=["GET"])
+def list_transactions():
+    """
+    Browse scored transactions newest first (order=asc for oldest first).
+
+    Filters: source (single|batch), prediction, type, nameOrig, nameDest,
+    min_amount, max_amount, and for batch rows file_name, since, until.
+    Pages use keyset pagination on the primary key: pass the returned
+    `next_cursor` as `cursor` to get the next page. Each page is one index
+    range scan, so deep pages cost the same as the first.
+    """
+    source = request.args.get("source", "single")
+    model_cls = SOURCES.get(source)
+    if model_cls is None:
+        return jsonify({"status": "error", "message": "source must be single or batch."}), 400
+
+    limit = min(max(request.args.get("limit", 50, type=int), 1), MAX_LIMIT)
+    cursor = request.args.get("cursor", type=int)
+    descending = request.args.get("order", "desc").lower() != "asc"
+
+    try:
+        query = db.select(model_cls)
+        for name in EXACT_FILTERS:
+            value = request.args.get(name)
+            if value is not None:
+                query = query.where(getattr(model_cls, name) == value)
+
+        min_amount = request.args.get("min_amount", type=float)
+        max_amount = request.args.get("max_amount", type=float)
+        if min_amount is not None:
+            query = query.where(model_cls.amount >= min_amount)
+        if max_amount is not None:
+            query = query.where(model_cls.amount <= max_amount)
+
+        if model_cls is BatchTransactionLog:
+            file_name = request.args.get("file_name")
+            since, until = _parse_time("since"), _parse_time("until")
+            if file_name is not None:
+                query = query.where(model_cls.file_name == file_name)
+            if since is not None:
+                query = query.where(model_cls.timestamp >= since)
+            if until is not None:
+                query = query.where(model_cls.timestamp < until)
+
+        if cursor is not None:
+            query = query.where(model_cls.id < cursor if descending else model_cls.id > cursor)
+        query = query.order_by(model_cls.id.desc() if descending else model_cls.id.asc())
+
+        # One extra row tells us whether another page exists
+        rows = db.session.execute(query.limit(limit + 1)).scalars().all()
+
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Transaction history error: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    columns = model_cls.__table__.columns
+    return jsonify({
+        "status": "success",
+        "source": source,
+        "count": len(rows),
+        "data": [_serialize(row, columns) for row in rows],
+        "next_cursor": rows[-1].id if has_more else None,
+    }), 200
@@ -0,0 +1,65 @@
+class AccountInterner:
+    """
+    Map account names (nameOrig / nameDest) to dense integer ids so per-account
+    state can live in NumPy arrays instead of one Python object per account.
+    Released ids are reused before new ones are handed out.
+    """
+
+    def __init__(self, names=None):
+        self._ids = {}
+        self._names = []
+        self._free = []
+        for name in names or []:
+            self.intern(name)
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def size(self):
+        """Highest id handed out + 1 (array length needed to index every id)."""
+        return len(self._names)
+
+    def intern(self, name):
+        idx = self._ids.get(name)
+        if idx is not None:
+            return idx
+        if self._free:
+            idx = self._free.pop()
+            self._names[idx] = name
+        else:
+            idx = len(self._names)
+            self._names.append(name)
+        self._ids[name] = idx
+        return idx
+
+    def lookup(self, name):
+        """Id of a known account, or None (never allocates)."""
+        return self._ids.get(name)
+
+    def name(self, idx):
+        return self._names[idx]
+
+    def release(self, idx):
+        name = self._names[idx]
+        if name is not None and self._ids.get(name) == idx:
+            del self._ids[name]
+            self._names[idx] = None
+            self._free.append(idx)
+
+    def names(self):
+        """Names by id (None for released ids), for snapshots."""
+        return list(self._names)
+
+    @classmethod
+    def from_names(cls, names):
+        """Rebuild with the exact same ids, including released (None) slots."""
+        interner = cls()
+        interner._names = list(names)
+        for idx, name in enumerate(interner._names):
+            if name is None:
+                interner._free.append(idx)
+            else:
+                interner._ids[name] = idx
+        interner._free.reverse()
+        return interner
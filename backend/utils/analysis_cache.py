@@ -0,0 +1,142 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+from utils.indicator_engine import MA_LONG, MA_SHORT, RSI_PERIOD, VOLATILITY_WINDOW
+from utils.polygon_client import bar_store
+
+INDICATOR_PARAMS = (MA_SHORT, MA_LONG, RSI_PERIOD, VOLATILITY_WINDOW)
+# analyze_stock only looks at the last RSI_PERIOD deltas, i.e. this many closes
+RESULT_LOOKBACK = max(INDICATOR_PARAMS) + 1
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a TTL and a memory cap (JSON-encoded size of
+    the values). Entries can carry a tag and version (ticker, last bar
+    timestamp) so they can be dropped once newer data arrives.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 2**20, ttl_s=300.0, name="results"):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl_s
+        self.name = name
+        self._entries = OrderedDict()  # key -> (value, size, expires_at, tag, version)
+        self._tags = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "invalidated": 0}
+
+    def get(self, key):
+        """(True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                self._counts["expired"] += 1
+                entry = None
+            if entry is None:
+                self._counts["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._counts["hits"] += 1
+            return True, entry[0]
+
+    def put(self, key, value, tag=None, version=None):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl, tag, version)
+            self._bytes += size
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._counts["evicted"] += 1
+
+    def get_or_compute(self, key, compute, tag=None, version=None):
+        """Cached value for `key`, else compute() (outside the lock) and store it. Returns (value, hit)."""
+        hit, value = self.get(key)
+        if hit:
+            return value, True
+        value = compute()
+        self.put(key, value, tag, version)
+        return value, False
+
+    def invalidate(self, tag, older_than=None):
+        """Drop entries with `tag` (only those whose version < older_than, if given)."""
+        with self._lock:
+            keys = [
+                k for k in self._tags.get(tag, ())
+                if older_than is None or self._entries[k][4] is None or self._entries[k][4] < older_than
+            ]
+            for key in keys:
+                self._drop(key)
+            self._counts["invalidated"] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        _, size, _, tag, _ = self._entries.pop(key)
+        self._bytes -= size
+        if tag is not None:
+            keys = self._tags.get(tag)
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["misses"]
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl,
+                **self._counts,
+                "hit_ratio": round(self._counts["hits"] / lookups, 4) if lookups else None,
+            }
+
+
+def analysis_key(ticker, timespan, bars, params=()):
+    """
+    (ticker, timespan, last bar timestamp, indicator params, digest of the
+    closes analyze_stock reads). The digest also catches a revised bar
+    with an unchanged timestamp (today's bar is re-fetched until it closes).
+    `params` are extra analyze_stock arguments (extended indicators,
+    confirmation); EMAs and OBV depend on the whole history, so with any of
+    them the digest covers every bar and OHLCV column.
+    """
+    if not bars["timestamp"].is_monotonic_increasing:
+        bars = bars.sort_values("timestamp")
+    if params:
+        columns = [c for c in ("close", "high", "low", "volume", "vwap") if c in bars]
+        tail = bars[columns].to_numpy("float64")
+    else:
+        tail = bars["close"].to_numpy("float64")[-RESULT_LOOKBACK:]
+    digest = hashlib.blake2b(tail.tobytes(), digest_size=12).hexdigest()
+    return (ticker.upper(), timespan, int(bars["timestamp"].iloc[-1]), INDICATOR_PARAMS, tuple(params), len(tail), digest)
+
+
+# ✅ Shared cache for analyze_stock results; a newer bar for a ticker drops its older entries
+analysis_cache = ResultCache(
+    max_entries=Config.ANALYSIS_CACHE_MAX_ENTRIES,
+    max_bytes=Config.ANALYSIS_CACHE_MAX_BYTES,
+    ttl_s=Config.ANALYSIS_CACHE_TTL_S,
+    name="analysis",
+)
+bar_store.add_listener(lambda ticker, timespan, latest: analysis_cache.invalidate(ticker, older_than=latest))
@@ -0,0 +1,232 @@
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from multiprocessing.connection import Client
+
+import numpy as np
+
+from utils.indicator_engine import MA_LONG, MA_SHORT, RSI_PERIOD, compact_panel, rolling_mean, rolling_rsi
+
+# Bars per year, for annualized Sharpe (hour assumes ~7 bars per trading day)
+PERIODS_PER_YEAR = {"minute": 252 * 390, "hour": 252 * 7, "day": 252, "week": 52}
+METRICS = ("total_return", "buy_hold_return", "sharpe", "max_drawdown", "hit_rate", "trades", "turnover", "exposure")
+DEFAULT_GRID = {"short": [3, 5, 8, 10], "long": [10, 15, 20, 30, 50], "rsi_period": [None, 14]}
+
+
+# ---------------------------------------
+# 🔁 Vectorized replay of the analyze_stock rule
+# ---------------------------------------
+
+class BacktestPanel:
+    """
+    Closes of many tickers, shape (n_tickers, T) with NaN for missing bars
+    (the layout of market_panel.align_bars). Moving averages and RSI are
+    cached per window, so a parameter sweep computes each window once.
+    """
+
+    def __init__(self, close):
+        self.close, self.bars = compact_panel(close)
+        self.valid = ~np.isnan(self.close)
+        prev = np.roll(self.close, 1, axis=1)
+        prev[:, 0] = np.nan
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.returns = np.nan_to_num(self.close / prev - 1)  # 0 where either bar is missing
+        self.has_prev = self.valid & ~np.isnan(prev)
+        self._ma = {}
+        self._rsi = {}
+
+    def ma(self, window):
+        if window not in self._ma:
+            self._ma[window] = rolling_mean(self.close, window)
+        return self._ma[window]
+
+    def rsi(self, period):
+        if period not in self._rsi:
+            self._rsi[period] = rolling_rsi(self.close, period)
+        return self._rsi[period]
+
+    def positions(self, short=MA_SHORT, long=MA_LONG, rsi_period=RSI_PERIOD, rsi_overbought=70.0):
+        """
+        1 while long, 0 while flat, per bar. BUY / SELL are the
+        analyze_stock crossovers of MA_short and MA_long; with an RSI period,
+        BUY also needs RSI below `rsi_overbought`.
+        """
+        ma_s, ma_l = self.ma(short), self.ma(long)
+        prev_s, prev_l = np.roll(ma_s, 1, axis=1), np.roll(ma_l, 1, axis=1)
+        buy = self.has_prev & (ma_s > ma_l) & (prev_s <= prev_l)
+        sell = self.has_prev & (ma_s < ma_l) & (prev_s >= prev_l)
+        if rsi_period:
+            buy &= self.rsi(rsi_period) < rsi_overbought
+
+        # Position = last event so far (forward fill of BUY=1 / SELL=0)
+        event = np.where(buy, 1, np.where(sell, -1, 0))
+        last = np.maximum.accumulate(np.where(event != 0, np.arange(event.shape[1]), 0), axis=1)
+        return (np.take_along_axis(event, last, axis=1) == 1).astype(np.float64)
+
+    def run(self, short=MA_SHORT, long=MA_LONG, rsi_period=RSI_PERIOD, rsi_overbought=70.0,
+            cost_bps=0.0, periods_per_year=252):
+        """
+        Trade each signal at its bar's close and hold until the next bar.
+        Returns {metric: array of n_tickers} (see METRICS).
+        """
+        n, T = self.close.shape
+        position = self.positions(short, long, rsi_period, rsi_overbought)
+        held = np.zeros_like(position)
+        held[:, 1:] = position[:, :-1]
+        trades = np.abs(np.diff(held, axis=1, prepend=0.0))
+        strategy = held * self.returns - trades * cost_bps / 10_000
+
+        equity = np.cumprod(1 + strategy, axis=1)
+        drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+
+        # Per-trade returns: bars held in the same trade share an id
+        entries = (held == 1) & (np.diff(held, axis=1, prepend=0.0) > 0)
+        trade_id = np.cumsum(entries, axis=1) + (T + 1) * np.arange(n)[:, None]
+        in_trade = held == 1
+        per_trade = np.bincount(trade_id[in_trade], weights=np.log1p(strategy[in_trade]), minlength=n * (T + 1))
+        per_trade = per_trade.reshape(n, T + 1)[:, 1:]  # id 0 = before the first entry
+        n_trades = entries.sum(axis=1)
+        wins = ((per_trade > 0) & (np.arange(T)[None, :] < n_trades[:, None])).sum(axis=1)
+
+        bars = np.maximum(self.bars, 1)
+        active = self.valid.copy()
+        mean = (strategy * active).sum(axis=1) / bars
+        std = np.sqrt((((strategy - mean[:, None]) * active) ** 2).sum(axis=1) / np.maximum(bars - 1, 1))
+        first = np.take_along_axis(self.close, (T - bars)[:, None].clip(0, T - 1), axis=1)[:, 0]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                "total_return": equity[:, -1] - 1 if T else np.zeros(n),
+                "buy_hold_return": self.close[:, -1] / first - 1 if T else np.zeros(n),
+                "sharpe": np.where(std > 0, mean / std * np.sqrt(periods_per_year), np.nan),
+                "max_drawdown": drawdown.min(axis=1) if T else np.zeros(n),
+                "hit_rate": np.where(n_trades > 0, wins / np.maximum(n_trades, 1), np.nan),
+                "trades": n_trades.astype(np.float64),
+                "turnover": trades.sum(axis=1),
+                "exposure": held.sum(axis=1) / bars,
+            }
+
+
+def summarize(metrics, tickers=None):
+    """Mean of each metric across tickers (ignoring NaN), plus per-ticker values when `tickers` is given."""
+    summary = {name: _clean(np.nanmean(values)) if np.isfinite(values).any() else None
+               for name, values in metrics.items()}
+    returns = metrics["total_return"]
+    summary["median_total_return"] = _clean(np.nanmedian(returns)) if np.isfinite(returns).any() else None
+    if tickers is None:
+        return summary
+    per_ticker = {
+        ticker: {name: _clean(values[i]) for name, values in metrics.items()}
+        for i, ticker in enumerate(tickers)
+    }
+    return summary, per_ticker
+
+
+def _clean(value):
+    value = float(value)
+    return round(value, 6) if np.isfinite(value) else None
+
+
+# ---------------------------------------
+# 🧪 Parameter sweeps
+# ---------------------------------------
+
+def expand_grid(grid):
+    """All (short, long, rsi_period) combinations with short < long."""
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    return [
+        {"short": int(s), "long": int(l), "rsi_period": int(r) if r else None}
+        for s, l, r in itertools.product(grid["short"], grid["long"], grid["rsi_period"])
+        if int(s) < int(l)
+    ]
+
+
+_worker_panel = (None, None)  # (sweep key, BacktestPanel) cached by each pool worker
+
+
+def _run_chunk(key, close, combos, options):
+    global _worker_panel
+    if _worker_panel[0] != key:
+        _worker_panel = (key, BacktestPanel(close))
+    return [summarize(_worker_panel[1].run(**combo, **options)) for combo in combos]
+
+
+_host = None  # (Popen, SweepManager, socket dir) of the sweep pool host
+_host_lock = threading.Lock()
+
+
+def _sweep_pool(workers, start_timeout_s=30.0):
+    """Proxy to the long-lived pool in utils/sweep_host.py, starting the host on first use."""
+    from utils.sweep_host import AUTHKEY_ENV, SweepManager
+
+    global _host
+    with _host_lock:
+        if _host is None or _host[0].poll() is not None:
+            if _host is not None:
+                shutil.rmtree(_host[2], ignore_errors=True)
+            socket_dir = tempfile.mkdtemp(prefix="sweep-host-")
+            address = os.path.join(socket_dir, "pool.sock")
+            authkey = os.urandom(32)
+            process = subprocess.Popen(
+                [sys.executable, "-m", "utils.sweep_host", str(workers), address],
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                stdin=subprocess.PIPE, env={**os.environ, AUTHKEY_ENV: authkey.hex()},
+            )
+            deadline = time.monotonic() + start_timeout_s
+            while True:
+                try:
+                    Client(address, authkey=authkey).close()
+                    break
+                except (FileNotFoundError, ConnectionRefusedError):
+                    if process.poll() is not None or time.monotonic() > deadline:
+                        process.kill()
+                        shutil.rmtree(socket_dir, ignore_errors=True)
+                        raise RuntimeError("Backtest sweep pool failed to start")
+                    time.sleep(0.05)
+            SweepManager.register("SweepPool")
+            manager = SweepManager(address=address, authkey=authkey)
+            manager.connect()
+            _host = (process, manager, socket_dir)
+        return _host[1].SweepPool()
+
+
+def sweep(close, combos, cost_bps=0.0, periods_per_year=252, rsi_overbought=70.0, max_workers=1,
+          min_parallel_cells=0):
+    """
+    Backtest every parameter combination on the same panel.
+
+    With max_workers > 1 the combinations are split across a long-lived
+    process pool (utils/sweep_host.py, started on the first pooled sweep);
+    each worker receives the panel once per sweep and reuses its cached
+    moving averages across its share of the grid. Sweeps smaller than
+    `min_parallel_cells` (combos x tickers x bars) run in-process, where
+    shipping the panel would cost more than it saves.
+    Returns [{**combo, **summary}] in the order of `combos`.
+    """
+    options = {"cost_bps": cost_bps, "periods_per_year": periods_per_year, "rsi_overbought": rsi_overbought}
+    workers = max(1, min(max_workers, len(combos)))
+    if len(combos) * np.size(close) < min_parallel_cells:
+        workers = 1
+
+    if workers == 1:
+        panel = BacktestPanel(close)
+        summaries = [summarize(panel.run(**combo, **options)) for combo in combos]
+    else:
+        # Contiguous runs of combos sharing windows go to the same worker, so its caches are reused
+        ordered = sorted(range(len(combos)), key=lambda i: (combos[i]["short"], combos[i]["long"]))
+        chunks = [chunk.tolist() for chunk in np.array_split(ordered, workers)]
+        results = _sweep_pool(max_workers).run(
+            uuid.uuid4().hex, np.asarray(close), [[combos[i] for i in chunk] for chunk in chunks], options
+        )
+        summaries = [None] * len(combos)
+        for chunk, chunk_summaries in zip(chunks, results):
+            for i, summary in zip(chunk, chunk_summaries):
+                summaries[i] = summary
+
+    return [{**combo, **summary} for combo, summary in zip(combos, summaries)]
@@ -0,0 +1,86 @@
+import json
+from itertools import islice
+from operator import attrgetter
+
+import numpy as np
+import pandas as pd
+
+from utils.bar_store import BAR_COLUMNS
+
+_MISSING = {np.float64: float("nan"), np.int64: 0}
+
+
+# ---------------------------------------
+# 🧱 Construction
+# ---------------------------------------
+
+def collect_aggs(aggs, page_size=5000):
+    """
+    Stream Polygon Agg objects straight into typed columns.
+
+    Bars are pulled from the paginated iterator one page at a time and each
+    field is copied into a typed NumPy array, so at most one page of Agg
+    objects is alive and no per-bar dict or row is built.
+    """
+    getters = [(name, dt, attrgetter(name)) for name, dt in BAR_COLUMNS.items()]
+    pages = {name: [] for name in BAR_COLUMNS}
+    aggs = iter(aggs)
+    while True:
+        page = list(islice(aggs, page_size))
+        if not page:
+            break
+        for name, dt, get in getters:
+            try:
+                column = np.fromiter(map(get, page), dtype=dt, count=len(page))
+            except TypeError:  # a field is None somewhere in this page
+                missing = _MISSING[dt]
+                column = np.array([missing if v is None else v for v in map(get, page)], dtype=dt)
+            pages[name].append(column)
+    columns = {}
+    for name in BAR_COLUMNS:
+        chunks = pages.pop(name)  # release each column's pages as soon as it is joined
+        columns[name] = np.concatenate(chunks) if chunks else np.empty(0, dtype=BAR_COLUMNS[name])
+        del chunks
+    return pd.DataFrame(columns, copy=False)
+
+
+# ---------------------------------------
+# 📦 Response encodings
+# ---------------------------------------
+
+def _column_json(series):
+    # pandas' C encoder is several times faster than json.dumps on floats; NaN -> null
+    return series.to_json(orient="values", double_precision=15)
+
+
+def iter_columnar_json(df, **meta):
+    """
+    Stream the JSON text of {**meta, "count": n, "columns": {name: [...]}}
+    one column at a time: one array per column instead of one object per bar.
+    """
+    head = "".join(f"{json.dumps(k)}:{json.dumps(v)}," for k, v in meta.items())
+    yield f'{{{head}"count":{len(df)},"columns":{{'
+    for i, name in enumerate(df.columns):
+        yield f'{"," if i else ""}{json.dumps(name)}:{_column_json(df[name])}'
+    yield "}}"
+
+
+def iter_ndjson(df, chunk_size=10000):
+    """Yield newline-delimited JSON objects (one per bar) in bounded chunks."""
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size].to_json(orient="records", lines=True, double_precision=15)
+        yield chunk if chunk.endswith("\n") else chunk + "\n"
+
+
+def to_arrow_ipc(df):
+    """
+    Arrow IPC stream bytes for the bars (optional dependency: pyarrow).
+    Raises ImportError when pyarrow is not installed.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+MARKET_TZ = ZoneInfo("America/New_York")
+
+# Column name -> on-disk dtype (same columns as Polygon's Agg, minus otc)
+BAR_COLUMNS = {
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "vwap": np.float64,
+    "timestamp": np.int64,  # bar start, ms since epoch (UTC)
+    "transactions": np.int64,
+}
+COVERAGE_FILE = "coverage.json"
+
+
+def _to_date(value):
+    return value if isinstance(value, date) else datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def market_today():
+    return datetime.now(MARKET_TZ).date()
+
+
+def day_bounds_ms(start, end):
+    """[start 00:00, end+1 00:00) in market time, as epoch milliseconds."""
+    lo = datetime.combine(_to_date(start), time(0), MARKET_TZ)
+    hi = datetime.combine(_to_date(end) + timedelta(days=1), time(0), MARKET_TZ)
+    return int(lo.timestamp() * 1000), int(hi.timestamp() * 1000)
+
+
+def merge_ranges(ranges):
+    """Merge overlapping / adjacent inclusive (start, end) date ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(r) for r in merged]
+
+
+def missing_ranges(covered, start, end):
+    """Inclusive date ranges inside [start, end] that `covered` does not contain."""
+    gaps, cursor = [], start
+    for c_start, c_end in merge_ranges(covered):
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start - timedelta(days=1)))
+        cursor = max(cursor, c_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class BarStore:
+    """
+    On-disk OHLCV cache, one directory per (ticker, timespan).
+
+    Every column is a separate .npy array sorted by timestamp, so reads
+    memory-map the files and only touch the pages of the requested range.
+    `coverage.json` lists the market-date ranges already fetched upstream;
+    callers ask only for the gaps. The current (unfinished) market day is
+    never marked as covered, so it is re-fetched until it is complete.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, fn):
+        """
+        Call `fn(ticker, timespan, latest_timestamp)` whenever a write adds a
+        bar newer than any already stored (e.g. to invalidate caches).
+        """
+        self._listeners.append(fn)
+
+    def _dir(self, ticker, timespan):
+        return os.path.join(self.root, ticker.upper(), timespan)
+
+    def _lock(self, ticker, timespan):
+        key = (ticker.upper(), timespan)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    # ---------------------------------------
+    # 📅 Coverage
+    # ---------------------------------------
+
+    def coverage(self, ticker, timespan):
+        path = os.path.join(self._dir(ticker, timespan), COVERAGE_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return [(_to_date(s), _to_date(e)) for s, e in json.load(f)["ranges"]]
+
+    def missing(self, ticker, timespan, start, end):
+        """Date ranges of [start, end] that still have to be fetched upstream."""
+        return missing_ranges(self.coverage(ticker, timespan), _to_date(start), _to_date(end))
+
+    # ---------------------------------------
+    # 📖 Reads
+    # ---------------------------------------
+
+    def _columns(self, folder):
+        if not os.path.exists(os.path.join(folder, "timestamp.npy")):
+            return None
+        return {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r") for name in BAR_COLUMNS}
+
+    def read(self, ticker, timespan, start, end):
+        """Cached bars whose start falls on a market date in [start, end]."""
+        with self._lock(ticker, timespan):
+            # Opened under the lock: a concurrent write swaps files, never mixes them
+            columns = self._columns(self._dir(ticker, timespan))
+        if columns is None:
+            return pd.DataFrame({name: np.empty(0, dtype=dt) for name, dt in BAR_COLUMNS.items()})
+        lo_ms, hi_ms = day_bounds_ms(start, end)
+        ts = columns["timestamp"]
+        lo, hi = np.searchsorted(ts, lo_ms, "left"), np.searchsorted(ts, hi_ms, "left")
+        return pd.DataFrame({name: np.array(col[lo:hi]) for name, col in columns.items()})
+
+    # ---------------------------------------
+    # 💾 Writes
+    # ---------------------------------------
+
+    def write(self, ticker, timespan, bars, start, end):
+        """
+        Merge freshly fetched `bars` for [start, end] into the store and mark
+        the range covered (up to yesterday in market time).
+        """
+        start, end = _to_date(start), _to_date(end)
+        folder = self._dir(ticker, timespan)
+        with self._lock(ticker, timespan):
+            os.makedirs(folder, exist_ok=True)
+            old = self._columns(folder)
+            old_latest = int(old["timestamp"][-1]) if old is not None and len(old["timestamp"]) else None
+            new = {}
+            for name, dt in BAR_COLUMNS.items():
+                if name not in bars:
+                    new[name] = np.full(len(bars), np.nan if dt is np.float64 else 0, dtype=dt)
+                else:
+                    # Missing floats (e.g. vwap) stay NaN; missing counts become 0
+                    new[name] = np.asarray(bars[name] if dt is np.float64 else bars[name].fillna(0), dtype=dt)
+
+            if old is not None:
+                # Fresh bars replace cached ones with the same timestamp
+                keep = ~np.isin(old["timestamp"], new["timestamp"])
+                merged = {name: np.concatenate((np.asarray(old[name])[keep], new[name])) for name in BAR_COLUMNS}
+            else:
+                merged = new
+            order = np.argsort(merged["timestamp"], kind="stable")
+            merged = {name: col[order] for name, col in merged.items()}
+            del old
+
+            for name, col in merged.items():
+                tmp = os.path.join(folder, f"{name}.tmp.npy")
+                np.save(tmp, col)
+                os.replace(tmp, os.path.join(folder, f"{name}.npy"))
+
+            covered_end = min(end, market_today() - timedelta(days=1))
+            if covered_end >= start:
+                ranges = merge_ranges(self.coverage(ticker, timespan) + [(start, covered_end)])
+                tmp = os.path.join(folder, f"{COVERAGE_FILE}.tmp")
+                with open(tmp, "w") as f:
+                    json.dump({"ranges": [[s.isoformat(), e.isoformat()] for s, e in ranges]}, f)
+                os.replace(tmp, os.path.join(folder, COVERAGE_FILE))
+
+        latest = int(merged["timestamp"][-1]) if len(merged["timestamp"]) else None
+        if latest is None or (old_latest is not None and latest <= old_latest):
+            return
+        for fn in self._listeners:
+            try:
+                fn(ticker.upper(), timespan, latest)
+            except Exception as e:
+                print(f"⚠️ Bar store listener failed: {e}")
+
+    def stats(self):
+        """Series and bar counts currently on disk."""
+        series, bars, nbytes = 0, 0, 0
+        if os.path.isdir(self.root):
+            for ticker in os.listdir(self.root):
+                for timespan in os.listdir(os.path.join(self.root, ticker)):
+                    folder = os.path.join(self.root, ticker, timespan)
+                    path = os.path.join(folder, "timestamp.npy")
+                    if os.path.exists(path):
+                        series += 1
+                        bars += len(np.load(path, mmap_mode="r"))
+                        nbytes += sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
+        return {"root": self.root, "series": series, "bars": bars, "bytes": nbytes}
@@ -0,0 +1,286 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.account_index import AccountInterner
+
+OUT, IN = 0, 1  # money leaving the account (nameOrig) / arriving (nameDest)
+NEVER = -1
+
+
+class AccountFeatureStore:
+    """
+    Incrementally maintained velocity features per account.
+
+    Each account owns a slot in a set of NumPy arrays. Per direction it keeps
+    a ring of `window` buckets indexed by `step % window`; a bucket remembers
+    which step it holds, so stale buckets are recycled in place (an event a
+    full window older than the step its bucket holds is dropped). Updating a
+    transaction touches two buckets (O(1)); reading the rolling count, sum and
+    max over the last `window` steps scans a fixed `window` buckets.
+
+    When `max_accounts` slots are in use, accounts idle for more than
+    `idle_steps` are evicted (or, failing that, the least recently seen
+    tenth) and their slots reused.
+    """
+
+    def __init__(self, window=24, max_accounts=1_000_000, idle_steps=24 * 7, initial_capacity=1024):
+        self.window = int(window)
+        self.max_accounts = int(max_accounts)
+        self.idle_steps = int(idle_steps)
+
+        self._lock = threading.Lock()
+        self._accounts = AccountInterner()
+        self._capacity = 0
+        self._latest_step = 0
+        self._evicted = 0
+        self._allocate(min(int(initial_capacity), self.max_accounts))
+
+    # ---------------------------------------
+    # 🧱 Storage
+    # ---------------------------------------
+
+    def _allocate(self, capacity):
+        def grow(arr, fill, shape, dtype):
+            new = np.full(shape, fill, dtype=dtype)
+            if arr is not None:
+                new[: arr.shape[0]] = arr
+            return new
+
+        shape = (capacity, 2, self.window)
+        self.bucket_step = grow(getattr(self, "bucket_step", None), NEVER, shape, np.int32)
+        self.bucket_count = grow(getattr(self, "bucket_count", None), 0, shape, np.int32)
+        self.bucket_sum = grow(getattr(self, "bucket_sum", None), 0.0, shape, np.float64)
+        self.bucket_max = grow(getattr(self, "bucket_max", None), 0.0, shape, np.float64)
+        self.last_seen = grow(getattr(self, "last_seen", None), NEVER, capacity, np.int32)
+        self.last_transfer = grow(getattr(self, "last_transfer", None), NEVER, capacity, np.int32)
+        self._live = grow(getattr(self, "_live", None), False, capacity, bool)  # slot holds an account
+        self._capacity = capacity
+
+    def _reset_slot(self, slot):
+        self.bucket_step[slot] = NEVER
+        self.bucket_count[slot] = 0
+        self.bucket_sum[slot] = 0.0
+        self.bucket_max[slot] = 0.0
+        self.last_seen[slot] = NEVER
+        self.last_transfer[slot] = NEVER
+        self._live[slot] = False
+
+    def _evict(self):
+        used = self._accounts.size
+        seen = self.last_seen[:used]
+        live = self._live[:used]
+        idle = live & (seen < self._latest_step - self.idle_steps)
+        victims = np.flatnonzero(idle)
+        if len(victims) == 0:
+            k = max(1, len(self._accounts) // 10)
+            order = np.where(live, seen, np.iinfo(np.int32).max)
+            victims = np.argpartition(order, k - 1)[:k]
+        for slot in victims:
+            self._accounts.release(int(slot))
+            self._reset_slot(slot)
+        self._evicted += len(victims)
+
+    def _slot(self, account):
+        slot = self._accounts.lookup(account)
+        if slot is not None:
+            return slot
+        if len(self._accounts) >= self.max_accounts:
+            self._evict()
+        slot = self._accounts.intern(account)
+        if slot >= self._capacity:
+            self._allocate(min(max(self._capacity * 2, slot + 1), self.max_accounts))
+        self._live[slot] = True
+        return slot
+
+    def _add(self, slot, direction, step, amount):
+        b = step % self.window
+        if self.bucket_step[slot, direction, b] > step:
+            return  # a late event a full window behind the step this bucket holds now
+        if self.bucket_step[slot, direction, b] != step:
+            self.bucket_step[slot, direction, b] = step
+            self.bucket_count[slot, direction, b] = 0
+            self.bucket_sum[slot, direction, b] = 0.0
+            self.bucket_max[slot, direction, b] = 0.0
+        self.bucket_count[slot, direction, b] += 1
+        self.bucket_sum[slot, direction, b] += amount
+        if amount > self.bucket_max[slot, direction, b]:
+            self.bucket_max[slot, direction, b] = amount
+        if step > self.last_seen[slot]:
+            self.last_seen[slot] = step
+
+    # ---------------------------------------
+    # 🔄 Updates
+    # ---------------------------------------
+
+    def update(self, name_orig, name_dest, step, amount, txn_type):
+        """Record one transaction for both its origin and destination accounts."""
+        step, amount = int(step), float(amount)
+        with self._lock:
+            if step > self._latest_step:
+                self._latest_step = step
+            if name_orig:
+                slot = self._slot(name_orig)
+                self._add(slot, OUT, step, amount)
+                if txn_type == "TRANSFER" and step > self.last_transfer[slot]:
+                    self.last_transfer[slot] = step
+            if name_dest:
+                self._add(self._slot(name_dest), IN, step, amount)
+
+    def update_frame(self, df):
+        """Record every row of a normalized transaction frame (batch / ingest paths)."""
+        for name_orig, name_dest, step, amount, txn_type in zip(
+            df["nameOrig"], df["nameDest"], df["step"], df["amount"], df["type"]
+        ):
+            self.update(name_orig, name_dest, step, amount, txn_type)
+
+    # ---------------------------------------
+    # 📊 Reads
+    # ---------------------------------------
+
+    def _window_stats(self, slot, direction, step):
+        steps = self.bucket_step[slot, direction]
+        valid = (steps > step - self.window) & (steps <= step)
+        counts = self.bucket_count[slot, direction][valid]
+        return {
+            "count": int(counts.sum()),
+            "sum": round(float(self.bucket_sum[slot, direction][valid].sum()), 2),
+            "max": round(float(self.bucket_max[slot, direction][valid].max(initial=0.0)), 2),
+        }
+
+    def features(self, account, step=None):
+        """
+        Rolling features for an account as of `step` (default: latest step seen),
+        or None for an account the store has never seen.
+        """
+        with self._lock:
+            slot = self._accounts.lookup(account)
+            if slot is None:
+                return None
+            step = self._latest_step if step is None else int(step)
+            out = self._window_stats(slot, OUT, step)
+            inc = self._window_stats(slot, IN, step)
+            last_transfer = int(self.last_transfer[slot])
+            return {
+                "window_steps": self.window,
+                "out_count": out["count"],
+                "out_sum": out["sum"],
+                "out_max": out["max"],
+                "in_count": inc["count"],
+                "in_sum": inc["sum"],
+                "in_max": inc["max"],
+                "steps_since_last_transfer": step - last_transfer if last_transfer != NEVER else None,
+                "last_seen_step": int(self.last_seen[slot]),
+            }
+
+    def stats(self):
+        with self._lock:
+            arrays = (self.bucket_step, self.bucket_count, self.bucket_sum,
+                      self.bucket_max, self.last_seen, self.last_transfer)
+            return {
+                "accounts": len(self._accounts),
+                "capacity": self._capacity,
+                "max_accounts": self.max_accounts,
+                "window_steps": self.window,
+                "latest_step": self._latest_step,
+                "evicted": self._evicted,
+                "array_bytes": int(sum(a.nbytes for a in arrays)),
+            }
+
+    # ---------------------------------------
+    # 💾 Snapshots
+    # ---------------------------------------
+
+    def snapshot(self, path):
+        """Write the store to `path` (.npz) atomically."""
+        with self._lock:
+            used = self._accounts.size
+            payload = {
+                "bucket_step": self.bucket_step[:used],
+                "bucket_count": self.bucket_count[:used],
+                "bucket_sum": self.bucket_sum[:used],
+                "bucket_max": self.bucket_max[:used],
+                "last_seen": self.last_seen[:used],
+                "last_transfer": self.last_transfer[:used],
+                "meta": np.array(json.dumps({
+                    "window": self.window,
+                    "latest_step": self._latest_step,
+                    "names": self._accounts.names(),
+                })),
+            }
+            tmp = f"{path}.tmp.npz"
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            np.savez(tmp, **payload)
+        os.replace(tmp, path)
+
+    @classmethod
+    def restore(cls, path, **kwargs):
+        """Load a snapshot; the window length must match the snapshot's."""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            kwargs["window"] = meta["window"]
+            store = cls(initial_capacity=max(1, len(meta["names"])), **kwargs)
+            used = len(meta["names"])
+            for name in ("bucket_step", "bucket_count", "bucket_sum", "bucket_max",
+                         "last_seen", "last_transfer"):
+                getattr(store, name)[:used] = data[name]
+        store._accounts = AccountInterner.from_names(meta["names"])
+        store._live[:used] = [name is not None for name in meta["names"]]
+        store._latest_step = meta["latest_step"]
+        return store
+
+    def start_snapshots(self, path, interval_s):
+        """Snapshot every `interval_s` seconds on a daemon thread, and at exit."""
+        def loop():
+            while True:
+                time.sleep(interval_s)
+                try:
+                    self.snapshot(path)
+                except Exception as e:
+                    print(f"⚠️ Feature store snapshot failed: {e}")
+
+        threading.Thread(target=loop, name="feature-store-snapshot", daemon=True).start()
+        atexit.register(self.snapshot, path)
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_feature_store():
+    """Process-wide store, restored from its snapshot on first use."""
+    global _shared_store
+    if _shared_store is None:
+        from config import Config
+
+        with _shared_lock:
+            if _shared_store is None:
+                _shared_store = load_feature_store(Config)
+    return _shared_store
+
+
+def load_feature_store(config):
+    """Restore the shared store from its snapshot if present, else start empty."""
+    kwargs = {
+        "max_accounts": config.FEATURE_STORE_MAX_ACCOUNTS,
+        "idle_steps": config.FEATURE_STORE_IDLE_STEPS,
+    }
+    path = config.FEATURE_STORE_SNAPSHOT_PATH
+    store = None
+    if path and os.path.exists(path):
+        try:
+            store = AccountFeatureStore.restore(path, **kwargs)
+            if store.window != config.FEATURE_STORE_WINDOW_STEPS:
+                print("⚠️ Feature store snapshot window differs from config — starting empty.")
+                store = None
+        except Exception as e:
+            print(f"⚠️ Could not restore feature store snapshot: {e}")
+    if store is None:
+        store = AccountFeatureStore(window=config.FEATURE_STORE_WINDOW_STEPS, **kwargs)
+    if path and config.FEATURE_STORE_SNAPSHOT_S > 0:
+        store.start_snapshots(path, config.FEATURE_STORE_SNAPSHOT_S)
+    return store
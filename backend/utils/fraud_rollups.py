@@ -0,0 +1,183 @@
+from sqlalchemy import func, literal
+
+from config import Config
+
+SOURCES = ("single", "batch")  # Transaction / BatchTransactionLog
+# Row written by every full backfill / rebuild, its `count` holding the bucket width used.
+# Its presence (not an empty table) tells ensure_rollups the history is counted: inserts
+# may add rollups before the first backfill.
+BACKFILL_SOURCE = "backfill"
+
+
+def backfill_marker(bucket_steps):
+    return {"source": BACKFILL_SOURCE, "step_bucket": -1, "type": "", "prediction": "",
+            "count": bucket_steps, "amount_sum": 0.0}
+
+
+def _source_model(source):
+    from models import Transaction, BatchTransactionLog
+    return Transaction if source == "single" else BatchTransactionLog
+
+
+def aggregate_records(records, bucket_steps=None):
+    """Collapse row mappings into {(step_bucket, type, prediction): [count, amount_sum]}."""
+    bucket_steps = bucket_steps or Config.ROLLUP_STEP_BUCKET
+    totals = {}
+    for r in records:
+        key = (int(r.get("step") or 0) // bucket_steps, r.get("type") or "", r.get("prediction") or "")
+        acc = totals.get(key)
+        if acc is None:
+            totals[key] = [1, float(r.get("amount") or 0.0)]
+        else:
+            acc[0] += 1
+            acc[1] += float(r.get("amount") or 0.0)
+    return totals
+
+
+def _upsert_statement(session, rows):
+    from models import FraudRollup
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+
+    stmt = insert(FraudRollup).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["source", "step_bucket", "type", "prediction"],
+        set_={
+            "count": FraudRollup.count + stmt.excluded["count"],
+            "amount_sum": FraudRollup.amount_sum + stmt.excluded.amount_sum,
+        },
+    )
+
+
+def record_rollups(session, source, records):
+    """
+    Add freshly inserted rows to the rollup table. Call it in the same
+    transaction as the insert so counts and rows commit (or roll back) together.
+    """
+    from models import FraudRollup
+
+    totals = aggregate_records(records)
+    if not totals:
+        return 0
+
+    rows = [
+        {"source": source, "step_bucket": b, "type": t, "prediction": p, "count": c, "amount_sum": s}
+        for (b, t, p), (c, s) in totals.items()
+    ]
+    stmt = _upsert_statement(session, rows)
+    if stmt is not None:
+        session.execute(stmt)
+        return len(rows)
+
+    # Other databases: read-modify-write per key (a handful of keys per batch)
+    for row in rows:
+        existing = session.query(FraudRollup).filter_by(
+            source=row["source"], step_bucket=row["step_bucket"],
+            type=row["type"], prediction=row["prediction"],
+        ).with_for_update().first()
+        if existing is None:
+            session.add(FraudRollup(**row))
+        else:
+            existing.count += row["count"]
+            existing.amount_sum += row["amount_sum"]
+    return len(rows)
+
+
+def rebuild_rollups(session, bucket_steps=None):
+    """
+    Recompute the rollup table from the base tables with one GROUP BY per
+    source (INSERT ... SELECT, nothing is loaded into Python). The caller commits.
+    """
+    from models import FraudRollup
+
+    bucket_steps = bucket_steps or Config.ROLLUP_STEP_BUCKET
+    session.query(FraudRollup).delete()
+    for source in SOURCES:
+        model_cls = _source_model(source)
+        bucket = func.coalesce(model_cls.step, 0) // bucket_steps
+        txn_type = func.coalesce(model_cls.type, "")
+        prediction = func.coalesce(model_cls.prediction, "")
+        select = (
+            session.query(
+                literal(source), bucket, txn_type, prediction,
+                func.count(), func.coalesce(func.sum(model_cls.amount), 0.0),
+            )
+            .group_by(bucket, txn_type, prediction)
+        )
+        session.execute(
+            FraudRollup.__table__.insert().from_select(
+                ["source", "step_bucket", "type", "prediction", "count", "amount_sum"],
+                select.statement,
+            )
+        )
+    session.execute(FraudRollup.__table__.insert().values(**backfill_marker(bucket_steps)))
+
+
+def ensure_rollups(session):
+    """
+    Backfill the rollup table once, unless a backfill marker for the
+    configured bucket width is present (a changed ROLLUP_STEP_BUCKET
+    rebuilds). The rebuild recounts everything from the base tables, so
+    rollups that inserts added before it are replaced, not counted twice.
+    """
+    from models import FraudRollup
+
+    marker = session.query(FraudRollup.count).filter_by(source=BACKFILL_SOURCE).first()
+    if marker is not None and marker[0] == Config.ROLLUP_STEP_BUCKET:
+        return False
+    rebuild_rollups(session)
+    session.commit()
+    print("✅ Fraud rollups backfilled from transaction tables")
+    return True
+
+
+def summarize(session, sources=("single",), from_step=None, to_step=None):
+    """
+    Dashboard totals read from the rollup table: overall, per type and per
+    step bucket. Cost depends on the number of buckets, not of transactions.
+    """
+    from models import FraudRollup
+
+    query = session.query(
+        FraudRollup.step_bucket, FraudRollup.type, FraudRollup.prediction,
+        func.sum(FraudRollup.count), func.sum(FraudRollup.amount_sum),
+    ).filter(FraudRollup.source.in_(sources))
+    if from_step is not None:
+        query = query.filter(FraudRollup.step_bucket >= from_step // Config.ROLLUP_STEP_BUCKET)
+    if to_step is not None:
+        query = query.filter(FraudRollup.step_bucket <= to_step // Config.ROLLUP_STEP_BUCKET)
+    query = query.group_by(FraudRollup.step_bucket, FraudRollup.type, FraudRollup.prediction)
+
+    total, fraud, fraud_amount, total_amount = 0, 0, 0.0, 0.0
+    types, buckets = {}, {}
+    for bucket, txn_type, prediction, count, amount in query:
+        count, amount = int(count), float(amount or 0.0)
+        is_fraud = prediction == "Fraud"
+        total += count
+        total_amount += amount
+        types[txn_type] = types.get(txn_type, 0) + count
+        entry = buckets.setdefault(bucket, {"total": 0, "fraud": 0})
+        entry["total"] += count
+        if is_fraud:
+            fraud += count
+            fraud_amount += amount
+            entry["fraud"] += count
+
+    return {
+        "total": total,
+        "fraud": fraud,
+        "safe": total - fraud,
+        "types": types,
+        "amount": round(total_amount, 2),
+        "fraud_amount": round(fraud_amount, 2),
+        "bucket_steps": Config.ROLLUP_STEP_BUCKET,
+        "buckets": [
+            {"step_from": b * Config.ROLLUP_STEP_BUCKET, **buckets[b]} for b in sorted(buckets)
+        ],
+    }
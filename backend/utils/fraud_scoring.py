@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+
+# ✅ Feature order the fraud model was trained on (see models/model_metrics.json)
+FEATURES = [
+    "step",
+    "type",
+    "amount",
+    "oldbalanceOrg",
+    "newbalanceOrig",
+    "oldbalanceDest",
+    "newbalanceDest",
+]
+
+NUMERIC_FEATURES = [f for f in FEATURES if f != "type"]
+
+# ✅ Map transaction types to numeric codes
+type_map = {
+    "TRANSFER": 0,
+    "CASH_OUT": 1,
+    "PAYMENT": 2,
+    "DEBIT": 3,
+    "CASH_IN": 4
+}
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fill in defaults for a raw transaction frame, mirroring the per-field
+    defaults used by `/api/predict` (type TRANSFER, numbers 0, names "").
+    """
+    df = df.copy()
+    if "type" not in df.columns:
+        df["type"] = "TRANSFER"
+    df["type"] = df["type"].fillna("TRANSFER").astype(str).str.upper()
+
+    for col in NUMERIC_FEATURES:
+        if col not in df.columns:
+            df[col] = 0.0
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype("float64")
+
+    for col in ("nameOrig", "nameDest"):
+        if col not in df.columns:
+            df[col] = ""
+        df[col] = df[col].fillna("").astype(str)
+
+    return df
+
+
+def encode_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the model input for a whole frame in one pass.
+    `type` is encoded column-wise through `type_map` (unknown types -> 0).
+    """
+    features = df[NUMERIC_FEATURES].astype("float64")
+    features.insert(1, "type", df["type"].map(type_map).fillna(0).astype("int64"))
+    return features[FEATURES]
+
+
+def encode_rows(rows):
+    """
+    Encode a short list of already-typed transaction dicts straight into a
+    float32 matrix in FEATURES order, skipping DataFrame construction.
+    Used by the online path, where pandas overhead dwarfs the model call.
+    """
+    X = np.empty((len(rows), len(FEATURES)), dtype=np.float32)
+    for i, row in enumerate(rows):
+        for j, name in enumerate(FEATURES):
+            if name == "type":
+                X[i, j] = type_map.get(row.get("type", "TRANSFER"), 0)
+            else:
+                X[i, j] = row.get(name, 0.0)
+    return X
+
+
+def score_features(model, features: pd.DataFrame):
+    """
+    Score an encoded frame with a single `predict_proba` call.
+
+    Returns:
+        tuple: (is_fraud bool array, confidence array, risk_score array)
+    """
+    proba = np.asarray(model.predict_proba(features))
+    # Same decision rule as XGBClassifier.predict for binary models
+    is_fraud = proba[:, 1] > 0.5
+    confidence = proba.max(axis=1).astype("float64")
+    risk_score = np.round(confidence * 100, 2)
+    return is_fraud, confidence, risk_score
+
+
+def score_frame(model, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize, encode and score a frame of raw transactions.
+    Returns the normalized frame with prediction/confidence/risk_score added.
+    """
+    df = normalize_frame(df)
+    is_fraud, confidence, risk_score = score_features(model, encode_features(df))
+    df["is_fraud"] = is_fraud
+    df["prediction"] = np.where(is_fraud, "Fraud", "Legit")
+    df["confidence"] = confidence
+    df["risk_score"] = risk_score
+    return df
+
+
+LOG_COLUMNS = [
+    "step",
+    "type",
+    "amount",
+    "nameOrig",
+    "oldbalanceOrg",
+    "newbalanceOrig",
+    "nameDest",
+    "oldbalanceDest",
+    "newbalanceDest",
+    "prediction",
+    "confidence",
+    "risk_score",
+]
+
+
+def to_log_records(scored: pd.DataFrame, file_name: str):
+    """Convert a scored frame into row mappings for `BatchTransactionLog`."""
+    out = scored[LOG_COLUMNS].copy()
+    out["step"] = out["step"].astype("int64")
+    out["file_name"] = file_name
+    return out.to_dict(orient="records")
+
+
+def bulk_insert_logs(session, model_cls, records):
+    """
+    Insert many rows with one executemany instead of one ORM object per row.
+    The caller owns the transaction (commit / rollback).
+    """
+    if records:
+        session.execute(insert(model_cls), records)
+    return len(records)
@@ -0,0 +1,320 @@
+import numpy as np
+from scipy.signal import lfilter
+
+# Windows used by utils/trade_analysis.py
+MA_SHORT, MA_LONG, RSI_PERIOD, VOLATILITY_WINDOW = 5, 10, 14, 5
+# Extended indicators
+EMA_FAST, EMA_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_WINDOW, BOLLINGER_K = 20, 2.0
+ATR_PERIOD, VWAP_WINDOW = 14, 20
+
+# Indicator groups a caller can request, and the arrays each produces
+INDICATOR_OUTPUTS = {
+    "ma": ("ma_5", "ma_10"),
+    "rsi": ("rsi",),
+    "volatility": ("volatility",),
+    "ema": ("ema_12", "ema_26"),
+    "macd": ("macd", "macd_signal", "macd_hist"),
+    "bollinger": ("bb_upper", "bb_middle", "bb_lower", "bb_percent_b"),
+    "atr": ("atr",),
+    "obv": ("obv",),
+    "vwap_deviation": ("vwap_dev",),
+}
+DEFAULT_INDICATORS = ("ma", "rsi", "volatility")
+EXTENDED_INDICATORS = ("ema", "macd", "bollinger", "atr", "obv", "vwap_deviation")
+
+
+# ---------------------------------------
+# 🧮 Rolling kernels (axis 1 = time)
+# ---------------------------------------
+# Inputs are float64 arrays of shape (n_tickers, T), the layout of
+# utils/market_panel.align_bars. NaN marks "no bar"; windows behave like
+# pandas rolling(window, min_periods=1) over the bars that exist. The
+# optional arguments take intermediates a caller already has.
+
+def _window_sum(x, window):
+    """Sum over the trailing `window` columns (x must be NaN-free)."""
+    out = x.copy()
+    for k in range(1, min(window, x.shape[1])):
+        out[:, k:] += x[:, :-k]
+    return out
+
+
+def rolling_mean(x, window, total=None, count=None):
+    valid = ~np.isnan(x)
+    if total is None:
+        total = _window_sum(np.where(valid, x, 0.0), window)
+    if count is None:
+        count = _window_sum(valid.astype(np.float64), window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def rolling_std(x, window, mean=None, count=None, ddof=1):
+    """Standard deviation (sample by default); NaN where the window holds `ddof` bars or fewer."""
+    if count is None:
+        count = _window_sum((~np.isnan(x)).astype(np.float64), window)
+    if mean is None:
+        mean = rolling_mean(x, window, count=count)
+    # Two-pass (x - window mean)^2: no cancellation error from sum-of-squares
+    squares = np.zeros_like(x)
+    for k in range(min(window, x.shape[1])):
+        lagged = x[:, :x.shape[1] - k]
+        deviation = np.where(np.isnan(lagged), 0.0, lagged - mean[:, k:])
+        squares[:, k:] += deviation * deviation
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > ddof, np.sqrt(squares / (count - ddof)), np.nan)
+
+
+def price_diff(close):
+    """close[t] - close[t-1]; NaN on each ticker's first bar."""
+    delta = np.full_like(close, np.nan)
+    delta[:, 1:] = close[:, 1:] - close[:, :-1]
+    return delta
+
+
+def rolling_rsi(close, period=RSI_PERIOD, delta=None):
+    """
+    RSI with simple-average gains / losses (as compute_rsi in
+    utils/trade_analysis.py); 50 where there are no losses to divide by.
+    """
+    valid = ~np.isnan(close)
+    if delta is None:
+        delta = price_diff(close)
+    # A bar's first delta counts as 0 (pandas: NaN.where(...) -> 0)
+    gain = np.where(valid, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(valid, np.where(delta < 0, -delta, 0.0), np.nan)
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / np.where(avg_loss == 0, np.nan, avg_loss))
+    return np.where(np.isnan(rsi), 50.0, rsi)
+
+
+def ewma(x, alpha):
+    """
+    Exponentially weighted mean seeded with each ticker's first bar, as
+    pandas ewm(alpha=alpha, adjust=False); x must be compacted
+    (leading NaN only). One IIR filter pass over the whole panel.
+    """
+    valid = ~np.isnan(x)
+    first = np.minimum(np.argmax(valid, axis=1), x.shape[1] - 1)
+    seed = x[np.arange(len(x)), first] if x.shape[1] else np.zeros(len(x))
+    filled = np.where(valid, x, seed[:, None])  # before the first bar the mean stays at the seed
+    out, _ = lfilter([alpha], [1.0, alpha - 1.0], filled, axis=1, zi=((1 - alpha) * seed)[:, None])
+    out[~valid] = np.nan
+    return out
+
+
+def resolve_indicators(requested=None, confirm=None):
+    """
+    DEFAULT_INDICATORS plus the requested groups ("macd,atr", a list, or
+    "all" for EXTENDED_INDICATORS), and "macd" when confirming with it.
+    Raises ValueError on unknown names.
+    """
+    if isinstance(requested, str):
+        requested = EXTENDED_INDICATORS if requested.strip().lower() == "all" else requested.split(",")
+    names = [str(name).strip().lower() for name in requested or ()]
+    if confirm == "macd":
+        names.append("macd")
+    unknown = [name for name in names if name and name not in INDICATOR_OUTPUTS]
+    if unknown:
+        raise ValueError(f"Unknown indicators: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(DEFAULT_INDICATORS + tuple(name for name in names if name)))
+
+
+# ---------------------------------------
+# 🧵 One-pass pipeline
+# ---------------------------------------
+
+class IndicatorPipeline:
+    """
+    Computes requested indicator groups (INDICATOR_OUTPUTS) for a panel,
+    computing each shared intermediate once: price diffs (RSI, OBV),
+    previous close and true range (ATR), window bar counts and rolling
+    sums (MAs, volatility, Bollinger, VWAP) and EMAs (EMA, MACD).
+
+    Every field has shape (n_tickers, T) and is compacted with the close's
+    order (see compact_panel). high / low / volume / vwap are only needed
+    by ATR, OBV and VWAP deviation.
+    """
+
+    def __init__(self, close, high=None, low=None, volume=None, vwap=None):
+        close = np.asarray(close, dtype=np.float64)
+        order, self.bars = _compaction_order(close)
+
+        def compact(field):
+            return None if field is None else np.take_along_axis(np.asarray(field, dtype=np.float64), order, axis=1)
+
+        self.close = compact(close)
+        self.high, self.low, self.volume, self.vwap = compact(high), compact(low), compact(volume), compact(vwap)
+        self.valid = ~np.isnan(self.close)
+        self._shared = {}
+        self._scratch = np.empty_like(self.close)  # reused for the NaN-free input of every rolling sum
+
+    def _memo(self, key, compute):
+        if key not in self._shared:
+            self._shared[key] = compute()
+        return self._shared[key]
+
+    def _need(self, name, field):
+        if getattr(self, field) is None:
+            raise ValueError(f"{name} needs {field} bars")
+        return getattr(self, field)
+
+    # --- shared intermediates ---
+    def delta(self):
+        return self._memo("delta", lambda: price_diff(self.close))
+
+    def count(self, window):
+        return self._memo(("count", window), lambda: _window_sum(self.valid.astype(np.float64), window))
+
+    def window_sum(self, name, series, window):
+        def compute():
+            np.copyto(self._scratch, series)
+            self._scratch[np.isnan(self._scratch)] = 0.0
+            return _window_sum(self._scratch, window)
+        return self._memo(("sum", name, window), compute)
+
+    def sma(self, window):
+        return self._memo(("sma", window), lambda: rolling_mean(
+            self.close, window, total=self.window_sum("close", self.close, window), count=self.count(window)))
+
+    def std(self, window, ddof=1):
+        return self._memo(("std", window, ddof), lambda: rolling_std(
+            self.close, window, mean=self.sma(window), count=self.count(window), ddof=ddof))
+
+    def ema(self, period, name="close", series=None):
+        return self._memo(("ema", name, period), lambda: ewma(self.close if series is None else series, 2 / (period + 1)))
+
+    def true_range(self):
+        def compute():
+            high, low = self._need("atr", "high"), self._need("atr", "low")
+            prev_close = self.close - self.delta()  # NaN on the first bar
+            gaps = np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+            return np.where(self.valid, np.fmax(high - low, gaps), np.nan)
+        return self._memo("true_range", compute)
+
+    # --- indicator groups ---
+    def compute(self, include=DEFAULT_INDICATORS):
+        """{output name: array} for the requested groups, plus close and the bar counts."""
+        unknown = [name for name in include if name not in INDICATOR_OUTPUTS]
+        if unknown:
+            raise ValueError(f"Unknown indicators: {', '.join(unknown)}")
+        out = {"close": self.close, "bars": self.bars}
+        for name in include:
+            out.update(getattr(self, f"_{name}")())
+        return out
+
+    def _ma(self):
+        return {"ma_5": self.sma(MA_SHORT), "ma_10": self.sma(MA_LONG)}
+
+    def _rsi(self):
+        return {"rsi": rolling_rsi(self.close, RSI_PERIOD, delta=self.delta())}
+
+    def _volatility(self):
+        return {"volatility": np.nan_to_num(self.std(VOLATILITY_WINDOW), nan=0.0)}
+
+    def _ema(self):
+        return {"ema_12": self.ema(EMA_FAST), "ema_26": self.ema(EMA_SLOW)}
+
+    def _macd(self):
+        macd = self.ema(EMA_FAST) - self.ema(EMA_SLOW)
+        signal = self.ema(MACD_SIGNAL, name="macd", series=macd)
+        return {"macd": macd, "macd_signal": signal, "macd_hist": macd - signal}
+
+    def _bollinger(self):
+        middle = self.sma(BOLLINGER_WINDOW)
+        width = BOLLINGER_K * np.nan_to_num(self.std(BOLLINGER_WINDOW, ddof=0), nan=0.0)
+        upper, lower = middle + width, middle - width
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percent_b = np.where(width > 0, (self.close - lower) / (upper - lower), 0.5)
+        return {"bb_upper": upper, "bb_middle": middle, "bb_lower": lower,
+                "bb_percent_b": np.where(self.valid, percent_b, np.nan)}
+
+    def _atr(self):
+        return {"atr": ewma(self.true_range(), 1 / ATR_PERIOD)}
+
+    def _obv(self):
+        volume = self._need("obv", "volume")
+        direction = np.sign(np.nan_to_num(self.delta()))
+        return {"obv": np.where(self.valid, np.cumsum(np.nan_to_num(direction * volume), axis=1), np.nan)}
+
+    def _vwap_deviation(self):
+        volume = self._need("vwap_deviation", "volume")
+        if self.vwap is not None:
+            price = np.where(np.isnan(self.vwap), self.close, self.vwap)
+        elif self.high is not None and self.low is not None:
+            price = (self.high + self.low + self.close) / 3
+        else:
+            price = self.close
+        traded = self.window_sum("price_volume", price * volume, VWAP_WINDOW)
+        shares = self.window_sum("volume", volume, VWAP_WINDOW)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = np.where(shares > 0, traded / shares, np.nan)
+            return {"vwap_dev": np.where(self.valid, (self.close / vwap - 1) * 100, np.nan)}
+
+
+# ---------------------------------------
+# 📊 Panel engine
+# ---------------------------------------
+
+def _compaction_order(close):
+    valid = ~np.isnan(close)
+    return np.argsort(valid, axis=1, kind="stable"), valid.sum(axis=1)
+
+
+def compact_panel(close):
+    """
+    Move each ticker's bars to the right end of its row (order kept), so
+    every row ends at its own latest bar and gaps only appear on the left.
+    Returns (compacted, bars_per_ticker).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    order, bars = _compaction_order(close)
+    return np.take_along_axis(close, order, axis=1), bars
+
+
+def compute_indicators(close, include=DEFAULT_INDICATORS, **ohlcv):
+    """
+    Requested indicator groups for every ticker in one vectorized pass.
+
+    `close` has shape (n_tickers, T); high / low / volume / vwap of the
+    same shape can be passed for ATR, OBV and VWAP deviation. Returns a
+    dict of arrays of that shape (after compact_panel) plus `bars`, the
+    bar count per ticker.
+    """
+    return IndicatorPipeline(close, **ohlcv).compute(include)
+
+
+def latest_signals(indicators, confirm=None):
+    """
+    Per-ticker latest values, MA-crossover signal (BUY / SELL / HOLD) and
+    confidence, as 1-D arrays. Tickers without bars get signal "No Data".
+    With confirm="macd" a BUY also needs a positive MACD histogram and a
+    SELL a negative one (requires the "macd" group).
+    """
+    ma_5, ma_10 = indicators["ma_5"], indicators["ma_10"]
+    last = {name: values[:, -1] for name, values in indicators.items() if name != "bars"}
+    bars = indicators["bars"]
+
+    # With a single bar the previous bar is the latest one (no crossover)
+    prev_col = -2 if ma_5.shape[1] > 1 else -1
+    single = bars < 2
+    prev_5 = np.where(single, ma_5[:, -1], ma_5[:, prev_col])
+    prev_10 = np.where(single, ma_10[:, -1], ma_10[:, prev_col])
+
+    buy = (last["ma_5"] > last["ma_10"]) & (prev_5 <= prev_10)
+    sell = (last["ma_5"] < last["ma_10"]) & (prev_5 >= prev_10)
+    if confirm == "macd":
+        buy &= last["macd_hist"] > 0
+        sell &= last["macd_hist"] < 0
+    elif confirm is not None:
+        raise ValueError("confirm must be macd or empty")
+    signal = np.where(buy, "BUY", np.where(sell, "SELL", "HOLD")).astype(object)
+    signal[bars == 0] = "No Data"
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        confidence = np.minimum(np.abs(last["ma_5"] - last["ma_10"]) / last["ma_10"] * 100, 100)
+
+    return {**last, "signal": signal, "confidence": confidence, "bars": bars}
@@ -0,0 +1,9 @@
+def percentiles(sorted_values):
+    """p50 / p99 / max of an ascending list of latencies (ms), rounded for stats endpoints."""
+    if not sorted_values:
+        return {"p50": None, "p99": None, "max": None}
+
+    def pick(q):
+        return round(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))], 3)
+
+    return {"p50": pick(0.50), "p99": pick(0.99), "max": round(sorted_values[-1], 3)}
@@ -0,0 +1,94 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+from config import Config
+from utils.polygon_client import fetch_bars
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume", "vwap", "transactions")
+
+# ✅ Shared, bounded pool: at most MARKET_DATA_MAX_WORKERS upstream calls in flight
+_executor = ThreadPoolExecutor(
+    max_workers=Config.MARKET_DATA_MAX_WORKERS, thread_name_prefix="market-data"
+)
+
+
+def normalize_tickers(raw):
+    """Upper-case, de-duplicate (keeping order) and drop empty entries."""
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    seen = []
+    for ticker in raw or []:
+        ticker = str(ticker).strip().upper()
+        if ticker and ticker not in seen:
+            seen.append(ticker)
+    return seen
+
+
+def fetch_many(tickers, start_date, end_date, timespan="day", timeout=None):
+    """
+    Fetch bars for many tickers concurrently.
+
+    Returns (frames, errors, timings): a ticker that fails or does not
+    finish within `timeout` seconds lands in `errors` and does not affect
+    the others.
+    """
+    timeout = Config.MARKET_DATA_PANEL_TIMEOUT_S if timeout is None else timeout
+
+    def timed(ticker):
+        started = time.perf_counter()
+        bars = fetch_bars(ticker, start_date, end_date, timespan)
+        return bars, (time.perf_counter() - started) * 1000
+
+    futures = {_executor.submit(timed, t): t for t in tickers}
+    done, _ = wait(futures, timeout=timeout)
+
+    frames, errors, timings = {}, {}, {}
+    for future, ticker in futures.items():
+        if future not in done:
+            future.cancel()
+            errors[ticker] = f"Timed out after {timeout:g}s"
+            continue
+        try:
+            frames[ticker], timings[ticker] = future.result()
+        except Exception as e:
+            print(f"❌ Error fetching {ticker}: {e}")
+            errors[ticker] = str(e)
+    return frames, errors, timings
+
+
+def align_bars(frames, tickers, fields=PANEL_FIELDS):
+    """
+    Align per-ticker bar frames on the union of their timestamps.
+
+    Returns (timestamps, {field: float64 array of shape (len(tickers), T)});
+    cells where a ticker has no bar are NaN.
+    """
+    present = [frames[t]["timestamp"].to_numpy(np.int64) for t in tickers if t in frames and len(frames[t])]
+    timestamps = np.unique(np.concatenate(present)) if present else np.empty(0, dtype=np.int64)
+
+    panel = {field: np.full((len(tickers), len(timestamps)), np.nan) for field in fields}
+    for row, ticker in enumerate(tickers):
+        bars = frames.get(ticker)
+        if bars is None or not len(bars):
+            continue
+        cols = np.searchsorted(timestamps, bars["timestamp"].to_numpy(np.int64))
+        for field in fields:
+            if field in bars:
+                panel[field][row, cols] = bars[field].to_numpy(np.float64)
+    return timestamps, panel
+
+
+def fetch_panel(tickers, start_date, end_date, timespan="day", fields=PANEL_FIELDS):
+    """Concurrent fetch + alignment; see `fetch_many` and `align_bars`."""
+    frames, errors, timings = fetch_many(tickers, start_date, end_date, timespan)
+    ok = [t for t in tickers if t in frames]
+    timestamps, panel = align_bars(frames, ok, fields)
+    return {
+        "tickers": ok,
+        "timestamps": timestamps,
+        "panel": panel,
+        "errors": errors,
+        "timings_ms": timings,
+    }
@@ -0,0 +1,213 @@
+import abc
+import json
+import os
+import random
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from utils.bar_store import BAR_COLUMNS, MARKET_TZ, BarStore
+
+
+class ProviderError(Exception):
+    """Upstream market-data failure (real or injected)."""
+
+
+class MarketDataProvider(abc.ABC):
+    """
+    Source of market data for the app.
+
+    list_aggs -> DataFrame with the BAR_COLUMNS of utils/bar_store.py, bars
+    whose start falls on a market date in [start_date, end_date].
+    latest_price -> last traded price of a symbol (float); `timeout`
+    (seconds) bounds the upstream call.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def list_aggs(self, ticker, timespan, start_date, end_date):
+        ...
+
+    @abc.abstractmethod
+    def latest_price(self, symbol, timeout=None):
+        ...
+
+
+# ---------------------------------------
+# 🧪 Synthetic bars
+# ---------------------------------------
+
+_STEP_MS = {"minute": 60_000, "hour": 3_600_000}
+
+
+def _bar_times(timespan, start_date, end_date):
+    """Bar start times (epoch ms) on weekdays; intraday bars cover 04:00-20:00 ET."""
+    days = pd.date_range(start_date, end_date, freq="D")
+    days = days[days.weekday < 5]
+    if timespan == "week":
+        days = pd.DatetimeIndex(sorted(set(days - pd.to_timedelta(days.weekday, unit="D"))))
+    local_days = days.tz_localize(MARKET_TZ)
+    if timespan in ("day", "week"):
+        return local_days.as_unit("ms").asi8
+    step = _STEP_MS[timespan]
+    offsets = np.arange(4 * 3_600_000, 20 * 3_600_000, step)
+    return (local_days.as_unit("ms").asi8[:, None] + offsets[None, :]).ravel()
+
+
+def _noise(ts, salt):
+    """Deterministic pseudo-random values in [-0.5, 0.5) per timestamp."""
+    mixed = (ts.astype(np.uint64) * np.uint64(2654435761) + np.uint64(salt)) % np.uint64(1_000_003)
+    return mixed.astype(np.float64) / 1_000_003 - 0.5
+
+
+def synthetic_bars(ticker, timespan, start_date, end_date):
+    """
+    Deterministic OHLCV bars for any ticker: the same (ticker, timestamp)
+    always yields the same bar, so overlapping requests agree.
+    """
+    return _synthetic_at(ticker, _bar_times(timespan, start_date, end_date))
+
+
+def _synthetic_at(ticker, ts):
+    salt = zlib.crc32(ticker.upper().encode())
+    base = 20 + salt % 480
+    t = ts / 86_400_000.0  # days
+    close = base * (1 + 0.15 * np.sin(2 * np.pi * t / 90 + salt % 7)
+                    + 0.05 * np.sin(2 * np.pi * t / 9 + salt % 5)
+                    + 0.01 * _noise(ts, salt))
+    open_ = close * (1 + 0.004 * _noise(ts, salt + 1))
+    high = np.maximum(open_, close) * (1 + 0.003 * np.abs(_noise(ts, salt + 2)))
+    low = np.minimum(open_, close) * (1 - 0.003 * np.abs(_noise(ts, salt + 3)))
+    volume = np.round(5000 + 4000 * _noise(ts, salt + 4))
+    return pd.DataFrame({
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+        "vwap": (high + low + close) / 3,
+        "timestamp": ts.astype(np.int64),
+        "transactions": (volume // 10).astype(np.int64),
+    })
+
+
+# ---------------------------------------
+# 📼 Replay provider
+# ---------------------------------------
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serve bars and quotes from local files, for offline tests and benchmarks.
+
+    `root/bars` uses the BarStore layout (copy a live `data/bars` cache
+    there to replay recorded data); `root/quotes.json` maps symbol -> price.
+    Tickers without recorded data get synthetic bars (unless disabled) and
+    their quote is the latest synthetic close. Every call can be delayed
+    by `latency_ms` (+ up to `jitter_ms`) and fail with probability
+    `error_rate`; the seeded RNG makes runs reproducible.
+    """
+
+    name = "replay"
+
+    def __init__(self, root, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, seed=0, synthetic=True):
+        self.root = root
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.synthetic = synthetic
+        self.bars = BarStore(os.path.join(root, "bars"))
+
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._quotes = None
+
+        self._stats_lock = threading.Lock()
+        self._calls = 0
+        self._errors = 0
+
+    def _simulate(self, what, timeout=None):
+        with self._rng_lock:
+            delay = self.latency + self.jitter * self._rng.random()
+            fail = self._rng.random() < self.error_rate
+        with self._stats_lock:
+            self._calls += 1
+            self._errors += fail
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise ProviderError(f"Replay call timed out after {timeout:g}s ({what})")
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise ProviderError(f"Injected replay failure ({what})")
+
+    def list_aggs(self, ticker, timespan, start_date, end_date):
+        self._simulate(f"{ticker} {timespan}")
+        if os.path.isdir(os.path.join(self.bars.root, ticker.upper(), timespan)):
+            return self.bars.read(ticker, timespan, start_date, end_date)
+        if self.synthetic:
+            return synthetic_bars(ticker, timespan, start_date, end_date)
+        return pd.DataFrame({name: np.empty(0, dtype=dt) for name, dt in BAR_COLUMNS.items()})
+
+    def latest_price(self, symbol, timeout=None):
+        self._simulate(f"{symbol} quote", timeout)
+        if self._quotes is None:
+            path = os.path.join(self.root, "quotes.json")
+            self._quotes = {}
+            if os.path.exists(path):
+                with open(path) as f:
+                    self._quotes = {k.upper(): v for k, v in json.load(f).items()}
+        symbol = symbol.upper()
+        if symbol in self._quotes:
+            return float(self._quotes[symbol])
+        if not self.synthetic:
+            raise ProviderError(f"No replay quote for {symbol}")
+        now_ms = int(time.time() * 1000)
+        minute = np.array([now_ms - now_ms % 60_000], dtype=np.int64)
+        return float(_synthetic_at(symbol, minute)["close"].iloc[0])
+
+    def stats(self):
+        with self._stats_lock:
+            return {"calls": self._calls, "injected_errors": self._errors}
+
+
+# ---------------------------------------
+# 🔌 Active provider
+# ---------------------------------------
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """Process-wide provider selected by MARKET_DATA_PROVIDER (polygon | replay)."""
+    global _provider
+    if _provider is None:
+        from config import Config
+
+        with _provider_lock:
+            if _provider is None:
+                if Config.MARKET_DATA_PROVIDER == "replay":
+                    _provider = ReplayProvider(
+                        Config.MARKET_REPLAY_DIR,
+                        latency_ms=Config.MARKET_REPLAY_LATENCY_MS,
+                        jitter_ms=Config.MARKET_REPLAY_JITTER_MS,
+                        error_rate=Config.MARKET_REPLAY_ERROR_RATE,
+                        seed=Config.MARKET_REPLAY_SEED,
+                        synthetic=Config.MARKET_REPLAY_SYNTHETIC,
+                    )
+                else:
+                    from utils.polygon_client import PolygonProvider
+                    _provider = PolygonProvider()
+    return _provider
+
+
+def set_provider(provider):
+    """Swap the active provider (benchmarks / tests); returns the previous one."""
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    return previous
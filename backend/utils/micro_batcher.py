@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from utils.latency_stats import percentiles
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item requests into one vectorized call.
+
+    The worker takes the first queued item, then keeps collecting for up to
+    `max_wait_ms` or until `max_batch_size` items are waiting, and hands the
+    whole batch to `batch_fn(items) -> results` (same order, same length).
+    Every caller gets its own result back through a Future.
+    """
+
+    def __init__(self, batch_fn, max_wait_ms=2.0, max_batch_size=64, name="micro-batcher"):
+        self.batch_fn = batch_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+        # --- Metrics ---
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._flush_on_size = 0
+        self._flush_on_timeout = 0
+        self._errors = 0
+        self._histogram = {}  # power-of-two bucket -> batch count
+        self._waits_ms = deque(maxlen=2048)  # recent queue waits
+        self._batch_ms = deque(maxlen=2048)  # recent batch_fn durations
+
+    # ---------------------------------------
+    # 🔄 Worker
+    # ---------------------------------------
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            items = [item for item, _, _ in batch]
+
+            try:
+                results = self.batch_fn(items)
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+                failed = False
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                failed = True
+
+            self._record(batch, started, time.perf_counter(), failed)
+
+    def _record(self, batch, started, finished, failed):
+        size = len(batch)
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+
+        with self._stats_lock:
+            self._batches += 1
+            self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+            if size >= self.max_batch_size:
+                self._flush_on_size += 1
+            else:
+                self._flush_on_timeout += 1
+            if failed:
+                self._errors += 1
+            self._batch_ms.append((finished - started) * 1000)
+            for _, _, enqueued in batch:
+                self._waits_ms.append((started - enqueued) * 1000)
+
+    # ---------------------------------------
+    # 📤 Public API
+    # ---------------------------------------
+
+    def submit(self, item):
+        """Queue one item; returns a Future resolving to its own result."""
+        self._ensure_worker()
+        future = Future()
+        with self._stats_lock:
+            self._requests += 1
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def stats(self):
+        """Counters and latency percentiles for tuning the window / batch size."""
+        with self._stats_lock:
+            waits = sorted(self._waits_ms)
+            batch_ms = sorted(self._batch_ms)
+            batches = self._batches
+            return {
+                "max_wait_ms": self.max_wait * 1000,
+                "max_batch_size": self.max_batch_size,
+                "requests": self._requests,
+                "batches": batches,
+                "coalesced_requests": self._requests - batches,
+                "avg_batch_size": round(self._requests / batches, 2) if batches else 0,
+                "flush_on_size": self._flush_on_size,
+                "flush_on_timeout": self._flush_on_timeout,
+                "errors": self._errors,
+                "queue_depth": self._queue.qsize(),
+                "batch_size_histogram": {str(k): v for k, v in sorted(self._histogram.items())},
+                "queue_wait_ms": percentiles(waits),
+                "batch_ms": percentiles(batch_ms),
+            }
@@ -0,0 +1,217 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from config import Config
+from utils.fraud_scoring import FEATURES
+from utils.tree_compiler import CompiledForest, artifact_digest, check_parity, compile_xgb, probe_rows
+
+MANIFEST_NAME = "model_metrics.json"
+ARTIFACT_NAME = "model.pkl"
+COMPILED_DIR_NAME = "model_trees"
+
+
+class LoadedModel:
+    """One loaded model version: the booster plus its online evaluator."""
+
+    def __init__(self, version, path, metrics, model, online_model, load_ms):
+        self.version = version
+        self.path = path
+        self.metrics = metrics
+        self.model = model
+        self.online_model = online_model
+        self.load_ms = load_ms
+        self.loaded_at = datetime.utcnow()
+
+    def to_dict(self):
+        return {
+            "version": self.version,
+            "path": self.path,
+            "online_backend": type(self.online_model).__name__,
+            "load_ms": round(self.load_ms, 2),
+            "loaded_at": self.loaded_at.isoformat(),
+            "algorithm": self.metrics.get("algorithm"),
+            "trainedOn": self.metrics.get("trainedOn"),
+        }
+
+
+class ModelRegistry:
+    """
+    Fraud models keyed by the `version` field of their model_metrics.json.
+
+    A version is a directory holding `model_metrics.json` and `model.pkl`
+    (optionally `model_trees/` exported by utils.tree_compiler): the models
+    folder itself, or any sub-folder of it. Nothing is loaded until the
+    first `get()`. `activate()` loads the new version completely, warms it
+    up, and only then swaps the active reference; the previous version stays
+    loaded so in-flight requests finish on it and `rollback()` is instant.
+    """
+
+    def __init__(self, models_dir, version=None, online_backend="compiled", mmap_min_bytes=0):
+        self.models_dir = models_dir
+        self.pinned_version = version
+        self.online_backend = online_backend
+        self.mmap_min_bytes = mmap_min_bytes
+
+        self._active = None
+        self._previous = None
+        self._swap_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loading = None
+        self._last_error = None
+
+    # ---------------------------------------
+    # 🔍 Discovery
+    # ---------------------------------------
+
+    def discover(self):
+        """Map version -> directory for every manifest under models_dir."""
+        candidates = [self.models_dir]
+        if os.path.isdir(self.models_dir):
+            candidates += sorted(
+                os.path.join(self.models_dir, d) for d in os.listdir(self.models_dir)
+                if os.path.isdir(os.path.join(self.models_dir, d))
+            )
+
+        versions = {}
+        for folder in candidates:
+            manifest = os.path.join(folder, MANIFEST_NAME)
+            if not os.path.exists(manifest) or not os.path.exists(os.path.join(folder, ARTIFACT_NAME)):
+                continue
+            with open(manifest) as f:
+                version = json.load(f).get("version")
+            # Sub-folders override the top-level copy of the same version
+            if version and (version not in versions or folder != self.models_dir):
+                versions[version] = folder
+        return versions
+
+    def default_version(self):
+        """Pinned version, else the version of the top-level manifest."""
+        if self.pinned_version:
+            return self.pinned_version
+        with open(os.path.join(self.models_dir, MANIFEST_NAME)) as f:
+            return json.load(f)["version"]
+
+    # ---------------------------------------
+    # 📦 Loading
+    # ---------------------------------------
+
+    def _load(self, version):
+        import joblib
+
+        folder = self.discover().get(version)
+        if folder is None:
+            raise KeyError(f"Unknown model version: {version}")
+
+        started = time.perf_counter()
+        with open(os.path.join(folder, MANIFEST_NAME)) as f:
+            metrics = json.load(f)
+
+        artifact = os.path.join(folder, ARTIFACT_NAME)
+        # Large sklearn-style pickles: map their numpy arrays instead of copying them
+        mmap = "r" if self.mmap_min_bytes and os.path.getsize(artifact) >= self.mmap_min_bytes else None
+        model = joblib.load(artifact, mmap_mode=mmap)
+
+        online_model = model
+        if self.online_backend == "compiled":
+            online_model = self._load_compiled(folder, artifact, model)
+
+        # Warm both paths so the first real request does not pay for it
+        warmup = np.zeros((1, len(FEATURES)), dtype=np.float32)
+        model.predict_proba(warmup)
+        online_model.predict_proba(warmup)
+
+        return LoadedModel(
+            version, folder, metrics, model, online_model,
+            (time.perf_counter() - started) * 1000,
+        )
+
+    def _load_compiled(self, folder, artifact, model):
+        """
+        The exported `model_trees/` if it was compiled from this very artifact
+        and scores probe rows exactly like it, else a fresh compile_xgb(model).
+        """
+        compiled_dir = os.path.join(folder, COMPILED_DIR_NAME)
+        if os.path.exists(os.path.join(compiled_dir, "meta.json")):
+            try:
+                forest = CompiledForest.load(compiled_dir, mmap_mode="r")
+                if forest.meta.get("source_sha256") != artifact_digest(artifact):
+                    reason = "was not exported from this model.pkl"
+                elif not check_parity(model, forest, probe_rows(len(FEATURES), n_rows=256))["bit_identical"]:
+                    reason = "does not match model.pkl on probe rows"
+                else:
+                    return forest
+            except (OSError, ValueError, KeyError) as e:
+                reason = f"could not be loaded ({e})"
+            print(f"⚠️ {compiled_dir} {reason}; compiling the trees from model.pkl instead")
+        return compile_xgb(model)
+
+    def get(self):
+        """Active model, loading the default version on first use."""
+        active = self._active
+        if active is not None:
+            return active
+        with self._load_lock:
+            if self._active is None:
+                self._active = self._load(self.default_version())
+            return self._active
+
+    def activate(self, version=None):
+        """Load `version` (default: current manifest) and atomically make it active."""
+        version = version or self.default_version()
+        with self._load_lock:
+            self._loading = version
+            try:
+                loaded = self._load(version)
+                self._last_error = None
+            except Exception as e:
+                self._last_error = f"{version}: {e}"
+                raise
+            finally:
+                self._loading = None
+
+            with self._swap_lock:
+                self._previous, self._active = self._active, loaded
+        print(f"✅ Fraud model {version} active ({loaded.load_ms:.0f} ms load)")
+        return loaded
+
+    def activate_async(self, version=None):
+        """Hot reload on a background thread; the current model keeps serving."""
+        def work():
+            try:
+                self.activate(version)
+            except Exception as e:
+                print(f"❌ Model reload failed: {e}")
+
+        threading.Thread(target=work, name="model-reload", daemon=True).start()
+
+    def rollback(self):
+        """Swap back to the previously active (still loaded) version."""
+        with self._swap_lock:
+            if self._previous is None:
+                raise LookupError("No previous model version to roll back to.")
+            self._previous, self._active = self._active, self._previous
+            return self._active
+
+    def status(self):
+        active, previous = self._active, self._previous
+        return {
+            "active": active.to_dict() if active else None,
+            "previous": previous.to_dict() if previous else None,
+            "loading": self._loading,
+            "last_error": self._last_error,
+            "available": sorted(self.discover()),
+        }
+
+
+# ✅ Shared registry (lazy: nothing is read from disk until the first prediction)
+model_registry = ModelRegistry(
+    Config.FRAUD_MODEL_DIR,
+    version=Config.FRAUD_MODEL_VERSION,
+    online_backend=Config.FRAUD_ONLINE_BACKEND,
+    mmap_min_bytes=Config.FRAUD_MODEL_MMAP_MIN_BYTES,
+)
@@ -1,40 +1,153 @@
 from dotenv import load_dotenv
 import os
+import threading
 import pandas as pd
+import yfinance as yf
 from polygon import RESTClient
+from config import Config
+from utils.bar_store import BarStore, market_today
+from utils.bar_encoding import collect_aggs
+from utils.market_providers import MarketDataProvider, ProviderError, get_provider
+from utils.resample import RESAMPLED_TIMESPANS, resample_bars
+from utils.upstream_scheduler import UpstreamScheduler
 
 # ✅ Load your API key from config.env
 load_dotenv(dotenv_path="config.env")
 API_KEY = os.getenv("POLYGON_API_KEY")
 
-# ✅ Initialize client
-client = RESTClient(API_KEY)
+# ✅ Rate limit + single-flight for every Polygon request (see utils/upstream_scheduler.py)
+scheduler = UpstreamScheduler(
+    rate_per_s=Config.POLYGON_CALLS_PER_MIN / 60.0,
+    burst=Config.POLYGON_BURST,
+    max_wait_s=Config.POLYGON_MAX_WAIT_S,
+    name="polygon",
+)
+
+
+class ScheduledRESTClient(RESTClient):
+    """RESTClient that takes a scheduler token before each HTTP request (pagination pages included)."""
+
+    def _get(self, *args, **kwargs):
+        scheduler.acquire()
+        return super()._get(*args, **kwargs)
+
+
+class PolygonProvider(MarketDataProvider):
+    """Live data: bars from Polygon.io, latest prices from Yahoo Finance."""
+
+    name = "polygon"
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or API_KEY
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        # Created on first use, so the app imports (and replay runs) without a Polygon key.
+        # One shared client; its urllib3 pool keeps up to MARKET_DATA_MAX_WORKERS
+        # keep-alive connections so concurrent fetches reuse them.
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    client = ScheduledRESTClient(self.api_key)
+                    client.client.connection_pool_kw["maxsize"] = Config.MARKET_DATA_MAX_WORKERS
+                    self._client = client
+        return self._client
+
+    def list_aggs(self, ticker, timespan, start_date, end_date):
+        aggs = self.client.list_aggs(
+            ticker=ticker,
+            multiplier=1,
+            timespan=timespan,
+            from_=start_date,
+            to=end_date,
+            limit=5000,
+        )
+        return collect_aggs(aggs)
+
+    def latest_price(self, symbol, timeout=None):
+        hist = yf.Ticker(symbol).history(period="1d", timeout=timeout or 10)
+        if hist.empty:
+            raise ProviderError("No live market data found for this symbol.")
+        return float(hist["Close"].iloc[-1])
+
+
+# ✅ Persistent bar cache: only date ranges not yet on disk go upstream.
+# Non-live providers get their own cache directory so replayed bars never mix with real ones.
+bar_store = BarStore(
+    Config.MARKET_DATA_CACHE_DIR if Config.MARKET_DATA_PROVIDER == "polygon"
+    else f"{Config.MARKET_DATA_CACHE_DIR}-{Config.MARKET_DATA_PROVIDER}"
+)
+
+
+def _fetch_upstream(ticker: str, start_date: str, end_date: str, timespan: str):
+    return get_provider().list_aggs(ticker, timespan, start_date, end_date)
+
 
 # ✅ Main function for fetching stock data
-def fetch_stock_data(ticker: str, start_date: str, end_date: str, timespan: str = "day"):
+def fetch_stock_data(ticker: str, start_date: str, end_date: str, timespan: str = "day", session: str = None):
     """
-    Fetch historical stock data from Polygon.io
+    Fetch historical stock data, from the local bar cache where possible.
+
+    Only the parts of [start_date, end_date] that are not cached yet are
+    requested from the market data provider (Polygon.io unless
+    MARKET_DATA_PROVIDER says otherwise); a fully cached range needs no network call.
+    Hour, day and week bars are derived from cached minute bars when those
+    cover the range (see utils/resample.py).
 
     Args:
         ticker (str): Stock ticker symbol (e.g., 'AAPL')
         start_date (str): Start date (YYYY-MM-DD)
         end_date (str): End date (YYYY-MM-DD)
-        timespan (str): Aggregation level ('minute', 'hour', 'day')
+        timespan (str): Aggregation level ('minute', 'hour', 'day', 'week')
+        session (str): 'regular' or 'extended' hours for derived bars
+            (default: extended for hour, regular for day / week)
 
     Returns:
         pandas.DataFrame: DataFrame containing stock data
     """
     try:
-        aggs = client.list_aggs(
-            ticker=ticker,
-            multiplier=1,
-            timespan=timespan,
-            from_=start_date,
-            to=end_date,
-            limit=5000,
-        )
-        df = pd.DataFrame([a.__dict__ for a in aggs])
-        return df
+        return fetch_bars(ticker, start_date, end_date, timespan, session)
     except Exception as e:
         print(f"❌ Error fetching stock data: {e}")
         return pd.DataFrame()
+
+
+def fetch_bars(ticker: str, start_date: str, end_date: str, timespan: str = "day", session: str = None):
+    """Same as `fetch_stock_data`, but upstream errors are raised to the caller."""
+    if not Config.MARKET_DATA_CACHE_ENABLED:
+        key = (ticker.upper(), timespan, start_date, end_date)
+        return scheduler.single_flight(
+            key, lambda: _fetch_upstream(ticker, start_date, end_date, timespan)
+        ).copy()
+
+    if _can_resample(ticker, start_date, end_date, timespan):
+        return resample_bars(_fetch_cached(ticker, start_date, end_date, "minute"), timespan, session)
+    return _fetch_cached(ticker, start_date, end_date, timespan)
+
+
+def _can_resample(ticker, start_date, end_date, timespan):
+    """
+    Coarser bars come from minute bars when the minute cache covers the
+    range, except for today onwards (never marked covered, re-fetched anyway).
+    """
+    if not Config.MARKET_DATA_RESAMPLE_ENABLED or timespan not in RESAMPLED_TIMESPANS:
+        return False
+    today = market_today()
+    return all(gap_start >= today for gap_start, _ in bar_store.missing(ticker, "minute", start_date, end_date))
+
+
+def _fetch_cached(ticker, start_date, end_date, timespan):
+    for gap_start, gap_end in bar_store.missing(ticker, timespan, start_date, end_date):
+        # Concurrent requests for the same gap share one download + cache write
+        scheduler.single_flight(
+            (ticker.upper(), timespan, gap_start, gap_end),
+            lambda: bar_store.write(
+                ticker, timespan,
+                _fetch_upstream(ticker, gap_start.isoformat(), gap_end.isoformat(), timespan),
+                gap_start, gap_end,
+            ),
+        )
+
+    return bar_store.read(ticker, timespan, start_date, end_date)
@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, time as dtime, timedelta
+
+from config import Config
+from utils.bar_store import MARKET_TZ
+from utils.market_providers import get_provider
+
+# Regular session (ET, weekdays). Exchange holidays are not modelled: on a
+# holiday quotes are simply re-fetched with the trading-hours TTL.
+MARKET_OPEN, MARKET_CLOSE = dtime(9, 30), dtime(16, 0)
+
+# ✅ Shared, bounded pool: at most QUOTE_MAX_WORKERS quote lookups in flight
+_executor = ThreadPoolExecutor(max_workers=Config.QUOTE_MAX_WORKERS, thread_name_prefix="quotes")
+
+
+# ---------------------------------------
+# 🕰️ Market hours
+# ---------------------------------------
+
+def market_is_open(now=None):
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def last_close(now=None):
+    """Most recent regular-session close at or before `now` (aware datetime, ET)."""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    day = now.date()
+    while True:
+        close = datetime.combine(day, MARKET_CLOSE, MARKET_TZ)
+        if day.weekday() < 5 and close <= now:
+            return close
+        day -= timedelta(days=1)
+
+
+# ---------------------------------------
+# 🗃️ Quote cache
+# ---------------------------------------
+
+class QuoteCache:
+    """
+    Thread-safe LRU of latest prices, bounded to `max_entries` symbols.
+
+    During trading hours a quote is fresh for `ttl_s`, then served stale
+    (and refreshed in the background) for up to `stale_s` more. Outside
+    trading hours a quote fetched after the last close (+ `settle_s` for
+    the closing print to land) is the closing price and stays fresh until
+    the market opens again, so it needs no upstream call.
+    """
+
+    def __init__(self, max_entries=5000, ttl_s=15.0, stale_s=120.0, settle_s=300.0, name="quotes"):
+        self.max_entries = max_entries
+        self.ttl = ttl_s
+        self.stale = stale_s
+        self.settle = settle_s
+        self.name = name
+        self._entries = OrderedDict()  # symbol -> (price, fetched_at epoch s)
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "stale_hits": 0, "misses": 0, "evicted": 0,
+                        "upstream_calls": 0, "upstream_errors": 0, "refreshes": 0, "stuck": 0}
+
+    def lookup(self, symbol, now=None):
+        """("fresh" | "stale" | "miss", price or None) for an upper-cased symbol."""
+        now = now or datetime.now(MARKET_TZ)
+        with self._lock:
+            entry = self._entries.get(symbol)
+            state = self._state(entry, now) if entry else "miss"
+            if state == "miss":
+                self._counts["misses"] += 1
+                return state, None
+            self._entries.move_to_end(symbol)
+            self._counts["hits" if state == "fresh" else "stale_hits"] += 1
+            return state, entry[0]
+
+    def _state(self, entry, now):
+        age = now.timestamp() - entry[1]
+        if not market_is_open(now) and entry[1] >= last_close(now).timestamp() + self.settle:
+            return "fresh"
+        if age <= self.ttl:
+            return "fresh"
+        return "stale" if age <= self.ttl + self.stale else "miss"
+
+    def put(self, symbol, price, fetched_at=None):
+        with self._lock:
+            self._entries[symbol] = (float(price), fetched_at or time.time())
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counts["evicted"] += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counts[name] += n
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["stale_hits"] + self._counts["misses"]
+            served = self._counts["hits"] + self._counts["stale_hits"]
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "stale_s": self.stale,
+                "market_open": market_is_open(),
+                **self._counts,
+                "hit_ratio": round(served / lookups, 4) if lookups else None,
+            }
+
+
+# ✅ Process-wide quote cache shared by the portfolio, AI analysis and recommendation routes
+quote_cache = QuoteCache(
+    max_entries=Config.QUOTE_CACHE_MAX_ENTRIES,
+    ttl_s=Config.QUOTE_CACHE_TTL_S,
+    stale_s=Config.QUOTE_CACHE_STALE_S,
+)
+
+_inflight = {}   # symbol -> Future of the upstream lookup (one per symbol across requests)
+_started = {}    # Future -> [monotonic time the lookup started], empty while it is queued
+_inflight_lock = threading.Lock()
+
+
+def _lookup(symbol, timeout, started):
+    started.append(time.monotonic())
+    quote_cache.count("upstream_calls")
+    try:
+        return float(get_provider().latest_price(symbol, timeout=timeout))
+    except Exception:
+        quote_cache.count("upstream_errors")
+        raise
+
+
+def _submit(symbol, timeout, refresh=False):
+    """Future for the upstream lookup of `symbol`, joining one already in flight."""
+    with _inflight_lock:
+        future = _inflight.get(symbol)
+        if future is not None:
+            return future
+        if refresh:
+            quote_cache.count("refreshes")
+        started = []
+        future = _executor.submit(_lookup, symbol, timeout, started)
+        _inflight[symbol] = future
+        _started[future] = started
+
+    def done(_):
+        with _inflight_lock:
+            _started.pop(future, None)
+            current = _inflight.get(symbol) is future
+            if current:
+                del _inflight[symbol]
+        # An abandoned lookup may return after a newer one: keep its price out of the cache
+        if current and Config.QUOTE_CACHE_ENABLED and future.exception() is None:
+            quote_cache.put(symbol, future.result())
+
+    # Outside the lock: a lookup that already finished runs the callback right here
+    future.add_done_callback(done)
+    return future
+
+
+def _expires_at(future, timeout):
+    """When `future` overruns `timeout`, or None while it is still queued."""
+    with _inflight_lock:
+        started = _started.get(future)
+    return started[0] + timeout if started else None
+
+
+def _abandon(symbol, future):
+    """
+    Stop sharing a lookup that overran its timeout, so the next request for
+    `symbol` starts a fresh one instead of joining it. The stuck thread keeps
+    its worker until the provider returns.
+    """
+    with _inflight_lock:
+        if _inflight.get(symbol) is not future:
+            return
+        del _inflight[symbol]
+    quote_cache.count("stuck")
+
+
+def unique_symbols(symbols):
+    """Upper-cased, stripped symbols without duplicates or blanks, in first-seen order."""
+    return list(dict.fromkeys(s for s in (str(symbol).strip().upper() for symbol in symbols) if s))
+
+
+def fetch_quotes(symbols, timeout=None, batch_timeout=None):
+    """
+    Latest price of each unique symbol: from the quote cache where possible,
+    the rest fetched concurrently (stale quotes are served and refreshed
+    in the background).
+
+    Every lookup gets `timeout` seconds from the moment it starts (passed to
+    the provider, and enforced here in case the provider overruns it); the
+    whole batch gives up after `batch_timeout`. Returns (prices, errors):
+    a symbol that fails or times out lands in `errors` and does not affect
+    the others.
+    """
+    timeout = Config.QUOTE_TIMEOUT_S if timeout is None else timeout
+    batch_timeout = Config.QUOTE_BATCH_TIMEOUT_S if batch_timeout is None else batch_timeout
+    prices, errors, futures = {}, {}, {}
+
+    for symbol in unique_symbols(symbols):
+        state, price = quote_cache.lookup(symbol) if Config.QUOTE_CACHE_ENABLED else ("miss", None)
+        if state == "miss":
+            futures[_submit(symbol, timeout)] = symbol
+            continue
+        prices[symbol] = price
+        if state == "stale":
+            _submit(symbol, timeout, refresh=True)  # stale-while-revalidate
+
+    pending = set(futures)
+    deadline = time.monotonic() + batch_timeout
+    while pending:
+        now = time.monotonic()
+        running = [(expires, f) for f in pending if (expires := _expires_at(f, timeout)) is not None]
+        expired = [f for expires, f in running if expires <= now]
+        for future in expired:
+            errors[futures[future]] = f"Timed out after {timeout:g}s"
+            pending.discard(future)
+            _abandon(futures[future], future)
+        if not pending:
+            break
+        if now >= deadline:
+            for future in pending:  # left running: other requests may share it, and it still fills the cache
+                errors[futures[future]] = f"Timed out after {batch_timeout:g}s (batch)"
+            break
+        # A lookup that has not started yet cannot expire before now + timeout: check again then
+        queued = len(pending) > sum(1 for _, f in running if f in pending)
+        next_expiry = min([expires for expires, f in running if f in pending]
+                          + ([now + timeout] if queued else []), default=deadline)
+        done, pending = wait(pending, timeout=max(min(next_expiry, deadline) - now, 0.001),
+                             return_when=FIRST_COMPLETED)
+        for future in done:
+            symbol = futures[future]
+            try:
+                prices[symbol] = future.result()
+            except Exception as e:
+                print(f"❌ Error fetching quote for {symbol}: {e}")
+                errors[symbol] = str(e)
+    return prices, errors
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from utils.bar_store import MARKET_TZ
+
+RESAMPLED_TIMESPANS = ("hour", "day", "week")
+SESSIONS = ("regular", "extended")
+REGULAR_OPEN, REGULAR_CLOSE = 9 * 60 + 30, 16 * 60  # minutes after midnight, market time
+HOUR_MS = 3_600_000
+
+
+def default_session(timespan):
+    """Hour bars keep pre/post-market trading (like Polygon's); day and week use the regular session."""
+    return "extended" if timespan == "hour" else "regular"
+
+
+def _bucket_keys(ts, local, timespan):
+    """Bucket start (epoch ms) of every bar: clock hour, market day or market week (Monday)."""
+    if timespan == "hour":
+        return ts - ts % HOUR_MS  # market-time offsets are whole hours
+    days = local.tz_localize(None).normalize()
+    if timespan == "week":
+        days = days - pd.to_timedelta(days.weekday, unit="D")
+    return days.tz_localize(MARKET_TZ).as_unit("ms").asi8
+
+
+def resample_bars(bars, timespan, session=None):
+    """
+    Aggregate minute bars (sorted by timestamp) into hour, day or week bars.
+
+    open = first, high = max, low = min, close = last, volume and
+    transactions = sum, vwap = volume-weighted mean of the minute vwaps
+    (falling back to close where a minute has none). Buckets follow market
+    time, so days and weeks are correct across DST changes. With the
+    regular session only 09:30-16:00 ET minutes are used.
+    """
+    if timespan not in RESAMPLED_TIMESPANS:
+        raise ValueError(f"Cannot resample to {timespan!r}; use one of {', '.join(RESAMPLED_TIMESPANS)}")
+    session = session or default_session(timespan)
+
+    ts = bars["timestamp"].to_numpy(np.int64)
+    local = pd.to_datetime(ts, unit="ms", utc=True).tz_convert(MARKET_TZ)
+    keep = slice(None)
+    if session == "regular":
+        minute_of_day = np.asarray(local.hour * 60 + local.minute)
+        keep = (minute_of_day >= REGULAR_OPEN) & (minute_of_day < REGULAR_CLOSE)
+        ts, local = ts[keep], local[keep]
+    if len(ts) == 0:
+        return bars.iloc[:0].copy()
+
+    col = {name: bars[name].to_numpy()[keep] for name in bars.columns}
+    keys = _bucket_keys(ts, local, timespan)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+
+    volume = col["volume"].astype(np.float64)
+    price = np.where(np.isnan(col["vwap"]), col["close"], col["vwap"])
+    volume_sum = np.add.reduceat(volume, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.add.reduceat(price * volume, starts) / volume_sum
+
+    return pd.DataFrame({
+        "open": col["open"][starts],
+        "high": np.maximum.reduceat(col["high"], starts),
+        "low": np.minimum.reduceat(col["low"], starts),
+        "close": col["close"][ends - 1],
+        "volume": volume_sum,
+        "vwap": np.where(volume_sum > 0, vwap, np.nan),
+        "timestamp": keys[starts],
+        "transactions": np.add.reduceat(col["transactions"].astype(np.int64), starts),
+    })
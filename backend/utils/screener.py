@@ -0,0 +1,231 @@
+import atexit
+import operator
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.bar_store import MARKET_TZ, day_bounds_ms, market_today
+from utils.market_panel import normalize_tickers
+from utils.polygon_client import fetch_bars, scheduler
+from utils.streaming_indicators import IndicatorStateStore
+from utils.upstream_scheduler import BACKGROUND
+
+DEFAULT_UNIVERSE = (
+    "AAPL,MSFT,NVDA,AMZN,GOOGL,META,TSLA,AVGO,JPM,V,MA,UNH,XOM,LLY,JNJ,"
+    "PG,HD,COST,ABBV,MRK,PEP,KO,NFLX,ADBE,CRM,AMD,INTC,ORCL,WMT,BAC"
+)
+NUMERIC_FIELDS = ("close", "ma_5", "ma_10", "rsi", "volatility", "confidence", "bars", "timestamp")
+TEXT_FIELDS = ("ticker", "signal")
+_OPS = {"==": operator.eq, "=": operator.eq, "!=": operator.ne,
+        "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+_CLAUSE = re.compile(r"^\s*(\w+)\s*(==|!=|<=|>=|=|<|>)\s*['\"]?(.*?)['\"]?\s*$")
+
+
+# ---------------------------------------
+# 🔍 Filters
+# ---------------------------------------
+
+def parse_filter(expression):
+    """
+    Parse "signal == BUY and rsi < 30 and volatility > 3" into
+    [(field, op, value)]. Clauses are joined with `and`; fields are
+    NUMERIC_FIELDS and TEXT_FIELDS. Raises ValueError on bad input.
+    """
+    clauses = []
+    for clause in re.split(r"\s+and\s+", (expression or "").strip(), flags=re.IGNORECASE):
+        if not clause:
+            continue
+        match = _CLAUSE.match(clause)
+        if not match:
+            raise ValueError(f"Cannot parse filter clause: {clause!r}")
+        field, op, value = match.group(1).lower(), match.group(2), match.group(3)
+        if field in NUMERIC_FIELDS:
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError(f"{field} needs a number, got {value!r}")
+        elif field in TEXT_FIELDS:
+            if op not in ("==", "=", "!="):
+                raise ValueError(f"{field} supports only == and !=")
+            value = value.upper()
+        else:
+            raise ValueError(f"Unknown filter field: {field}")
+        clauses.append((field, _OPS[op], value))
+    return clauses
+
+
+# ---------------------------------------
+# 🧊 Columnar snapshot
+# ---------------------------------------
+
+class IndicatorSnapshot:
+    """
+    Latest indicator values of every ticker as one NumPy array per field.
+    Immutable: a refresh builds a new snapshot and swaps it in, so queries
+    never see a half-updated universe.
+    """
+
+    def __init__(self, rows, as_of=None):
+        rows = [r for r in rows if r.get("bars")]
+        self.as_of = as_of or time.time()
+        self.columns = {"ticker": np.array([r["ticker"] for r in rows], dtype=object),
+                        "signal": np.array([r["signal"] for r in rows], dtype=object)}
+        for field in NUMERIC_FIELDS:
+            self.columns[field] = np.array([r.get(field) or 0 for r in rows], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.columns["ticker"])
+
+    def query(self, clauses=(), sort=None, descending=True, limit=100):
+        """Indices of matching rows (vectorized masks), optionally sorted, then rows as dicts."""
+        mask = np.ones(len(self), dtype=bool)
+        for field, op, value in clauses:
+            mask &= op(self.columns[field], value)
+        matches = np.flatnonzero(mask)
+        if sort:
+            keys = self.columns[sort][matches]
+            order = np.argsort(keys, kind="stable")
+            matches = matches[order[::-1] if descending else order]
+        return int(mask.sum()), [self.row(i) for i in matches[:limit]]
+
+    def row(self, i):
+        c = self.columns
+        return {
+            "ticker": c["ticker"][i],
+            "signal": c["signal"][i],
+            "latest_price": round(float(c["close"][i]), 2),
+            "ma_5": round(float(c["ma_5"][i]), 3),
+            "ma_10": round(float(c["ma_10"][i]), 3),
+            "rsi": round(float(c["rsi"][i]), 2),
+            "volatility": round(float(c["volatility"][i]), 3),
+            "confidence": round(float(c["confidence"][i]), 2),
+            "bar_timestamp": int(c["timestamp"][i]),
+        }
+
+
+# ---------------------------------------
+# 🔄 Screener (state + background refresh)
+# ---------------------------------------
+
+class Screener:
+    """
+    Keeps streaming indicator state (utils/streaming_indicators.py) for a
+    universe of tickers on completed daily bars and publishes it as an
+    IndicatorSnapshot. Each refresh only feeds bars newer than a ticker's
+    last one; data comes through the bar cache in the BACKGROUND lane.
+    """
+
+    def __init__(self, universe, state_path=None, lookback_days=60, max_workers=8):
+        self.universe = list(universe)
+        self.lookback_days = lookback_days
+        self.store = IndicatorStateStore(state_path)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screener")
+        self._refresh_lock = threading.Lock()
+        self.snapshot = self._build_snapshot()
+        self.last_refresh = {}
+
+    def _build_snapshot(self):
+        rows = []
+        for ticker in self.universe:
+            latest = self.store.latest(ticker)
+            rows.append({"ticker": ticker, **latest, "timestamp": self.store.last_timestamp(ticker)})
+        return IndicatorSnapshot(rows)
+
+    def _update_ticker(self, ticker, end):
+        """Feed completed bars newer than the ticker's last one; returns how many were new."""
+        last = self.store.last_timestamp(ticker)
+        today_start, _ = day_bounds_ms(market_today(), market_today())
+        if last is not None and last >= day_bounds_ms(end, end)[0]:
+            return 0  # already has yesterday's bar
+        start = (
+            end - timedelta(days=self.lookback_days) if last is None
+            else datetime.fromtimestamp(last / 1000, MARKET_TZ).date()
+        )
+        with scheduler.lane(BACKGROUND):
+            bars = fetch_bars(ticker, start.isoformat(), end.isoformat(), "day")
+        new = 0
+        for close, ts in zip(bars["close"].tolist(), bars["timestamp"].tolist()):
+            if ts < today_start and (last is None or ts > last):
+                self.store.update(ticker, close, ts)
+                new += 1
+        return new
+
+    def refresh(self):
+        """One incremental pass over the universe; skipped if a refresh is already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return None
+        try:
+            started = time.perf_counter()
+            end = market_today() - timedelta(days=1)
+            futures = {t: self._pool.submit(self._update_ticker, t, end) for t in self.universe}
+            new_bars, errors = 0, {}
+            for ticker, future in futures.items():
+                try:
+                    new_bars += future.result()
+                except Exception as e:
+                    errors[ticker] = str(e)
+            self.snapshot = self._build_snapshot()
+            if self.store.path:
+                self.store.save()
+            self.last_refresh = {
+                "finished_at": time.time(),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "new_bars": new_bars,
+                "errors": errors,
+            }
+            return self.last_refresh
+        finally:
+            self._refresh_lock.release()
+
+    def refreshing(self):
+        return self._refresh_lock.locked()
+
+    def start(self, interval_s):
+        """Refresh now and then every `interval_s` seconds on a daemon thread; save state at exit."""
+        def loop():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Screener refresh failed: {e}")
+                time.sleep(interval_s)
+
+        threading.Thread(target=loop, name="screener-refresh", daemon=True).start()
+        if self.store.path:
+            atexit.register(self.store.save)
+
+
+_shared_screener = None
+_shared_lock = threading.Lock()
+
+
+def get_screener():
+    """Process-wide screener, restored from its saved state on first use."""
+    global _shared_screener
+    if _shared_screener is None:
+        from config import Config
+
+        with _shared_lock:
+            if _shared_screener is None:
+                screener = Screener(
+                    load_universe(Config),
+                    state_path=Config.SCREENER_STATE_PATH,
+                    lookback_days=Config.SCREENER_LOOKBACK_DAYS,
+                    max_workers=Config.SCREENER_MAX_WORKERS,
+                )
+                if Config.SCREENER_REFRESH_S > 0:
+                    screener.start(Config.SCREENER_REFRESH_S)
+                _shared_screener = screener
+    return _shared_screener
+
+
+def load_universe(config):
+    """Tickers from SCREENER_UNIVERSE_FILE (one per line) or SCREENER_UNIVERSE (comma-separated)."""
+    if config.SCREENER_UNIVERSE_FILE:
+        with open(config.SCREENER_UNIVERSE_FILE) as f:
+            return normalize_tickers([line.split("#")[0] for line in f])
+    return normalize_tickers(config.SCREENER_UNIVERSE or DEFAULT_UNIVERSE)
@@ -0,0 +1,345 @@
+import json
+import math
+import os
+import tempfile
+import threading
+
+from utils.indicator_engine import MA_LONG, MA_SHORT, RSI_PERIOD, VOLATILITY_WINDOW
+
+# Incremental versions of the indicators in utils/trade_analysis.py: every
+# update is O(1) (running sums are re-summed from the buffer once per
+# `window` updates, so float drift cannot build up) and the state is a
+# small JSON-serializable dict.
+
+
+# ---------------------------------------
+# 🔁 Ring buffer
+# ---------------------------------------
+
+class RingBuffer:
+    """Fixed-size FIFO of floats; `push` returns the value it evicted (or None)."""
+
+    __slots__ = ("size", "_values", "_head", "count")
+
+    def __init__(self, size, values=()):
+        self.size = size
+        self._values = [0.0] * size
+        self._head = 0  # index of the oldest value once full
+        self.count = 0
+        for value in values:
+            self.push(value)
+
+    def push(self, value):
+        evicted = None
+        if self.count == self.size:
+            evicted = self._values[self._head]
+            self._values[self._head] = value
+            self._head = (self._head + 1) % self.size
+        else:
+            self._values[(self._head + self.count) % self.size] = value
+            self.count += 1
+        return evicted
+
+    def values(self):
+        """Oldest to newest."""
+        return [self._values[(self._head + i) % self.size] for i in range(self.count)]
+
+
+# ---------------------------------------
+# 📈 Indicators
+# ---------------------------------------
+
+class StreamingSMA:
+    """Simple moving average over the last `window` values (min_periods=1)."""
+
+    kind = "sma"
+
+    def __init__(self, window, values=()):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self.total = 0.0
+        self._since_resync = 0
+        for value in values:
+            self.update(value)
+
+    def update(self, value):
+        evicted = self.buffer.push(value)
+        self.total += value - (evicted or 0.0)
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self.total = math.fsum(self.buffer.values())
+            self._since_resync = 0
+        return self.value
+
+    @property
+    def value(self):
+        return self.total / self.buffer.count if self.buffer.count else math.nan
+
+    def to_dict(self):
+        return {"kind": self.kind, "window": self.window, "values": self.buffer.values()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state["window"], state["values"])
+
+
+class StreamingStd:
+    """
+    Rolling sample standard deviation (ddof=1) over the last `window`
+    values, using Welford's update with removal; NaN below 2 values.
+    """
+
+    kind = "std"
+
+    def __init__(self, window, values=()):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._since_resync = 0
+        for value in values:
+            self.update(value)
+
+    def update(self, value):
+        evicted = self.buffer.push(value)
+        n = self.buffer.count
+        if evicted is None:
+            delta = value - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (value - self.mean)
+        else:
+            old_mean = self.mean
+            self.mean += (value - evicted) / n
+            self.m2 += (value - evicted) * (value - self.mean + evicted - old_mean)
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+        return self.value
+
+    def _resync(self):
+        values = self.buffer.values()
+        self.mean = math.fsum(values) / len(values)
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in values)
+        self._since_resync = 0
+
+    @property
+    def value(self):
+        n = self.buffer.count
+        return math.sqrt(max(self.m2, 0.0) / (n - 1)) if n > 1 else math.nan
+
+    def to_dict(self):
+        return {"kind": self.kind, "window": self.window, "values": self.buffer.values()}
+
+    @classmethod
+    def from_dict(cls, state):
+        std = cls(state["window"], state["values"])
+        std._resync()
+        return std
+
+
+class StreamingRSI:
+    """
+    RSI over closes. method="simple" averages the last `period` gains and
+    losses (same as trade_analysis.compute_rsi); method="wilder" uses
+    Wilder smoothing (alpha = 1 / period, seeded with the first value).
+    50 while there are no losses to divide by.
+    """
+
+    kind = "rsi"
+
+    def __init__(self, period=RSI_PERIOD, method="simple"):
+        if method not in ("simple", "wilder"):
+            raise ValueError("method must be simple or wilder")
+        self.period = period
+        self.method = method
+        self.prev_close = None
+        self.gains = StreamingSMA(period)
+        self.losses = StreamingSMA(period)
+        self.avg_gain = self.avg_loss = math.nan  # wilder only
+
+    def update(self, close):
+        # The first close has no delta: it counts as a 0 gain and 0 loss
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if self.method == "simple":
+            self.gains.update(gain)
+            self.losses.update(loss)
+        elif math.isnan(self.avg_gain):
+            self.avg_gain, self.avg_loss = gain, loss
+        else:
+            self.avg_gain += (gain - self.avg_gain) / self.period
+            self.avg_loss += (loss - self.avg_loss) / self.period
+        return self.value
+
+    @property
+    def value(self):
+        if self.method == "simple":
+            avg_gain, avg_loss = self.gains.value, self.losses.value
+        else:
+            avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        if math.isnan(avg_gain) or not avg_loss:
+            return 50.0
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def to_dict(self):
+        state = {"kind": self.kind, "period": self.period, "method": self.method, "prev_close": self.prev_close}
+        if self.method == "simple":
+            state.update(gains=self.gains.buffer.values(), losses=self.losses.buffer.values())
+        else:
+            state.update(avg_gain=self.avg_gain, avg_loss=self.avg_loss)
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        rsi = cls(state["period"], state["method"])
+        rsi.prev_close = state["prev_close"]
+        if rsi.method == "simple":
+            rsi.gains = StreamingSMA(rsi.period, state["gains"])
+            rsi.losses = StreamingSMA(rsi.period, state["losses"])
+        else:
+            rsi.avg_gain, rsi.avg_loss = state["avg_gain"], state["avg_loss"]
+        return rsi
+
+
+# ---------------------------------------
+# 🧾 Per-ticker state
+# ---------------------------------------
+
+class TickerIndicators:
+    """
+    MA_5, MA_10, RSI and volatility of one ticker, updated bar by bar.
+    `latest()` has the same fields as indicator_engine.latest_signals.
+    Bars at or before the last seen timestamp are ignored.
+    """
+
+    def __init__(self):
+        self.ma_5 = StreamingSMA(MA_SHORT)
+        self.ma_10 = StreamingSMA(MA_LONG)
+        self.rsi = StreamingRSI(RSI_PERIOD)
+        self.volatility = StreamingStd(VOLATILITY_WINDOW)
+        self.bars = 0
+        self.close = math.nan
+        self.timestamp = None
+        self.prev_ma = (math.nan, math.nan)
+
+    def update(self, close, timestamp=None):
+        if timestamp is not None and self.timestamp is not None and timestamp <= self.timestamp:
+            return False
+        close = float(close)
+        self.prev_ma = (self.ma_5.value, self.ma_10.value)
+        self.ma_5.update(close)
+        self.ma_10.update(close)
+        self.rsi.update(close)
+        self.volatility.update(close)
+        self.bars += 1
+        self.close = close
+        self.timestamp = timestamp
+        return True
+
+    def latest(self):
+        if not self.bars:
+            return {"signal": "No Data", "bars": 0}
+        ma_5, ma_10 = self.ma_5.value, self.ma_10.value
+        prev_5, prev_10 = self.prev_ma if self.bars > 1 else (ma_5, ma_10)
+
+        if ma_5 > ma_10 and prev_5 <= prev_10:
+            signal = "BUY"
+        elif ma_5 < ma_10 and prev_5 >= prev_10:
+            signal = "SELL"
+        else:
+            signal = "HOLD"
+
+        volatility = self.volatility.value
+        return {
+            "close": self.close,
+            "ma_5": ma_5,
+            "ma_10": ma_10,
+            "rsi": self.rsi.value,
+            "volatility": 0.0 if math.isnan(volatility) else volatility,
+            "signal": signal,
+            "confidence": min(abs(ma_5 - ma_10) / ma_10 * 100, 100) if ma_10 else math.nan,
+            "bars": self.bars,
+        }
+
+    def to_dict(self):
+        return {
+            "ma_5": self.ma_5.to_dict(),
+            "ma_10": self.ma_10.to_dict(),
+            "rsi": self.rsi.to_dict(),
+            "volatility": self.volatility.to_dict(),
+            "bars": self.bars,
+            "close": self.close,
+            "timestamp": self.timestamp,
+            "prev_ma": list(self.prev_ma),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        ticker = cls()
+        ticker.ma_5 = StreamingSMA.from_dict(state["ma_5"])
+        ticker.ma_10 = StreamingSMA.from_dict(state["ma_10"])
+        ticker.rsi = StreamingRSI.from_dict(state["rsi"])
+        ticker.volatility = StreamingStd.from_dict(state["volatility"])
+        ticker.bars = state["bars"]
+        ticker.close = state["close"]
+        ticker.timestamp = state["timestamp"]
+        ticker.prev_ma = tuple(state["prev_ma"])
+        return ticker
+
+
+class IndicatorStateStore:
+    """
+    TickerIndicators for many tickers, persisted as one JSON file
+    (written atomically) so live state survives a restart.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._tickers = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def update(self, ticker, close, timestamp=None):
+        with self._lock:
+            state = self._tickers.setdefault(ticker.upper(), TickerIndicators())
+            state.update(close, timestamp)
+            return state.latest()
+
+    def update_many(self, bars):
+        """bars: iterable of (ticker, close, timestamp); returns {ticker: latest}."""
+        with self._lock:
+            for ticker, close, timestamp in bars:
+                self._tickers.setdefault(ticker.upper(), TickerIndicators()).update(close, timestamp)
+            return {ticker: state.latest() for ticker, state in self._tickers.items()}
+
+    def latest(self, ticker):
+        with self._lock:
+            state = self._tickers.get(ticker.upper())
+            return state.latest() if state else {"signal": "No Data", "bars": 0}
+
+    def last_timestamp(self, ticker):
+        with self._lock:
+            state = self._tickers.get(ticker.upper())
+            return state.timestamp if state else None
+
+    def tickers(self):
+        with self._lock:
+            return list(self._tickers)
+
+    def save(self, path=None):
+        path = path or self.path
+        with self._lock:
+            payload = {ticker: state.to_dict() for ticker, state in self._tickers.items()}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    def load(self, path=None):
+        with open(path or self.path) as f:
+            payload = json.load(f)
+        with self._lock:
+            self._tickers = {ticker: TickerIndicators.from_dict(state) for ticker, state in payload.items()}
@@ -0,0 +1,81 @@
+"""
+Process that owns the parameter-sweep pool of utils/backtester.py.
+
+The app starts it once with `python -m utils.sweep_host <workers> <socket>`, so the
+pool workers import this small module as their main module instead of
+re-running app.py (database setup, blueprints, API clients) in every
+worker. Sweeps reach the pool through a multiprocessing manager on a Unix
+socket; the host exits when the app closes its stdin.
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.managers import BaseManager
+
+AUTHKEY_ENV = "SWEEP_HOST_AUTHKEY"
+
+
+class SweepManager(BaseManager):
+    pass
+
+
+class SweepPool:
+    """Long-lived process pool; run() is called from one manager thread per client."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # The manager serves clients on threads: start workers from a clean forkserver
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["utils.backtester"])
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+            return self._executor
+
+    def run(self, key, close, chunks, options):
+        """Summaries of each chunk of combos, in order; `key` names the panel for worker caches."""
+        from utils.backtester import _run_chunk
+
+        pool = self._pool()
+        try:
+            futures = [pool.submit(_run_chunk, key, close, chunk, options) for chunk in chunks]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is pool:
+                    self._executor = None  # a worker died: the next sweep gets a fresh pool
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+
+
+def main():
+    workers = int(sys.argv[1])
+    address = sys.argv[2]
+    pool = SweepPool(workers)
+    SweepManager.register("SweepPool", callable=lambda: pool)
+    server = SweepManager(address=address, authkey=bytes.fromhex(os.environ[AUTHKEY_ENV])).get_server()
+
+    def watch_parent():
+        sys.stdin.buffer.read()  # EOF once the app process is gone
+        pool.shutdown()
+        shutil.rmtree(os.path.dirname(address), ignore_errors=True)
+        os._exit(0)
+
+    threading.Thread(target=watch_parent, name="sweep-host-parent", daemon=True).start()
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
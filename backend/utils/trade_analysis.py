@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
 
+from utils.indicator_engine import (
+    DEFAULT_INDICATORS, INDICATOR_OUTPUTS, compute_indicators, latest_signals, resolve_indicators,
+)
+
+OHLCV_FIELDS = ("high", "low", "volume", "vwap")
+
 # ---------------------------------------
 # 🔧 Utility Functions
 # ---------------------------------------
@@ -72,69 +78,97 @@ def interpret_full(ticker, signal, rsi, volatility, confidence, latest_price):
 
 
 # ---------------------------------------
-# 📈 Main Analysis Function
+# 📈 Main Analysis Functions
 # ---------------------------------------
 
-def analyze_stock(ticker, df: pd.DataFrame):
+def analyze_stock(ticker, df: pd.DataFrame, indicators=None, confirm=None):
     """
     Perform a complete financial analysis of a single stock.
     Returns advisor-style insights.
+
+    `indicators` adds extended indicator groups (e.g. "macd,bollinger" or
+    "all", see indicator_engine.INDICATOR_OUTPUTS) to the result;
+    confirm="macd" only keeps BUY / SELL signals the MACD histogram agrees with.
     """
 
     if df.empty:
         return {"signal": "No Data", "summary": "No data available."}
 
-    df = df.sort_values("timestamp").reset_index(drop=True)
+    df = df.sort_values("timestamp")
+    ohlcv = {field: df[field].to_numpy(np.float64)[np.newaxis, :] for field in OHLCV_FIELDS if field in df}
+    close = df["close"].to_numpy(np.float64)
+    return analyze_panel([ticker], close[np.newaxis, :], indicators, confirm, **ohlcv)[ticker]
 
-    # Compute Moving Averages
-    df["MA_5"] = df["close"].rolling(window=5, min_periods=1).mean()
-    df["MA_10"] = df["close"].rolling(window=10, min_periods=1).mean()
-    df["MA_10"].fillna(df["MA_5"], inplace=True)
 
-    # Compute RSI and Volatility
-    df["RSI"] = compute_rsi(df["close"])
-    df["Volatility"] = df["close"].rolling(window=5, min_periods=1).std().fillna(0)
+def analyze_panel(tickers, close, indicators=None, confirm=None, **ohlcv):
+    """
+    Analyze many stocks at once.
+
+    `close` is a (len(tickers), T) array of closing prices, NaN where a
+    ticker has no bar (e.g. `fetch_panel(...)["panel"]["close"]`); high,
+    low, volume and vwap arrays of the same shape feed ATR, OBV and VWAP
+    deviation. All indicators are computed in one vectorized pass
+    (utils/indicator_engine.py); returns {ticker: analysis} in the format
+    of `analyze_stock`.
+    """
+    include = resolve_indicators(indicators, confirm)
+    close = np.asarray(close, dtype=np.float64)
+    if close.shape[1] == 0:
+        return {ticker: {"signal": "No Data", "summary": "No data available."} for ticker in tickers}
 
-    latest = df.iloc[-1]
-    prev = df.iloc[-2] if len(df) > 1 else latest
+    latest = latest_signals(compute_indicators(close, include, **ohlcv), confirm)
+    extended = [name for name in include if name not in DEFAULT_INDICATORS]
+    return {
+        ticker: build_analysis(ticker, {name: values[i] for name, values in latest.items()}, extended)
+        for i, ticker in enumerate(tickers)
+    }
 
-    # Determine signal based on MA crossover
-    if latest["MA_5"] > latest["MA_10"] and prev["MA_5"] <= prev["MA_10"]:
-        signal = "BUY"
-    elif latest["MA_5"] < latest["MA_10"] and prev["MA_5"] >= prev["MA_10"]:
-        signal = "SELL"
-    else:
-        signal = "HOLD"
 
-    # Compute confidence
-    confidence = compute_confidence(latest["MA_5"], latest["MA_10"])
+def build_analysis(ticker, latest, extended=()):
+    """
+    Advisor-style result from one ticker's latest indicator values (see
+    indicator_engine.latest_signals); the `extended` indicator groups are
+    added under analysis["indicators"].
+    """
+    if latest["signal"] == "No Data":
+        return {"signal": "No Data", "summary": "No data available."}
+
+    confidence = round(float(latest["confidence"]), 2)
 
     # Build interpretation
     text_analysis = interpret_full(
         ticker=ticker,
-        signal=signal,
-        rsi=latest["RSI"],
-        volatility=latest["Volatility"],
+        signal=latest["signal"],
+        rsi=latest["rsi"],
+        volatility=latest["volatility"],
         confidence=confidence,
         latest_price=latest["close"],
     )
 
     # Return rich, user-friendly analysis
-    return {
+    result = {
         "ticker": ticker,
         "company_name": "Apple Inc." if ticker == "AAPL" else "Unknown Company",
         "sector": "Technology" if ticker == "AAPL" else "General",
         "analysis": {
             "latest_price": round(float(latest["close"]), 2),
-            "ma_5": round(float(latest["MA_5"]), 3),
-            "ma_10": round(float(latest["MA_10"]), 3),
-            "rsi": round(float(latest["RSI"]), 2),
-            "volatility": round(float(latest["Volatility"]), 3),
+            "ma_5": round(float(latest["ma_5"]), 3),
+            "ma_10": round(float(latest["ma_10"]), 3),
+            "rsi": round(float(latest["rsi"]), 2),
+            "volatility": round(float(latest["volatility"]), 3),
             "confidence": confidence,
-            "signal": signal,
+            "signal": latest["signal"],
             "summary": text_analysis["summary"],
             "advice": text_analysis["advice"],
         },
     }
+    if extended:
+        result["analysis"]["indicators"] = {
+            name: None if np.isnan(latest[name]) else round(float(latest[name]), 4)
+            for group in extended for name in INDICATOR_OUTPUTS[group]
+        }
+    return result
+
+
 # For backward compatibility
 analyze_trend = analyze_stock
@@ -0,0 +1,247 @@
+import threading
+
+import numpy as np
+
+from utils.account_index import AccountInterner
+
+OUT, IN = "out", "in"
+
+
+class TransactionGraph:
+    """
+    Money-movement graph (nameOrig -> nameDest) over integer-interned accounts.
+
+    Edges are appended to growable NumPy columns (src, dst, amount, step).
+    Queries run against CSR adjacency (indptr + neighbour arrays, for both
+    directions) built over the first `csr_edges` edges, plus a linear scan of
+    the small tail appended since; once the tail exceeds `compact_every`
+    edges the CSR is rebuilt with one argsort. No Python object per edge.
+    """
+
+    def __init__(self, compact_every=200_000, initial_capacity=1024):
+        self.compact_every = int(compact_every)
+        self.accounts = AccountInterner()
+        self._lock = threading.RLock()
+
+        self._n = 0
+        self._src = np.empty(initial_capacity, dtype=np.int32)
+        self._dst = np.empty(initial_capacity, dtype=np.int32)
+        self._amount = np.empty(initial_capacity, dtype=np.float32)
+        self._step = np.empty(initial_capacity, dtype=np.int32)
+
+        self._csr_edges = 0
+        self._csr_nodes = 0
+        self._csr = {
+            OUT: (np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)),
+            IN: (np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)),
+        }
+
+    # ---------------------------------------
+    # 🔄 Ingestion
+    # ---------------------------------------
+
+    def _reserve(self, extra):
+        needed = self._n + extra
+        if needed <= len(self._src):
+            return
+        capacity = max(needed, len(self._src) * 2)
+        for name in ("_src", "_dst", "_amount", "_step"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._n] = old[: self._n]
+            setattr(self, name, new)
+
+    def add_edges(self, names_orig, names_dest, amounts, steps):
+        """Append many transfers; names are interned, everything else is vectorized."""
+        intern = self.accounts.intern
+        with self._lock:
+            src = np.fromiter((intern(n) for n in names_orig), dtype=np.int32)
+            dst = np.fromiter((intern(n) for n in names_dest), dtype=np.int32)
+            count = len(src)
+            self._reserve(count)
+            end = self._n + count
+            self._src[self._n:end] = src
+            self._dst[self._n:end] = dst
+            self._amount[self._n:end] = np.asarray(amounts, dtype=np.float32)
+            self._step[self._n:end] = np.asarray(steps, dtype=np.int32)
+            self._n = end
+
+            if self._n - self._csr_edges >= self.compact_every:
+                self.compact()
+
+    def add_edge(self, name_orig, name_dest, amount, step):
+        if name_orig and name_dest:
+            self.add_edges([name_orig], [name_dest], [amount], [step])
+
+    def add_frame(self, df):
+        """Append the rows of a normalized transaction frame that name both parties."""
+        keep = (df["nameOrig"] != "") & (df["nameDest"] != "")
+        df = df.loc[keep]
+        self.add_edges(df["nameOrig"].tolist(), df["nameDest"].tolist(),
+                       df["amount"].to_numpy(), df["step"].to_numpy())
+
+    def compact(self):
+        """Rebuild CSR adjacency over every edge appended so far."""
+        with self._lock:
+            n, nodes = self._n, self.accounts.size
+            for direction, key, other in ((OUT, self._src, self._dst), (IN, self._dst, self._src)):
+                order = np.argsort(key[:n], kind="stable")
+                indptr = np.zeros(nodes + 1, dtype=np.int64)
+                np.cumsum(np.bincount(key[:n], minlength=nodes), out=indptr[1:])
+                self._csr[direction] = (indptr, other[:n][order], self._amount[:n][order])
+            self._csr_edges, self._csr_nodes = n, nodes
+
+    # ---------------------------------------
+    # 🔍 Queries
+    # ---------------------------------------
+
+    def _edges_of(self, ids, direction):
+        """(neighbour ids, amounts) of every edge leaving (or entering) `ids`."""
+        indptr, nbr, amt = self._csr[direction]
+        ids = np.asarray(ids, dtype=np.int64)
+        known = ids[ids < self._csr_nodes]
+        starts, ends = indptr[known], indptr[known + 1]
+        lengths = ends - starts
+        if lengths.sum():
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            csr_nbr, csr_amt = nbr[offsets], amt[offsets]
+        else:
+            csr_nbr, csr_amt = nbr[:0], amt[:0]
+
+        lo, hi = self._csr_edges, self._n
+        key, other = (self._src, self._dst) if direction == OUT else (self._dst, self._src)
+        mask = np.isin(key[lo:hi], ids)
+        return (np.concatenate((csr_nbr, other[lo:hi][mask])),
+                np.concatenate((csr_amt, self._amount[lo:hi][mask])))
+
+    def k_hop(self, account, hops=2, direction=OUT, limit=25):
+        """
+        Accounts reachable from `account` (OUT = fan-out, IN = fan-in) per hop.
+        Each hop reports how many new distinct accounts it reaches, the number
+        and total amount of edges traversed, and up to `limit` account names.
+        """
+        with self._lock:
+            start = self.accounts.lookup(account)
+            if start is None:
+                return None
+            seen = np.zeros(self.accounts.size, dtype=bool)
+            seen[start] = True
+            frontier = np.array([start], dtype=np.int64)
+            levels = []
+            for hop in range(1, hops + 1):
+                nbrs, amounts = self._edges_of(frontier, direction)
+                reached = np.unique(nbrs)
+                new = reached[~seen[reached]]
+                seen[new] = True
+                levels.append({
+                    "hop": hop,
+                    "accounts": int(len(new)),
+                    "edges": int(len(nbrs)),
+                    "amount": round(float(amounts.astype(np.float64).sum()), 2),
+                    "sample": [self.accounts.name(int(i)) for i in new[:limit]],
+                })
+                if len(new) == 0:
+                    break
+                frontier = new
+            return levels
+
+    def _distances_to(self, target, max_depth):
+        """Hop distance from each account that can reach `target` within max_depth."""
+        dist = {target: 0}
+        frontier = np.array([target], dtype=np.int64)
+        for depth in range(1, max_depth + 1):
+            nbrs, _ = self._edges_of(frontier, IN)
+            new = [int(v) for v in np.unique(nbrs) if int(v) not in dist]
+            for v in new:
+                dist[v] = depth
+            if not new:
+                break
+            frontier = np.array(new, dtype=np.int64)
+        return dist
+
+    def find_cycles(self, account, max_len=4, limit=20):
+        """
+        Simple cycles through `account` of at most `max_len` edges
+        (A -> B -> ... -> A), e.g. round-tripping funds through mule accounts.
+        The DFS only follows accounts that can still get back to `account`
+        within the remaining hop budget.
+        """
+        with self._lock:
+            start = self.accounts.lookup(account)
+            if start is None:
+                return None
+            back = self._distances_to(start, max_len - 1)
+            cycles, path = [], [start]
+
+            def dfs(node, depth):
+                if len(cycles) >= limit:
+                    return
+                nbrs, _ = self._edges_of([node], OUT)
+                for v in np.unique(nbrs):
+                    v = int(v)
+                    if v == start:
+                        if depth >= 1:
+                            cycles.append([self.accounts.name(i) for i in path + [start]])
+                        continue
+                    if v in path or back.get(v, max_len) > max_len - depth - 1:
+                        continue
+                    path.append(v)
+                    dfs(v, depth + 1)
+                    path.pop()
+
+            dfs(start, 0)
+            return cycles
+
+    def stats(self):
+        with self._lock:
+            nbytes = sum(getattr(self, n).nbytes for n in ("_src", "_dst", "_amount", "_step"))
+            nbytes += sum(a.nbytes for arrays in self._csr.values() for a in arrays)
+            return {
+                "accounts": len(self.accounts),
+                "edges": self._n,
+                "csr_edges": self._csr_edges,
+                "tail_edges": self._n - self._csr_edges,
+                "array_bytes": int(nbytes),
+            }
+
+
+_shared_graph = None
+_shared_lock = threading.Lock()
+
+
+def get_transaction_graph():
+    """Process-wide graph, bootstrapped from the database on first use."""
+    global _shared_graph
+    if _shared_graph is None:
+        from config import Config
+
+        with _shared_lock:
+            if _shared_graph is None:
+                graph = TransactionGraph(compact_every=Config.GRAPH_COMPACT_EVERY)
+                if Config.GRAPH_BOOTSTRAP_FROM_DB:
+                    load_graph_from_db(graph)
+                _shared_graph = graph
+    return _shared_graph
+
+
+def load_graph_from_db(graph, batch_size=50000):
+    """Stream nameOrig/nameDest/amount/step from both transaction tables into `graph`."""
+    from flask import has_app_context
+    from models import db, Transaction, BatchTransactionLog
+
+    if not has_app_context():
+        return graph
+
+    for model_cls in (Transaction, BatchTransactionLog):
+        query = (
+            db.select(model_cls.nameOrig, model_cls.nameDest, model_cls.amount, model_cls.step)
+            .where(model_cls.nameOrig != "", model_cls.nameDest != "")
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in db.session.execute(query).partitions():
+            orig, dest, amount, step = zip(*rows)
+            graph.add_edges(orig, dest,
+                            np.nan_to_num(np.asarray(amount, dtype=np.float64)),
+                            np.nan_to_num(np.asarray(step, dtype=np.float64)))
+    graph.compact()
+    return graph
@@ -0,0 +1,302 @@
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import sys
+import numpy as np
+
+# Node tables written by `CompiledForest.save` (one .npy per column)
+NODE_ARRAYS = ("feature", "threshold", "left", "right", "default_left", "value")
+ROWS_PER_BLOCK = 1024
+
+
+def _load_c_expf():
+    """
+    The booster's sigmoid calls the C runtime's `expf`, which is not always
+    correctly rounded. Calling the same function keeps probabilities
+    bit-identical; without it we fall back to a correctly rounded float64 exp.
+    """
+    for name in ("m", "ucrtbase", "msvcrt", "c"):
+        path = ctypes.util.find_library(name)
+        if not path:
+            continue
+        try:
+            fn = ctypes.CDLL(path).expf
+        except (OSError, AttributeError):
+            continue
+        fn.restype = ctypes.c_float
+        fn.argtypes = [ctypes.c_float]
+        return fn
+    return None
+
+
+_c_expf = _load_c_expf()
+
+
+def _expf(x):
+    if _c_expf is None:
+        return np.exp(x.astype(np.float64)).astype(np.float32)
+    return np.fromiter((_c_expf(v) for v in x.tolist()), dtype=np.float32, count=len(x))
+
+
+class CompiledForest:
+    """
+    Array-backed evaluator for a binary:logistic XGBoost tree ensemble.
+
+    All trees live in one set of contiguous node tables indexed by a global
+    node id; `roots[t]` is the root of tree t. Leaves point at themselves, so
+    every row can be stepped `max_depth` times without branching on leaves.
+    Arithmetic follows XGBoost's CPU predictor (float32 inputs, `x < split`
+    goes left, NaN follows the default branch, leaves summed in tree order
+    onto the base margin) so the scores match the booster bit for bit.
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots,
+                 base_margin, max_depth, feature_names=None, meta=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base_margin = np.float32(base_margin)
+        self.max_depth = int(max_depth)
+        self.feature_names = list(feature_names or [])
+        self.meta = dict(meta or {})
+        self.classes_ = np.array([0, 1])
+        # children[2 * node] is the left child, children[2 * node + 1] the right one
+        self.children = np.column_stack((left, right)).ravel().astype(np.int32)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in NODE_ARRAYS) + self.roots.nbytes
+
+    # ---------------------------------------
+    # 🧮 Evaluation
+    # ---------------------------------------
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns"):
+            if self.feature_names and list(X.columns) != self.feature_names:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=np.float32)
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X
+
+    def _leaf_values(self, X):
+        """Leaf value reached in every tree for every row, shape (rows, trees)."""
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_base = (np.arange(n_rows, dtype=np.int32) * np.int32(n_features))[:, None]
+        has_nan = bool(np.isnan(flat).any())
+        children = self.children
+
+        node = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+        for _ in range(self.max_depth):
+            x = flat[row_base + self.feature[node]]
+            go_right = ~(x < self.threshold[node])
+            if has_nan:
+                go_right &= ~(np.isnan(x) & self.default_left[node])
+            node = children[2 * node + go_right]
+        return self.value[node]
+
+    def predict_margin(self, X):
+        X = self._as_matrix(X)
+        margin = np.empty(X.shape[0], dtype=np.float32)
+        for start in range(0, X.shape[0], ROWS_PER_BLOCK):
+            leaves = np.ascontiguousarray(self._leaf_values(X[start:start + ROWS_PER_BLOCK]).T)
+            acc = np.full(leaves.shape[1], self.base_margin, dtype=np.float32)
+            # Sequential float32 adds in tree order, like the booster (not a pairwise sum)
+            for tree_leaves in leaves:
+                acc += tree_leaves
+            margin[start:start + ROWS_PER_BLOCK] = acc
+        return margin
+
+    def predict_proba(self, X):
+        margin = self.predict_margin(X)
+        # XGBoost's Sigmoid: 1 / (expf(min(-x, 88.7)) + 1) in float32
+        e = _expf(np.minimum(-margin, np.float32(88.7)))
+        p1 = np.float32(1.0) / (e + np.float32(1.0))
+        return np.column_stack((np.float32(1.0) - p1, p1))
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(np.int64)
+
+    # ---------------------------------------
+    # 💾 Persistence
+    # ---------------------------------------
+
+    def save(self, out_dir):
+        """Write each node table as a raw .npy plus a small meta.json."""
+        os.makedirs(out_dir, exist_ok=True)
+        for name in NODE_ARRAYS + ("roots",):
+            np.save(os.path.join(out_dir, f"{name}.npy"), getattr(self, name))
+        meta = dict(self.meta)
+        meta.update({
+            "base_margin": float(self.base_margin),
+            "max_depth": self.max_depth,
+            "feature_names": self.feature_names,
+            "n_trees": self.n_trees,
+            "n_nodes": self.n_nodes,
+        })
+        with open(os.path.join(out_dir, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, in_dir, mmap_mode=None):
+        """Load node tables; pass mmap_mode="r" to map them instead of reading."""
+        with open(os.path.join(in_dir, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(in_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in NODE_ARRAYS + ("roots",)
+        }
+        return cls(
+            base_margin=meta["base_margin"],
+            max_depth=meta["max_depth"],
+            feature_names=meta.get("feature_names"),
+            meta=meta,
+            **arrays,
+        )
+
+
+# ---------------------------------------
+# 🔧 Export
+# ---------------------------------------
+
+def _tree_depth(left, right):
+    depth, frontier = 0, [0]
+    while True:
+        frontier = [c for n in frontier for c in (left[n], right[n]) if c != -1]
+        if not frontier:
+            return depth
+        depth += 1
+
+
+def compile_xgb(model):
+    """
+    Flatten a trained XGBClassifier (binary:logistic, gbtree, numeric splits)
+    into a CompiledForest using the booster's own JSON model, which keeps
+    every threshold and leaf as an exact float32.
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    learner = json.loads(bytes(booster.save_raw("json")))["learner"]
+
+    objective = learner["objective"]["name"]
+    if objective != "binary:logistic":
+        raise ValueError(f"Unsupported objective: {objective}")
+    if learner["gradient_booster"]["name"] != "gbtree":
+        raise ValueError("Only gbtree boosters can be compiled.")
+
+    trees = learner["gradient_booster"]["model"]["trees"]
+    best = learner.get("attributes", {}).get("best_iteration")
+    if best is not None:
+        trees = trees[: int(best) + 1]
+
+    features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+    offset, max_depth = 0, 0
+    for tree in trees:
+        if any(int(s) != 0 for s in tree.get("split_type", [])):
+            raise ValueError("Categorical splits are not supported.")
+
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        right = np.asarray(tree["right_children"], dtype=np.int64)
+        is_leaf = left == -1
+        ids = np.arange(len(left)) + offset
+
+        features.append(np.where(is_leaf, 0, np.asarray(tree["split_indices"], dtype=np.int32)))
+        # Split conditions hold the threshold on inner nodes and the leaf value on leaves
+        cond = np.asarray(tree["split_conditions"], dtype=np.float32)
+        thresholds.append(np.where(is_leaf, np.float32(np.inf), cond))
+        values.append(np.where(is_leaf, cond, np.float32(0)))
+        lefts.append(np.where(is_leaf, ids, left + offset))
+        rights.append(np.where(is_leaf, ids, right + offset))
+        defaults.append(np.asarray(tree["default_left"], dtype=bool))
+        roots.append(offset)
+
+        max_depth = max(max_depth, _tree_depth(left, right))
+        offset += len(left)
+
+    base_score = np.float32(float(learner["learner_model_param"]["base_score"].strip("[]")))
+    base_margin = -np.log(np.float64(np.float32(1.0) / base_score - np.float32(1.0)))
+
+    return CompiledForest(
+        feature=np.concatenate(features).astype(np.int32),
+        threshold=np.concatenate(thresholds).astype(np.float32),
+        left=np.concatenate(lefts).astype(np.int32),
+        right=np.concatenate(rights).astype(np.int32),
+        default_left=np.concatenate(defaults),
+        value=np.concatenate(values).astype(np.float32),
+        roots=np.asarray(roots, dtype=np.int32),
+        base_margin=np.float32(base_margin),
+        max_depth=max_depth,
+        feature_names=learner.get("feature_names") or [],
+    )
+
+
+def artifact_digest(path):
+    """sha256 of a model artifact, recorded in meta.json so exports can be matched to it."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def probe_rows(n_features, n_rows=20000, seed=0):
+    """Synthetic transactions spanning the feature ranges, for parity checks."""
+    rng = np.random.default_rng(seed)
+    sample = rng.lognormal(8, 3, size=(n_rows, n_features)).astype(np.float32)
+    sample[:, 1] = rng.integers(0, 5, size=n_rows)  # transaction type code
+    return sample
+
+
+def check_parity(model, forest, X):
+    """
+    Compare predict_proba of the original model and the compiled forest.
+
+    Returns:
+        dict: rows checked, mismatching rows and the max absolute difference
+    """
+    expected = np.asarray(model.predict_proba(X), dtype=np.float32)
+    actual = forest.predict_proba(X)
+    diff = np.abs(expected.astype(np.float64) - actual.astype(np.float64))
+    return {
+        "rows": int(len(expected)),
+        "mismatches": int((expected != actual).any(axis=1).sum()),
+        "max_abs_diff": float(diff.max()) if diff.size else 0.0,
+        "bit_identical": bool(np.array_equal(expected, actual)),
+    }
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.tree_compiler [models/model.pkl] [models/model_trees]
+    import joblib
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    src = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, "models", "model.pkl")
+    dst = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, "models", "model_trees")
+
+    model = joblib.load(src)
+    forest = compile_xgb(model)
+    forest.meta["source_sha256"] = artifact_digest(src)
+
+    parity = check_parity(model, forest, probe_rows(len(forest.feature_names)))
+    if not parity["bit_identical"]:
+        sys.exit(f"❌ Parity check failed: {parity}")
+
+    forest.save(dst)
+    print(f"✅ Compiled {forest.n_trees} trees / {forest.n_nodes} nodes "
+          f"({forest.nbytes / 1024:.1f} KiB) to {dst} — parity: {parity}")
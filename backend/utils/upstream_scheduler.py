@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from utils.latency_stats import percentiles
+
+INTERACTIVE, BACKGROUND = "interactive", "background"
+LANES = {INTERACTIVE: 0, BACKGROUND: 1}  # lower value is served first
+
+
+class RateLimitTimeout(Exception):
+    """Raised when no upstream call slot became free within the wait timeout."""
+
+
+class UpstreamScheduler:
+    """
+    Gate calls to a rate-limited upstream API.
+
+    A token bucket refills at `rate_per_s` up to `burst` tokens; every
+    upstream HTTP request takes one. Waiting callers are served strictly by
+    lane (interactive before background), then first come first served.
+    `single_flight(key, fn)` lets concurrent callers with the same key share
+    one execution of `fn` instead of each calling upstream. The lane
+    defaults to interactive; wrap background work in `with scheduler.lane(BACKGROUND):`.
+    """
+
+    def __init__(self, rate_per_s=5.0, burst=5, max_wait_s=30.0, name="upstream"):
+        self.rate = float(rate_per_s)
+        self.burst = max(1.0, float(burst))
+        self.max_wait = max_wait_s
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._waiters = []  # heap of (lane priority, sequence)
+        self._seq = itertools.count()
+        self._local = threading.local()
+
+        self._flights_lock = threading.Lock()
+        self._flights = {}  # key -> Future of the in-flight call
+
+        # --- Metrics ---
+        self._acquired = {lane: 0 for lane in LANES}
+        self._timeouts = {lane: 0 for lane in LANES}
+        self._waits_ms = {lane: deque(maxlen=2048) for lane in LANES}
+        self._max_depth = 0
+        self._flights_started = 0
+        self._flights_joined = 0
+
+    # ---------------------------------------
+    # 🚦 Lanes
+    # ---------------------------------------
+
+    @contextmanager
+    def lane(self, lane):
+        """Run the enclosed upstream calls (on this thread) in `lane`."""
+        previous = getattr(self._local, "lane", INTERACTIVE)
+        self._local.lane = lane
+        try:
+            yield
+        finally:
+            self._local.lane = previous
+
+    def current_lane(self):
+        return getattr(self._local, "lane", INTERACTIVE)
+
+    # ---------------------------------------
+    # 🪣 Token bucket
+    # ---------------------------------------
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def acquire(self, lane=None, timeout=None):
+        """Block until this caller may make one upstream request."""
+        lane = lane or self.current_lane()
+        timeout = self.max_wait if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        ticket = (LANES[lane], next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            self._max_depth = max(self._max_depth, len(self._waiters))
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if self._waiters[0] == ticket:
+                        self._refill()
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            break
+                        wait = (1 - self._tokens) / self.rate
+                    else:
+                        wait = remaining
+                    if remaining <= 0:
+                        self._timeouts[lane] += 1
+                        raise RateLimitTimeout(f"{self.name}: no upstream slot within {timeout:g}s")
+                    self._cond.wait(min(wait, remaining))
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+            self._acquired[lane] += 1
+            self._waits_ms[lane].append((time.monotonic() - started) * 1000)
+
+    # ---------------------------------------
+    # ✈️ Single flight
+    # ---------------------------------------
+
+    def single_flight(self, key, fn):
+        """Run `fn()` once per key at a time; concurrent callers get its result."""
+        with self._flights_lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self._flights_started += 1
+            else:
+                self._flights_joined += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            depth = {lane: 0 for lane in LANES}
+            for priority, _ in self._waiters:
+                depth[next(l for l, p in LANES.items() if p == priority)] += 1
+            lanes = {
+                lane: {
+                    "queued": depth[lane],
+                    "acquired": self._acquired[lane],
+                    "timeouts": self._timeouts[lane],
+                    "wait_ms": percentiles(sorted(self._waits_ms[lane])),
+                }
+                for lane in LANES
+            }
+            tokens = round(self._tokens, 2)
+            max_depth = self._max_depth
+        with self._flights_lock:
+            in_flight = len(self._flights)
+        return {
+            "rate_per_s": self.rate,
+            "burst": self.burst,
+            "tokens": tokens,
+            "queue_depth": sum(depth.values()),
+            "max_queue_depth": max_depth,
+            "lanes": lanes,
+            "in_flight": in_flight,
+            "flights_started": self._flights_started,
+            "flights_joined": self._flights_joined,
+        }
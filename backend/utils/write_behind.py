@@ -0,0 +1,172 @@
+import atexit
+import queue
+import threading
+import time
+
+from utils.fraud_scoring import bulk_insert_logs
+
+
+class BufferFullError(Exception):
+    """Raised when the buffer stayed full for the whole put timeout."""
+
+
+class WriteBehindBuffer:
+    """
+    Collect row mappings in memory and write them with bulk inserts.
+
+    A flusher thread commits a batch once `max_batch` rows are waiting or
+    `flush_interval_ms` has passed since the oldest unflushed row. The queue
+    holds at most `capacity` rows: `put` blocks for up to `put_timeout_s`
+    when it is full and then raises BufferFullError, so producers slow down
+    instead of growing memory. Pending rows are flushed on `close()`, which
+    is registered with atexit. `on_flush(session, batch)` runs inside the
+    same transaction as each bulk insert.
+    """
+
+    def __init__(self, model_cls, max_batch=500, flush_interval_ms=200, capacity=10000,
+                 put_timeout_s=0.5, max_retries=3, on_flush=None, name="write-behind"):
+        self.model_cls = model_cls
+        self.max_batch = max(1, int(max_batch))
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.put_timeout = put_timeout_s
+        self.max_retries = max_retries
+        self.on_flush = on_flush
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=max(1, int(capacity)))
+        self._app = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one writer at a time (thread or close())
+        self._closed = threading.Event()
+
+        # --- Metrics ---
+        self._stats_lock = threading.Lock()
+        self._accepted = 0
+        self._rejected = 0
+        self._written = 0
+        self._failed = 0
+        self._flushes = 0
+        self._last_flush_ms = None
+
+    # ---------------------------------------
+    # 📤 Producer side
+    # ---------------------------------------
+
+    def start(self, app):
+        """Bind the Flask app (for its DB session) and start the flusher once."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._app = app
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def put(self, record):
+        """Queue one row mapping; blocks while the buffer is full (backpressure)."""
+        if self._closed.is_set():
+            raise BufferFullError("Write-behind buffer is closed.")
+        try:
+            self._queue.put(record, timeout=self.put_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            raise BufferFullError("Write-behind buffer is full; retry shortly.")
+        with self._stats_lock:
+            self._accepted += 1
+
+    # ---------------------------------------
+    # 💾 Flusher
+    # ---------------------------------------
+
+    def _take_batch(self, wait):
+        try:
+            batch = [self._queue.get(timeout=wait)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        from models import db
+
+        for attempt in range(1, self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                with self._app.app_context():
+                    bulk_insert_logs(db.session, self.model_cls, batch)
+                    if self.on_flush is not None:
+                        self.on_flush(db.session, batch)
+                    db.session.commit()
+                with self._stats_lock:
+                    self._written += len(batch)
+                    self._flushes += 1
+                    self._last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+                return
+            except Exception as e:
+                with self._app.app_context():
+                    db.session.rollback()
+                print(f"⚠️ {self.name}: flush of {len(batch)} rows failed (attempt {attempt}): {e}")
+                time.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+        with self._stats_lock:
+            self._failed += len(batch)
+        print(f"❌ {self.name}: dropped {len(batch)} rows after {self.max_retries} attempts")
+
+    def _run(self):
+        while not self._closed.is_set():
+            # Hold the lock while a batch is in hand so flush() waits for it
+            with self._flush_lock:
+                batch = self._take_batch(wait=self.flush_interval)
+                if batch:
+                    self._write(batch)
+
+    def flush(self):
+        """Synchronously write everything queued so far."""
+        if self._app is None:
+            return
+        with self._flush_lock:
+            while True:
+                batch = []
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                self._write(batch)
+
+    def close(self):
+        """Stop accepting rows and flush what is pending (shutdown hook)."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "capacity": self._queue.maxsize,
+                "max_batch": self.max_batch,
+                "flush_interval_ms": self.flush_interval * 1000,
+                "accepted": self._accepted,
+                "rejected": self._rejected,
+                "written": self._written,
+                "failed": self._failed,
+                "flushes": self._flushes,
+                "last_flush_ms": self._last_flush_ms,
+            }